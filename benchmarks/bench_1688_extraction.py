@@ -0,0 +1,157 @@
+"""
+1688 搜索结果解析基准：原逐链接向上回溯 + innerText 的解析脚本 vs 线性时间的 SOURCER_1688_EXTRACT_JS。
+
+样本页 fixtures/1688_search.html 按 1688 offer_search 结果页结构保存（60 个商品卡片 +
+类目/筛选/推荐/页脚等数千个无关节点）。--scales 把商品列表克隆放大（链接追加 ?dup=N 保证不重复），
+用于观察两种脚本随页面规模的增长曲线。
+
+运行 (项目根目录):
+    python -m benchmarks.bench_1688_extraction --runs 5 --scales 1,4,16
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from playwright.async_api import async_playwright
+
+from benchmarks.fixture_server import FixtureServer
+from src.sourcing.sourcer_1688 import SOURCER_1688_EXTRACT_JS
+
+# 原 Sourcer1688.search_source 内联的解析脚本（仅用于对比）
+LEGACY_EXTRACT_JS = """(limit) => {
+    const results = [];
+    // 1. 找到所有包含图片的链接 (这通常是商品的主图)
+    const links = Array.from(document.querySelectorAll('a'));
+    
+    for (const link of links) {
+        if (results.length >= limit) break;
+        
+        // 过滤条件：必须有子图片，且可见高度足够（避免小图标）
+        const img = link.querySelector('img');
+        if (!img || link.offsetHeight < 50) continue;
+        
+        // 2. 以这个链接为基准，向上寻找“商品卡片容器”
+        // 并在容器内寻找标题和价格
+        let container = link.parentElement;
+        let price = "";
+        let title = "";
+        
+        // 向上遍历 5 层，寻找包含价格信息的区域
+        for (let i = 0; i < 5; i++) {
+            if (!container) break;
+            
+            // 获取容器内所有文本
+            const text = container.innerText;
+            
+            // 检查价格：找 "¥" 符号或纯数字价格模式
+            if (!price && (text.includes('¥') || /[0-9]+\\.[0-9]{2}/.test(text))) {
+                // 尝试找到具体的价格节点
+                const priceNode = Array.from(container.querySelectorAll('*')).find(el => 
+                    el.innerText && (el.innerText.includes('¥') || /^\\d+(\\.\\d+)?$/.test(el.innerText.trim())) && el.innerText.length < 15
+                );
+                if (priceNode) price = priceNode.innerText.trim();
+                else if (text.includes('¥')) {
+                    // 如果找不到节点，尝试正则提取
+                    const match = text.match(/¥\\s*([\\d\\.]+)/);
+                    if (match) price = match[0];
+                }
+            }
+            
+            // 检查标题：通常是除了价格以外最长的一段字
+            if (!title) {
+                if (link.title) title = link.title;
+                else if (img.alt && img.alt.length > 5) title = img.alt;
+                else {
+                    // 尝试找标题节点 (文本长度适中，不含价格)
+                    const titleNode = Array.from(container.querySelectorAll('div, span, a')).find(el => 
+                        el.innerText && el.innerText.length > 5 && el.innerText.length < 100 && !el.innerText.includes('¥')
+                    );
+                    if (titleNode) title = titleNode.innerText.trim();
+                }
+            }
+            
+            // 如果都找到了，就认为这是一个商品块
+            if (price && title) break;
+            
+            container = container.parentElement;
+        }
+        
+        if (price && title) {
+            // 去重
+            if (!results.find(r => r.link === link.href)) {
+                results.push({
+                    "platform": "1688",
+                    "title": title,
+                    "price": price,
+                    "supplier": "1688 Supplier",
+                    "link": link.href
+                });
+            }
+        }
+    }
+    return results;
+}"""
+
+SCALE_JS = """(scale) => {
+    const list = document.querySelector('#sm-offer-list');
+    const cards = Array.from(list.children);
+    for (let k = 1; k < scale; k++) {
+        for (const card of cards) {
+            const clone = card.cloneNode(true);
+            for (const a of clone.querySelectorAll('a[href]')) a.href = `${a.href}?dup=${k}`;
+            list.appendChild(clone);
+        }
+    }
+    return document.getElementsByTagName('*').length;
+}"""
+
+
+async def legacy(page, limit):
+    return await page.evaluate(LEGACY_EXTRACT_JS, limit)
+
+
+async def linear(page, limit):
+    return await page.evaluate(SOURCER_1688_EXTRACT_JS, {"limit": limit})
+
+
+STRATEGIES = {"legacy": legacy, "linear": linear}
+
+
+async def run(runs: int, scales, limits):
+    with FixtureServer() as server:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
+            print(f"{'strategy':<10}{'scale':>6}{'nodes':>8}{'limit':>7}{'items':>7}{'mean(ms)':>10}{'p95(ms)':>10}")
+            for scale in scales:
+                page = await context.new_page()
+                await page.goto(server.url("1688_search.html"))
+                nodes = await page.evaluate(SCALE_JS, scale)
+                for limit in limits:
+                    for name, strategy in STRATEGIES.items():
+                        timings = []
+                        for _ in range(runs):
+                            start = time.perf_counter()
+                            items = await strategy(page, limit)
+                            timings.append(time.perf_counter() - start)
+                        p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+                        print(f"{name:<10}{scale:>6}{nodes:>8}{limit:>7}{len(items):>7}"
+                              f"{statistics.mean(timings) * 1000:>10.1f}{p95 * 1000:>10.1f}")
+                await page.close()
+            await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scales", default="1,4,16", help="商品列表放大倍数，逗号分隔")
+    parser.add_argument("--limits", default="5,60", help="需要解析的商品数，逗号分隔")
+    args = parser.parse_args()
+    scales = [int(s) for s in args.scales.split(",")]
+    limits = [int(n) for n in args.limits.split(",")]
+    asyncio.run(run(args.runs, scales, limits))
+
+
+if __name__ == "__main__":
+    main()
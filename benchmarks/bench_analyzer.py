@@ -0,0 +1,142 @@
+"""
+市场统计基准：原 MarketAnalyzer 的逐平台 Python 循环 vs 向量化的 market_frame (一张 DataFrame + 一次 groupby)。
+
+合成数据集：多关键词、5 个销售平台 + 2 个供应链平台，价格格式覆盖 "$12.99" / "US $1,299.00" / "N/A" / "" / 区间价
+(含供应链 "¥1.5-3.0")，销售端与供应链条数约 9:1。各路径分别计时（取中位数），check 校验三条新路径结果一致：
+- legacy:     原循环 (每个平台一次全表扫描 + 每条记录一次正则)，只跑到 --legacy-max 行；
+              其价格解析会把区间价拼成错误数字、空串记为 0，结果与新路径不同，只作计时参照
+- records:    dict 列表 -> build_frame(keyword="") -> summarize(per_keyword=False)，即 analyze_potential 的路径
+- ingested:   同上，但记录已在采集入库时附加 price_cny (src.utils.normalize)，build_frame 不再解析价格
+- table:      已有 DataFrame (如商品库导出) -> build_frame -> summarize，含逐关键词统计；
+              拆分为 build (建表 + 向量化价格解析) 与 groupby 两部分
+
+运行 (项目根目录):
+    python -m benchmarks.bench_analyzer --rows 25,10000,100000,1000000 --runs 3
+"""
+import argparse
+import random
+import re
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from src.analysis.market_frame import build_frame, overall_stats, summarize
+from src.utils.normalize import normalize_records
+
+SALES_PLATFORMS = ["Amazon", "AliExpress", "Temu", "Shopee", "TikTok Shop"]
+SOURCING_PLATFORMS = ["1688", "YiwuGo"]
+
+
+def synthetic(rows: int, keywords: int, seed: int = 0) -> Tuple[List[Dict], List[Dict]]:
+    rnd = random.Random(seed)
+    kw = [f"keyword {i}" for i in range(keywords)]
+
+    def sales_price() -> str:
+        roll = rnd.random()
+        if roll < 0.05:
+            return "N/A"
+        if roll < 0.07:
+            return ""
+        if roll < 0.10:
+            return f"${rnd.randint(1, 30)}.99 - ${rnd.randint(31, 60)}.99"
+        if roll < 0.15:
+            return f"US ${rnd.randint(1000, 1999):,}.00"
+        return f"${rnd.randint(1, 200)}.{rnd.randint(0, 99):02d}"
+
+    def sourcing_price() -> str:
+        roll = rnd.random()
+        if roll < 0.05:
+            return "N/A"
+        if roll < 0.15:
+            low = rnd.randint(10, 1500) / 10
+            return f"¥{low}-{low + rnd.randint(1, 50) / 10:.1f}"
+        return f"{rnd.randint(10, 3000) / 10}"
+
+    n_sourcing = rows // 10
+    sales = [{"platform": rnd.choice(SALES_PLATFORMS), "keyword": rnd.choice(kw), "price": sales_price()}
+             for _ in range(rows - n_sourcing)]
+    sourcing = [{"platform": rnd.choice(SOURCING_PLATFORMS), "keyword": rnd.choice(kw),
+                 "price": sourcing_price()}
+                for _ in range(n_sourcing)]
+    return sales, sourcing
+
+
+def clean_price(price_str: str) -> float:
+    if not price_str or price_str == "N/A":
+        return 0.0
+    clean = re.sub(r'[^\d\.]', '', price_str)
+    try:
+        return float(clean)
+    except ValueError:
+        return 0.0
+
+
+def legacy(sales_data: List[Dict], sourcing_data: List[Dict]) -> Dict:
+    """原 MarketAnalyzer.analyze_potential 的统计部分（仅用于对比）"""
+    platform_stats = {}
+    all_sales_prices_cny = []
+    for p_name in SALES_PLATFORMS:
+        items = [p for p in sales_data if p_name in p['platform']]
+        prices = [clean_price(p['price']) for p in items if p['price'] != "N/A"]
+        platform_stats[p_name] = sum(prices) / len(prices) if prices else 0
+        for pr in prices:
+            all_sales_prices_cny.append(pr * 7.2)
+    avg_sales_price_cny = sum(all_sales_prices_cny) / len(all_sales_prices_cny) if all_sales_prices_cny else 0
+    src_prices = [clean_price(p['price']) for p in sourcing_data if p['price'] != "N/A"]
+    avg_src_price = sum(src_prices) / len(src_prices) if src_prices else 0
+    gross_margin = (avg_sales_price_cny - avg_src_price) / avg_sales_price_cny if avg_sales_price_cny > 0 else 0
+    return {"platform_stats": platform_stats, "avg_sourcing_price": avg_src_price, "gross_margin": gross_margin}
+
+
+def same(a: Dict, b: Dict) -> bool:
+    close = lambda x, y: abs(x - y) <= 1e-6 * max(1.0, abs(x), abs(y))
+    return (all(close(a["platform_stats"][p], b["platform_stats"][p]) for p in SALES_PLATFORMS)
+            and close(a["avg_sourcing_price"], b["avg_sourcing_price"])
+            and close(a["gross_margin"], b["gross_margin"]))
+
+
+def timed(fn, runs: int):
+    timings, result = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="25,10000,100000,1000000", help="数据集行数，逗号分隔")
+    parser.add_argument("--keywords", type=int, default=1000, help="数据集中的关键词数")
+    parser.add_argument("--runs", type=int, default=3, help="每项取中位数的重复次数")
+    parser.add_argument("--legacy-max", type=int, default=100000, help="原循环实现只跑到该行数")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9}{'legacy(ms)':>12}{'records(ms)':>13}{'ingested(ms)':>14}{'table build(ms)':>17}{'groupby(ms)':>13}{'speedup':>9}  check")
+    for rows in (int(n) for n in args.rows.split(",")):
+        sales, sourcing = synthetic(rows, min(args.keywords, max(1, rows // 10)))
+        sales_table, sourcing_table = pd.DataFrame(sales), pd.DataFrame(sourcing)
+        sales_ingested = normalize_records([dict(r) for r in sales])
+        sourcing_ingested = normalize_records([dict(r) for r in sourcing])
+
+        records_t, overall = timed(
+            lambda: overall_stats(summarize(build_frame(sales, sourcing, keyword=""), per_keyword=False)), args.runs)
+        ingested_t, ingested = timed(
+            lambda: overall_stats(summarize(build_frame(sales_ingested, sourcing_ingested, keyword=""), per_keyword=False)),
+            args.runs)
+        build_t, frame = timed(lambda: build_frame(sales_table, sourcing_table), args.runs)
+        groupby_t, summary = timed(lambda: summarize(frame), args.runs)
+        check = "ok" if same(overall, overall_stats(summary)) and same(overall, ingested) else "MISMATCH"
+        if rows <= args.legacy_max:
+            legacy_t, _ = timed(lambda: legacy(sales, sourcing), args.runs)
+            legacy_col, speedup = f"{legacy_t * 1000:>12.1f}", f"{legacy_t / records_t:>8.1f}x"
+        else:
+            legacy_col, speedup = f"{'-':>12}", f"{'-':>9}"
+        print(f"{rows:>9}{legacy_col}{records_t * 1000:>13.1f}{ingested_t * 1000:>14.1f}"
+              f"{build_t * 1000:>17.1f}{groupby_t * 1000:>13.1f}{speedup}  {check}")
+
+
+if __name__ == "__main__":
+    main()
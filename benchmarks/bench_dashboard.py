@@ -0,0 +1,88 @@
+"""
+仪表盘渲染基准：各渲染预设 (src.utils.visualizer.RENDER_PRESETS) 的单张渲染耗时、PNG 大小与嵌入图片后的 Word 报告大小，
+以及 render_dashboards 批量渲染的吞吐。
+
+场景：
+- cold:    每张图新建 DataVisualizer 并重新查找字体 / 设置主题、新建 Figure，300 dpi —— 等价于原实现
+- draft / report / print: 复用同一个 DataVisualizer（字体与主题只初始化一次，Figure 复用），仅 dpi 不同
+- batch:   --keywords 个关键词的仪表盘，render_dashboards 单进程顺序渲染 vs --processes 个渲染进程
+
+运行 (项目根目录):
+    python -m benchmarks.bench_dashboard --runs 5 --keywords 8 --processes 4
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from src.utils import visualizer as viz
+from src.utils.report_generator import ReportGenerator
+from src.utils.visualizer import RENDER_PRESETS, DataVisualizer, render_dashboards
+
+PLATFORMS = ["Amazon", "AliExpress", "Temu", "Shopee", "TikTok Shop", "1688", "YiwuGo"]
+
+
+def synthetic(keyword: str, seed: int = 0) -> Tuple[str, Dict, List[Dict], List[Dict], List[Dict]]:
+    rnd = random.Random(seed)
+    sales = [{"platform": rnd.choice(PLATFORMS[:5]), "title": f"{keyword} item {i}", "price": "",
+              "price_cny": round(rnd.uniform(20, 400), 2)} for i in range(200)]
+    sourcing = [{"platform": rnd.choice(PLATFORMS[5:]), "title": f"{keyword} 货源 {i}", "price": "",
+                 "supplier": "义乌某工厂", "price_cny": round(rnd.uniform(3, 60), 2)} for i in range(30)]
+    trend = [{"title": f"{keyword} kickstarter project {i}", "pledged": f"${rnd.randint(1000, 500000):,}",
+              "percent_funded": "120%", "description": "demo"} for i in range(5)]
+    analysis = {"recommendation": "推荐", "avg_amazon_price_usd": 25.3, "avg_sourcing_price_cny": 18.6,
+                "estimated_margin": f"{rnd.uniform(20, 70):.1f}%", "ai_analysis": "市场需求稳定，价格带集中。" * 20}
+    return keyword, analysis, sales, sourcing, trend
+
+
+def _cold(output_dir: str) -> DataVisualizer:
+    viz.resolve_chinese_font.cache_clear()
+    viz._theme_applied = False
+    return DataVisualizer(output_dir, "print")
+
+
+def time_renders(output_dir: str, job, runs: int, preset: str) -> Tuple[float, str]:
+    times, path = [], ""
+    visualizer = None if preset == "cold" else DataVisualizer(output_dir, preset)
+    for _ in range(runs):
+        start = time.perf_counter()
+        v = _cold(output_dir) if preset == "cold" else visualizer
+        path = v.generate_dashboard(*job)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="每个预设取中位数的渲染次数")
+    parser.add_argument("--keywords", type=int, default=8, help="batch 场景的关键词数")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="batch 场景的渲染进程数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as out:
+        job = synthetic("bench")
+        _, analysis, sales, sourcing, trend = job
+        generator = ReportGenerator(out)
+        print(f"{'preset':<8}{'dpi':>6}{'render(ms)':>12}{'png(KB)':>10}{'docx(KB)':>10}")
+        for preset in ["cold", *RENDER_PRESETS]:
+            seconds, png = time_renders(out, job, max(1, args.runs), preset)
+            docx = generator.generate_word_report("bench", analysis, sales, sourcing, trend, png)
+            dpi = RENDER_PRESETS["print" if preset == "cold" else preset]["dpi"]
+            print(f"{preset:<8}{dpi:>6}{seconds * 1000:>12.1f}{os.path.getsize(png) / 1024:>10.0f}"
+                  f"{os.path.getsize(docx) / 1024:>10.0f}")
+            os.remove(docx)
+
+        jobs = [synthetic(f"kw{i}", seed=i) for i in range(args.keywords)]
+        print(f"\nbatch: {args.keywords} 个关键词, report 预设")
+        for processes in sorted({1, args.processes}):
+            start = time.perf_counter()
+            render_dashboards(jobs, out, "report", processes=processes)
+            elapsed = time.perf_counter() - start
+            print(f"  processes={processes:<3}{elapsed:>8.2f}s  ({elapsed / args.keywords * 1000:.0f} ms/张，含进程启动)")
+
+
+if __name__ == "__main__":
+    main()
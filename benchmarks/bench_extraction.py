@@ -0,0 +1,174 @@
+"""
+搜索结果解析基准：逐元素 query_selector/inner_text vs 单次 page.evaluate。
+
+在本地样本页上分别执行：
+- amazon_legacy / yiwugo_legacy: 原 AmazonCrawler / SourcerYiwuGo 的逐卡片、逐字段解析
+                                 (每个字段至少一次浏览器往返)
+- amazon_batch  / yiwugo_batch:  specs/amazon.json 编译出的脚本 / YIWUGO_EXTRACT_JS 一次 evaluate 返回全部记录
+
+同时比较两种方式的解析结果（新脚本修正了整数部分自带小数点时拼出 "$19..99" 的问题，
+这类条目会计入差异）。
+
+运行 (项目根目录):
+    python -m benchmarks.bench_extraction --runs 10 --limit 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from playwright.async_api import async_playwright
+
+from benchmarks.fixture_server import FixtureServer
+from src.crawlers.spec_compiler import compile_spec, load_spec
+from src.sourcing.sourcer_yiwugo import YIWUGO_EXTRACT_JS
+
+
+class RoundTrips:
+    """统计浏览器往返次数：每次 await Playwright 调用计一次"""
+    def __init__(self):
+        self.count = 0
+
+    async def __call__(self, awaitable):
+        self.count += 1
+        return await awaitable
+
+
+async def amazon_legacy(page, keyword, limit, rt):
+    products = []
+    results = await rt(page.query_selector_all('div[data-component-type="s-search-result"]'))
+    if not results:
+        results = await rt(page.query_selector_all('.s-result-item[data-asin]'))
+
+    for item in results[:limit]:
+        try:
+            title_el = await rt(item.query_selector('h2 span'))
+            title = await rt(title_el.inner_text()) if title_el else "Unknown Title"
+
+            price = "N/A"
+            price_el = await rt(item.query_selector('.a-price .a-offscreen'))
+            if price_el:
+                price = await rt(price_el.inner_text())
+            if price == "N/A" or not price:
+                price_whole = await rt(item.query_selector('.a-price-whole'))
+                price_fraction = await rt(item.query_selector('.a-price-fraction'))
+                if price_whole:
+                    whole = await rt(price_whole.inner_text())
+                    frac = await rt(price_fraction.inner_text()) if price_fraction else "00"
+                    price = f"${whole}.{frac}"
+
+            asin = await rt(item.get_attribute('data-asin'))
+
+            rating = "N/A"
+            rating_el = await rt(item.query_selector('span[aria-label*="out of 5 stars"]'))
+            if rating_el:
+                rating = await rt(rating_el.get_attribute('aria-label'))
+
+            reviews = "0"
+            reviews_el = await rt(item.query_selector('span[aria-label*="ratings"], a .a-size-base'))
+            if reviews_el:
+                reviews = await rt(reviews_el.inner_text())
+
+            img_el = await rt(item.query_selector('img.s-image'))
+            img_url = await rt(img_el.get_attribute('src')) if img_el else ""
+
+            products.append({
+                "platform": "Amazon",
+                "keyword": keyword,
+                "title": title.strip(),
+                "price": price.strip(),
+                "rating": rating,
+                "reviews_count": reviews,
+                "asin": asin,
+                "image_url": img_url,
+                "product_url": f"https://www.amazon.com/dp/{asin}" if asin else ""
+            })
+        except Exception:
+            continue
+    return products
+
+
+async def yiwugo_legacy(page, keyword, limit, rt):
+    items = await rt(page.query_selector_all('.pro_item'))
+    sources = []
+    for item in items[:limit]:
+        try:
+            title_el = await rt(item.query_selector('.product_title a'))
+            title = await rt(title_el.get_attribute('title')) if title_el else "Unknown"
+
+            price_el = await rt(item.query_selector('.pri-num em, .pri_price'))
+            price = await rt(price_el.inner_text()) if price_el else "N/A"
+
+            company_el = await rt(item.query_selector('.shop_name a, .company_name'))
+            company = await rt(company_el.inner_text()) if company_el else "Unknown Shop"
+
+            link_el = await rt(item.query_selector('.product_title a'))
+            link = await rt(link_el.get_attribute('href')) if link_el else ""
+            if link and not link.startswith('http'):
+                link = f"https://www.yiwugo.com{link}"
+
+            sources.append({
+                "platform": "YiwuGo",
+                "search_term": keyword,
+                "title": title.strip(),
+                "price": price.strip(),
+                "supplier": company.strip(),
+                "link": link
+            })
+        except Exception:
+            continue
+    return sources
+
+
+def batch(script):
+    async def extract(page, keyword, limit, rt):
+        return await rt(page.evaluate(script, {"limit": limit, "keyword": keyword}))
+    return extract
+
+
+CASES = [
+    ("amazon_search.html", "yoga mat", {"amazon_legacy": amazon_legacy, "amazon_batch": batch(compile_spec(load_spec("amazon")))}),
+    ("yiwugo_search.html", "瑜伽垫", {"yiwugo_legacy": yiwugo_legacy, "yiwugo_batch": batch(YIWUGO_EXTRACT_JS)}),
+]
+
+
+async def run(runs: int, limit: int):
+    with FixtureServer() as server:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
+            print(f"{'strategy':<16}{'items':>7}{'round_trips':>13}{'mean(ms)':>10}{'p95(ms)':>10}{'items/s':>10}")
+            for fixture, keyword, strategies in CASES:
+                page = await context.new_page()
+                await page.goto(server.url(fixture))
+                outputs = {}
+                for name, strategy in strategies.items():
+                    timings = []
+                    for _ in range(runs):
+                        rt = RoundTrips()
+                        start = time.perf_counter()
+                        outputs[name] = await strategy(page, keyword, limit, rt)
+                        timings.append(time.perf_counter() - start)
+                    mean = statistics.mean(timings)
+                    p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+                    items = len(outputs[name])
+                    print(f"{name:<16}{items:>7}{rt.count:>13}{mean * 1000:>10.1f}{p95 * 1000:>10.1f}"
+                          f"{items / mean if mean else 0:>10.0f}")
+                legacy, new = outputs.values()
+                if legacy != new:
+                    diff = sum(1 for a, b in zip(legacy, new) if a != b) + abs(len(legacy) - len(new))
+                    print(f"  ⚠️ {fixture}: 两种解析结果有 {diff} 条不一致")
+                await page.close()
+            await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=50, help="每页解析的商品数")
+    args = parser.parse_args()
+    asyncio.run(run(args.runs, args.limit))
+
+
+if __name__ == "__main__":
+    main()
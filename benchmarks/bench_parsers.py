@@ -0,0 +1,196 @@
+"""
+离线解析基准：在保存的各平台搜索结果页上反复执行各爬虫的 page.evaluate 解析脚本。
+
+每个用例报告：
+- items:       解析出的记录数（产出）
+- p50/p95(ms): 单次解析耗时分位数（含一次浏览器往返）
+- items/s:     按平均耗时折算的解析吞吐
+- fill:        各字段的填充率（空值与 "N/A"/"Unknown" 等占位值视为未填充）
+
+与基线 (benchmarks/baselines/parsers.json) 比较，出现以下任一情况即判定退化并以非 0 退出：
+- p95 耗时超过基线的 (1 + --max-slowdown) 倍（且差值超过 --noise-ms）；基线中没有 p95_ms 的用例不比较耗时
+- 记录数少于基线
+- 任一字段填充率比基线下降超过 --max-fill-drop
+
+仓库中提交的基线只包含与机器无关的 items / fill；耗时与机器相关，需要耗时门禁时在同规格 CI 上用
+--update-baseline 生成（会补上 p50/p95）。修改了某个平台的解析脚本、确认结果符合预期后同样重新生成基线。
+CI 中加 --require-baseline：基线文件缺失或缺少某个用例时同样判定失败，而不是跳过检查。
+
+运行 (项目根目录):
+    python -m benchmarks.bench_parsers --runs 20
+    python -m benchmarks.bench_parsers --only temu,shopee
+    python -m benchmarks.bench_parsers --update-baseline
+    python -m benchmarks.bench_parsers --runs 20 --require-baseline   # CI
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+from playwright.async_api import async_playwright
+
+from benchmarks.fixture_server import FixtureServer
+from src.crawlers.spec_compiler import compile_spec, load_spec
+from src.sourcing.sourcer_1688 import SOURCER_1688_EXTRACT_JS
+from src.sourcing.sourcer_yiwugo import YIWUGO_EXTRACT_JS
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "parsers.json")
+
+
+def spec_script(name: str) -> str:
+    """站点规则编译出的解析脚本（与 SpecCrawler 运行时使用的脚本相同）"""
+    return compile_spec(load_spec(name))
+
+
+# 用例: 名称 -> (样本页, 解析脚本, 统计填充率的字段)
+CASES = {
+    "amazon": ("amazon_search.html", spec_script("amazon"), ["title", "price", "rating", "reviews_count", "asin", "image_url"]),
+    "temu": ("temu_search.html", spec_script("temu"), ["title", "price", "sold", "link"]),
+    "aliexpress": ("aliexpress_search.html", spec_script("aliexpress"), ["title", "price", "sold", "link"]),
+    "shopee": ("shopee_search.html", spec_script("shopee"), ["title", "price", "sold", "link"]),
+    "tiktok_trending": ("tiktok_trending.html", spec_script("tiktok_trending"), ["title", "ranking", "hot_index"]),
+    "tiktok_shop": ("tiktok_shop_search.html", spec_script("tiktok_shop"), ["title", "price", "sold", "link"]),
+    "kickstarter": ("kickstarter_search.html", spec_script("kickstarter"), ["title", "description", "pledged", "percent_funded", "days_to_go"]),
+    "1688": ("1688_search.html", SOURCER_1688_EXTRACT_JS, ["title", "price", "supplier", "link"]),
+    "yiwugo": ("yiwugo_search.html", YIWUGO_EXTRACT_JS, ["title", "price", "supplier", "link"]),
+}
+
+# 解析脚本在字段缺失时写入的占位值
+PLACEHOLDERS = {"", "N/A", "0", "Unknown", "Unknown Title", "Unknown Product", "Unknown Shop", "Product", "1688 Supplier"}
+
+
+def fill_rates(items: List[Dict[str, Any]], fields: List[str]) -> Dict[str, float]:
+    if not items:
+        return {field: 0.0 for field in fields}
+    return {
+        field: round(sum(1 for item in items if str(item.get(field) or "").strip() not in PLACEHOLDERS) / len(items), 3)
+        for field in fields
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def bench_case(context, server, fixture: str, script: str, fields: List[str], runs: int, limit: int) -> Dict[str, Any]:
+    page = await context.new_page()
+    try:
+        await page.goto(server.url(fixture))
+        arg = {"limit": limit, "keyword": "yoga mat"}
+        items = await page.evaluate(script, arg)  # 预热
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            items = await page.evaluate(script, arg)
+            timings.append(time.perf_counter() - start)
+    finally:
+        await page.close()
+
+    mean = statistics.mean(timings)
+    return {
+        "items": len(items),
+        "p50_ms": round(percentile(timings, 50) * 1000, 2),
+        "p95_ms": round(percentile(timings, 95) * 1000, 2),
+        "items_per_sec": round(len(items) / mean, 1) if mean else 0.0,
+        "fill": fill_rates(items, fields),
+    }
+
+
+def compare(name: str, current: Dict[str, Any], baseline: Dict[str, Any], args) -> List[str]:
+    """返回退化描述列表（为空表示通过）"""
+    problems = []
+    if "p95_ms" in baseline:
+        limit_ms = baseline["p95_ms"] * (1 + args.max_slowdown)
+        if current["p95_ms"] > limit_ms and current["p95_ms"] - baseline["p95_ms"] > args.noise_ms:
+            problems.append(f"{name}: p95 {baseline['p95_ms']}ms -> {current['p95_ms']}ms")
+    if current["items"] < baseline["items"]:
+        problems.append(f"{name}: 记录数 {baseline['items']} -> {current['items']}")
+    for field, rate in baseline.get("fill", {}).items():
+        now = current["fill"].get(field, 0.0)
+        if rate - now > args.max_fill_drop:
+            problems.append(f"{name}: {field} 填充率 {rate:.0%} -> {now:.0%}")
+    return problems
+
+
+async def run(args) -> Dict[str, Dict[str, Any]]:
+    names = args.only.split(",") if args.only else list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        raise SystemExit(f"未知用例: {', '.join(unknown)} (可选: {', '.join(CASES)})")
+
+    results = {}
+    with FixtureServer() as server:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
+            print(f"{'case':<17}{'items':>6}{'p50(ms)':>9}{'p95(ms)':>9}{'items/s':>10}  fill")
+            for name in names:
+                fixture, script, fields = CASES[name]
+                r = await bench_case(context, server, fixture, script, fields, args.runs, args.limit)
+                results[name] = r
+                fill = " ".join(f"{field}={rate:.0%}" for field, rate in r["fill"].items())
+                print(f"{name:<17}{r['items']:>6}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['items_per_sec']:>10.0f}  {fill}")
+            await browser.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=100, help="传给解析脚本的 limit（大于样本商品数即解析整页）")
+    parser.add_argument("--only", default="", help="只运行指定用例，逗号分隔")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="用本次结果覆盖基线")
+    parser.add_argument("--require-baseline", action="store_true", help="基线文件或其中的用例缺失时判定失败（CI 使用）")
+    parser.add_argument("--max-slowdown", type=float, default=0.25, help="允许的 p95 变慢比例")
+    parser.add_argument("--noise-ms", type=float, default=2.0, help="小于该差值的耗时变化视为噪声")
+    parser.add_argument("--max-fill-drop", type=float, default=0.05, help="允许的字段填充率下降")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"\n基线已更新: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        if args.require_baseline:
+            print(f"\n❌ 未找到基线 {args.baseline}（可用 --update-baseline 生成）")
+            sys.exit(1)
+        print(f"\n未找到基线 {args.baseline}，跳过退化检查（可用 --update-baseline 生成）")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    problems = []
+    for name, current in results.items():
+        if name in baseline:
+            problems.extend(compare(name, current, baseline[name], args))
+        elif args.require_baseline:
+            problems.append(f"{name}: 基线中没有该用例")
+        else:
+            print(f"基线中没有用例 {name}，跳过比较")
+
+    if problems:
+        print("\n❌ 解析性能/产出退化:")
+        for problem in problems:
+            print(f"  - {problem}")
+        sys.exit(1)
+    print("\n✅ 与基线相比无退化")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+页面就绪等待基准：固定 sleep 滚动 vs 事件驱动的 wait_for_items。
+
+在本地懒加载样本页 (fixtures/lazy_grid.html) 上分别执行：
+- temu_legacy:       3 次 scrollBy(800) + sleep(1)   (原 TemuCrawler)
+- fixed_sleep_legacy: 1 次 scrollBy(1000) + sleep(2)  (原 AliExpress/Shopee)
+- readiness:         wait_for_items(selector, target)
+
+运行 (项目根目录):
+    python -m benchmarks.bench_readiness --runs 5 --latency 300
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from playwright.async_api import async_playwright
+
+from benchmarks.fixture_server import FixtureServer
+from src.crawlers.readiness import wait_for_items
+
+SELECTOR = 'a[href*="goods_id"]'
+
+
+async def temu_legacy(page, target):
+    for _ in range(3):
+        await page.evaluate("window.scrollBy(0, 800)")
+        await asyncio.sleep(1)
+
+
+async def fixed_sleep_legacy(page, target):
+    await page.evaluate("window.scrollBy(0, 1000)")
+    await asyncio.sleep(2)
+
+
+async def readiness(page, target):
+    await wait_for_items(page, SELECTOR, target)
+
+
+STRATEGIES = {
+    "temu_legacy": temu_legacy,
+    "fixed_sleep_legacy": fixed_sleep_legacy,
+    "readiness": readiness,
+}
+
+
+async def run(runs: int, latency: int, targets):
+    with FixtureServer() as server:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(viewport={'width': 1280, 'height': 800})
+            print(f"{'strategy':<20}{'target':>8}{'mean(s)':>10}{'p95(s)':>10}{'items':>8}")
+            for target in targets:
+                for name, strategy in STRATEGIES.items():
+                    timings, counts = [], []
+                    for _ in range(runs):
+                        page = await context.new_page()
+                        await page.goto(server.url(f"lazy_grid.html?latency={latency}"))
+                        await page.wait_for_selector(SELECTOR)
+                        start = time.perf_counter()
+                        await strategy(page, target)
+                        timings.append(time.perf_counter() - start)
+                        counts.append(await page.evaluate(f"document.querySelectorAll('{SELECTOR}').length"))
+                        await page.close()
+                    p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+                    print(f"{name:<20}{target:>8}{statistics.mean(timings):>10.2f}{p95:>10.2f}{min(counts):>8}")
+            await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=int, default=300, help="样本页每批懒加载的模拟延迟(ms)")
+    parser.add_argument("--targets", default="5,20,40", help="需要的商品数，逗号分隔")
+    args = parser.parse_args()
+    targets = [int(t) for t in args.targets.split(",")]
+    asyncio.run(run(args.runs, args.latency, targets))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+CLI 启动导入耗时基准：每个场景在新的 Python 进程中以 -X importtime 运行，统计全部模块的导入耗时
+(各模块 self 时间之和) 与耗时最多的顶层包。
+
+场景：
+- cli_help:      python main.py --help，只解析参数，不应导入任何爬虫 / 分析 / 报告依赖
+- one_platform:  只启用 Amazon (PLATFORMS=amazon) 时采集阶段需要导入的模块
+- all_platforms: 全部平台的爬虫模块
+- full:          全部平台 + 分析 + 全部报告格式 (matplotlib / python-docx / openpyxl)
+
+cli_help 超过 --budget-ms 时以非零状态退出，可直接放进 CI。
+
+运行 (项目根目录):
+    python -m benchmarks.bench_startup --runs 3 --budget-ms 150
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_LOAD_PLATFORMS = ("import main; from src.pipeline.orchestrator import KeywordPipeline; "
+                   "from src.pipeline.registry import platforms; [spec.load() for spec in platforms()]")
+_LOAD_ALL = (_LOAD_PLATFORMS + "; from src.analysis.market_analyzer import MarketAnalyzer; "
+             "from src.pipeline.registry import OUTPUTS, load_output; [load_output(fmt) for fmt in OUTPUTS]")
+
+SCENARIOS: Dict[str, Tuple[List[str], Dict[str, str]]] = {
+    "cli_help": (["main.py", "--help"], {}),
+    "one_platform": (["-c", _LOAD_PLATFORMS], {"PLATFORMS": "amazon"}),
+    "all_platforms": (["-c", _LOAD_PLATFORMS], {"PLATFORMS": ""}),
+    "full": (["-c", _LOAD_ALL], {"PLATFORMS": ""}),
+}
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """返回 (全部模块 self 耗时之和 ms, 顶层模块 -> 累计耗时 ms)"""
+    total, top = 0.0, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line.split("|")
+        self_us, cumulative_us, name = int(fields[0].split(":")[1]), int(fields[1]), fields[2]
+        total += self_us / 1000
+        if not name.startswith("  "):
+            top[name.strip()] = top.get(name.strip(), 0.0) + cumulative_us / 1000
+    return total, top
+
+
+def run_scenario(argv: List[str], env: Dict[str, str]) -> Tuple[float, Dict[str, float]]:
+    proc = subprocess.run([sys.executable, "-X", "importtime", *argv], cwd=ROOT, capture_output=True, text=True,
+                          env={**os.environ, **env, "PYTHONDONTWRITEBYTECODE": "1"})
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["?"]
+        raise RuntimeError(f"退出码 {proc.returncode}: {tail[0]}")
+    return parse_importtime(proc.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="每个场景取中位数的重复次数")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="cli_help 场景的导入耗时预算 (ms)")
+    parser.add_argument("--top", type=int, default=5, help="每个场景列出的最慢顶层模块数")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="要运行的场景，逗号分隔")
+    args = parser.parse_args()
+
+    over_budget = False
+    print(f"{'scenario':<15}{'import(ms)':>12}  slowest top-level imports (cumulative ms)")
+    for name in args.scenarios.split(","):
+        argv, env = SCENARIOS[name]
+        try:
+            runs = [run_scenario(argv, env) for _ in range(max(1, args.runs))]
+        except RuntimeError as e:
+            print(f"{name:<15}{'error':>12}  {e}")
+            continue
+        total = statistics.median(t for t, _ in runs)
+        top = runs[-1][1]
+        slowest = ", ".join(f"{mod} {ms:.0f}" for mod, ms in sorted(top.items(), key=lambda kv: -kv[1])[:args.top])
+        flag = ""
+        if name == "cli_help" and total > args.budget_ms:
+            over_budget = True
+            flag = f"  超出预算 {args.budget_ms:.0f}ms"
+        print(f"{name:<15}{total:>12.1f}  {slowest}{flag}")
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+压测用的本地替身服务：模拟各平台搜索结果页 + OpenAI 兼容的 Chat Completions 接口。
+
+- 路径第一段为平台名 (与 Config.site_url 的平台名一致)，例如 /amazon/s?k=...、/1688_search/selloffer/...；
+  搜索页返回 fixtures/ 中保存的样本页，1688 首页返回带搜索框的表单页；
+- 每个页面请求可注入 延迟 (latency ± jitter)、错误 (503) 与 验证码拦截页；
+- POST /v1/chat/completions 按 llm_latency 延迟后返回固定回复（翻译请求返回中文关键词，批量翻译返回 JSON 对象，
+  stream=true 时以 SSE 分段输出）。
+"""
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import urlparse
+
+from benchmarks.fixture_server import FIXTURE_DIR
+
+# 平台 -> 搜索结果样本页
+SITE_FIXTURES = {
+    "amazon": "amazon_search.html",
+    "aliexpress": "aliexpress_search.html",
+    "temu": "temu_search.html",
+    "shopee": "shopee_search.html",
+    "tiktok": "tiktok_shop_search.html",
+    "tiktok_trending": "tiktok_trending.html",
+    "kickstarter": "kickstarter_search.html",
+    "1688_search": "1688_search.html",
+    "yiwugo": "yiwugo_search.html",
+}
+
+HOME_1688 = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>阿里1688</title></head>
+<body>
+<form action="/1688_search/selloffer/offer_search.htm" method="get">
+  <input id="alisearch-keywords" name="keywords" type="text">
+</form>
+</body></html>"""
+
+CAPTCHA_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Robot Check - Security Verification</title></head>
+<body><div id="captcha">Robot check: please complete the captcha to verify (验证)</div></body></html>"""
+
+ERROR_PAGE = "<html><body><h1>503 Service Unavailable</h1></body></html>"
+
+LLM_TRANSLATION = "瑜伽垫"
+LLM_ANALYSIS = """### 市场分析 (压测模拟回复)
+1. **需求热度**: 中等偏高，多平台均有稳定销量。
+2. **利润空间**: 按采集均价估算毛利可观，需关注物流成本。
+3. **竞争格局**: 头部卖家集中，建议差异化切入。
+4. **建议**: 小批量测款。"""
+
+
+class FakeMarket:
+    """
+    用法:
+        with FakeMarket(latency=0.8, error_rate=0.02) as market:
+            os.environ["SITE_URL_AMAZON"] = market.url("amazon")
+    """
+    def __init__(self, latency: float = 0.5, jitter: float = 0.2, error_rate: float = 0.0, captcha_rate: float = 0.0,
+                 llm_latency: float = 1.0, host: str = "127.0.0.1", port: int = 0, seed: int = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.captcha_rate = captcha_rate
+        self.llm_latency = llm_latency
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"pages": 0, "errors": 0, "captchas": 0, "llm_calls": 0}
+        self.pages: Dict[str, bytes] = {}
+        for site, fixture in SITE_FIXTURES.items():
+            with open(os.path.join(FIXTURE_DIR, fixture), "rb") as f:
+                self.pages[site] = f.read()
+
+        market = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                market._handle_page(self)
+
+            def do_POST(self):
+                market._handle_llm(self)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, site: str = "") -> str:
+        return f"http://{self.host}:{self.port}/{site}".rstrip("/")
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _roll(self, rate: float) -> bool:
+        with self._lock:
+            return self.random.random() < rate
+
+    def _delay(self, base: float) -> float:
+        with self._lock:
+            return max(0.0, base + self.random.uniform(-self.jitter, self.jitter))
+
+    @staticmethod
+    def _send(handler, status: int, body: bytes, content_type: str = "text/html; charset=utf-8"):
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _handle_page(self, handler):
+        site = urlparse(handler.path).path.strip("/").split("/")[0]
+        if site == "1688":
+            body = HOME_1688.encode("utf-8")
+        elif site in self.pages:
+            body = self.pages[site]
+        else:
+            # 图片等子资源：直接 404，不计入页面请求
+            self._send(handler, 404, b"", "text/plain")
+            return
+
+        self._count("pages")
+        time.sleep(self._delay(self.latency))
+        if self._roll(self.error_rate):
+            self._count("errors")
+            self._send(handler, 503, ERROR_PAGE.encode("utf-8"))
+        elif self._roll(self.captcha_rate):
+            self._count("captchas")
+            self._send(handler, 200, CAPTCHA_PAGE.encode("utf-8"))
+        else:
+            self._send(handler, 200, body)
+
+    def _handle_llm(self, handler):
+        if not urlparse(handler.path).path.endswith("/chat/completions"):
+            self._send(handler, 404, b"", "text/plain")
+            return
+        length = int(handler.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(handler.rfile.read(length) or b"{}")
+        except ValueError:
+            request = {}
+        self._count("llm_calls")
+        delay = self._delay(self.llm_latency)
+
+        prompt = " ".join(str(m.get("content", "")) for m in request.get("messages", []))
+        if "translate" not in prompt.lower():
+            content = LLM_ANALYSIS
+        elif request.get("response_format", {}).get("type") == "json_object":
+            # 批量翻译：提示词末尾为关键词 JSON 数组，逐个返回同一个中文词
+            try:
+                keywords = json.loads(prompt[prompt.rindex("["):])
+            except ValueError:
+                keywords = []
+            content = json.dumps({kw: LLM_TRANSLATION for kw in keywords}, ensure_ascii=False)
+        else:
+            content = LLM_TRANSLATION
+        if request.get("stream"):
+            self._stream_llm(handler, request, content, delay)
+            return
+        time.sleep(delay)
+        response = {
+            "id": f"chatcmpl-loadtest-{self.stats['llm_calls']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "loadtest"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (len(prompt) + len(content)) // 4},
+        }
+        self._send(handler, 200, json.dumps(response, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def _stream_llm(self, handler, request: dict, content: str, delay: float):
+        """SSE 流式回复：首段在 delay 的 20% 后到达，其余分段在剩余时间内均匀输出"""
+        pieces = [content[i:i + 16] for i in range(0, len(content), 16)] or [""]
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+
+        def write(data: str):
+            body = f"data: {data}\n\n".encode("utf-8")
+            handler.wfile.write(f"{len(body):x}\r\n".encode("ascii") + body + b"\r\n")
+            handler.wfile.flush()
+
+        time.sleep(delay * 0.2)
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(delay * 0.8 / len(pieces))
+            write(json.dumps({
+                "id": "chatcmpl-loadtest-stream",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "loadtest"),
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            }, ensure_ascii=False))
+        write("[DONE]")
+        handler.wfile.write(b"0\r\n\r\n")
+
+    def __enter__(self) -> "FakeMarket":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,36 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """
+    本地静态 HTTP 服务器，用于在无头浏览器中加载保存的页面样本（基准测试专用）。
+    用法:
+        with FixtureServer() as server:
+            await page.goto(server.url("temu_search.html"))
+    """
+    def __init__(self, directory: str = FIXTURE_DIR, host: str = "127.0.0.1", port: int = 0):
+        handler = functools.partial(_QuietHandler, directory=directory)
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, path: str = "") -> str:
+        return f"http://{self.host}:{self.port}/{path.lstrip('/')}"
+
+    def __enter__(self) -> "FixtureServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,195 @@
+"""
+端到端压测：把所有爬虫/找货器和 LLM 指向本地替身服务 (benchmarks/fake_market.py)，
+用 BatchRunner (即 main.py 的批量模式) 跑完整流水线：采集 -> 入库 -> 分析 -> 报告。
+
+报告：
+- keywords/hour:  端到端吞吐
+- 各阶段耗时:      sales / trend / sourcing (该阶段最慢平台) / first_insight / analysis / artifact / total 的 p50 / p95 / max
+- 峰值 RSS:        本进程 + 浏览器子进程的内存峰值（Linux 读取 /proc，其他平台只统计本进程）
+- 替身服务统计:    页面请求、注入的错误/验证码、LLM 调用次数
+
+所有输出（商品库、报告、1688 用户目录）写入临时目录，不影响 data/。
+用于在上线前验证并发 / 缓存相关的改动，例如:
+    python -m benchmarks.loadtest --keywords 200 --concurrency 4 --latency 0.8 --error-rate 0.02
+    python -m benchmarks.loadtest -f keywords.txt --captcha-rate 0.05 --output loadtest.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+from benchmarks.fake_market import SITE_FIXTURES, FakeMarket
+from src.config import Config
+from src.pipeline.batch import BatchRunner
+from src.pipeline.keywords import load_keywords
+from src.storage.keyword_dictionary import KeywordDictionary
+from src.storage.llm_cache import LLMCache
+from src.storage.product_store import ProductStore
+from src.utils.llm_client import LLMClient
+
+STAGES = ["sales", "trend", "sourcing", "first_insight", "analysis", "artifact", "total"]
+
+SEED_WORDS = ["yoga mat", "water bottle", "phone case", "running shoes", "wireless earbuds",
+              "desk lamp", "pet bed", "camping chair", "resistance band", "lunch box"]
+
+
+def synthetic_keywords(count: int) -> List[str]:
+    return [f"{SEED_WORDS[i % len(SEED_WORDS)]} {i // len(SEED_WORDS) + 1}" for i in range(count)]
+
+
+class RssSampler:
+    """后台线程定时采样进程树的常驻内存，记录峰值"""
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    def _tree_rss(self) -> int:
+        if not os.path.isdir("/proc"):
+            return 0
+        children: Dict[int, List[int]] = {}
+        for name in os.listdir("/proc"):
+            if not name.isdigit():
+                continue
+            try:
+                with open(f"/proc/{name}/stat") as f:
+                    # comm 可能含空格，从最后一个 ')' 之后解析
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(name))
+
+        total, stack = 0, [os.getpid()]
+        while stack:
+            pid = stack.pop()
+            try:
+                with open(f"/proc/{pid}/statm") as f:
+                    total += int(f.read().split()[1]) * self._page_size
+            except (OSError, IndexError, ValueError):
+                pass
+            stack.extend(children.get(pid, []))
+        return total
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self._tree_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def configure(market: FakeMarket, workdir: str):
+    """把所有站点、LLM 与本地存储指向替身服务 / 临时目录"""
+    for site in list(SITE_FIXTURES) + ["1688"]:
+        os.environ["SITE_URL_" + site.upper()] = market.url(site)
+    Config.LLM_API_KEY = "loadtest"
+    Config.LLM_BASE_URL = market.url("v1")
+    Config.HEADLESS_MODE = True
+    Config.PAGE_CACHE_MODE = "off"
+    Config.DATA_DIR = os.path.join(workdir, "data")
+    Config.PRODUCT_STORE_PATH = os.path.join(workdir, "products.db")
+    os.makedirs(Config.DATA_DIR, exist_ok=True)
+    Config.LLM_CACHE_PATH = os.path.join(workdir, "llm_cache.db")
+    Config.KEYWORD_DICT_PATH = os.path.join(workdir, "keyword_dict.db")
+    ProductStore._shared = None
+    LLMCache._shared = None
+    KeywordDictionary._shared = None
+    LLMClient._shared = None
+
+
+def stage_latency(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    summary = {}
+    for stage in STAGES:
+        values = sorted(r[f"{stage}_seconds"] for r in rows if r.get(f"{stage}_seconds") is not None)
+        if not values:
+            continue
+        summary[stage] = {
+            "p50": round(statistics.median(values), 2),
+            "p95": round(values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))], 2),
+            "max": round(values[-1], 2),
+        }
+    return summary
+
+
+async def run(args, keywords: List[str]) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="botsales_loadtest_") as workdir:
+        with FakeMarket(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                        captcha_rate=args.captcha_rate, llm_latency=args.llm_latency, seed=args.seed) as market:
+            configure(market, workdir)
+            runner = BatchRunner(keywords, concurrency=args.concurrency, limit=args.limit,
+                                 report_dir=os.path.join(workdir, "reports"))
+            with RssSampler() as sampler:
+                outcome = await runner.run()
+
+    # ru_maxrss: Linux 为 KB，macOS 为字节
+    self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    self_peak_mb = self_peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+    return {
+        "config": vars(args),
+        "run": outcome["stats"],
+        "stages": stage_latency(outcome["rows"]),
+        "peak_rss_mb": round(max(sampler.peak_bytes / 1024 / 1024, self_peak_mb), 1),
+        "python_peak_rss_mb": round(self_peak_mb, 1),
+        "market": dict(market.stats),
+        "statuses": {s: sum(1 for r in outcome["rows"] if r["status"] == s) for s in {r["status"] for r in outcome["rows"]}},
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    run_stats = report["run"]
+    print("\n" + "=" * 50)
+    print(f" 吞吐量: {run_stats['keywords_per_hour']} 关键词/小时")
+    print("=" * 50)
+    print(f"成功 {run_stats['succeeded']}/{run_stats['keywords']}，总耗时 {run_stats['wall_seconds']}s，并发 {run_stats['concurrency']}")
+    print(f"\n{'stage':<14}{'p50(s)':>9}{'p95(s)':>9}{'max(s)':>9}")
+    for stage, st in report["stages"].items():
+        print(f"{stage:<14}{st['p50']:>9.2f}{st['p95']:>9.2f}{st['max']:>9.2f}")
+    print(f"\n峰值 RSS: {report['peak_rss_mb']} MB (Python 进程 {report['python_peak_rss_mb']} MB)")
+    print(f"替身服务: {report['market']}")
+    print(f"关键词状态: {report['statuses']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keywords", type=int, default=100, help="生成的合成关键词数量（未指定 -f 时）")
+    parser.add_argument("-f", "--keyword-file", help="关键词文件，每行一个")
+    parser.add_argument("-c", "--concurrency", type=int, default=2)
+    parser.add_argument("-n", "--limit", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.5, help="页面响应延迟(秒)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="延迟随机抖动(秒)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="页面请求返回 503 的比例")
+    parser.add_argument("--captcha-rate", type=float, default=0.0, help="页面请求返回验证码页的比例")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="模拟 LLM 接口延迟(秒)")
+    parser.add_argument("--seed", type=int, default=None, help="错误/验证码注入的随机种子")
+    parser.add_argument("--output", help="把完整结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    keywords = load_keywords(keyword_file=args.keyword_file) if args.keyword_file else synthetic_keywords(args.keywords)
+    print(f"=== 压测: {len(keywords)} 个关键词, 并发 {args.concurrency}, 页面延迟 {args.latency}s, "
+          f"错误率 {args.error_rate:.0%}, 验证码率 {args.captcha_rate:.0%} ===")
+    report = asyncio.run(run(args, keywords))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
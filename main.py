@@ -1,131 +1,153 @@
 import asyncio
-from src.crawlers.amazon_crawler import AmazonCrawler
-from src.crawlers.aliexpress_crawler import AliExpressCrawler
-from src.crawlers.temu_crawler import TemuCrawler
-from src.crawlers.shopee_crawler import ShopeeCrawler
-from src.crawlers.tiktok_crawler import TikTokCrawler
-from src.crawlers.kickstarter_crawler import KickstarterCrawler
-from src.sourcing.sourcer_1688 import Sourcer1688
-from src.sourcing.sourcer_yiwugo import SourcerYiwuGo
-from src.utils.translator import Translator
-from src.analysis.market_analyzer import MarketAnalyzer
-from src.utils.visualizer import DataVisualizer
-from src.utils.report_generator import ReportGenerator
-import pandas as pd
-import os
-from datetime import datetime
+import argparse
+from src.config import Config
+from src.pipeline.keywords import load_keywords
+from src.pipeline.registry import PLATFORMS, OUTPUTS
+from src.utils.telemetry import Tracer, current_keyword
 import sys
 import io
 
-# 强制设置标准输出为 utf-8
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+# 爬虫 / 分析 / 报告模块 (playwright、pandas、matplotlib、python-docx、openai) 在用到时才导入，
+# --help 与只启用部分平台的快速检查不必为未使用的依赖付出导入时间
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AI 全球电商选品系统")
+    parser.add_argument("-k", "--keyword", action="append", dest="keywords",
+                        help="目标关键词，可重复指定多次；多个关键词自动进入批量模式")
+    parser.add_argument("-f", "--keyword-file",
+                        help="关键词文件（每行一个，# 开头为注释）")
+    parser.add_argument("-c", "--concurrency", type=int, default=2,
+                        help="批量模式下同时处理的关键词数 (默认 2)")
+    parser.add_argument("-n", "--limit", type=int, default=5,
+                        help="每个平台抓取的商品数 (默认 5)")
+    parser.add_argument("--cache", choices=["off", "record", "replay"],
+                        help="搜索页缓存: record 读穿透并录制, replay 只用已录制页面不访问网络 (默认读取 PAGE_CACHE_MODE)")
+    parser.add_argument("--llm-cache", choices=["on", "off", "refresh"],
+                        help="LLM 回复缓存: off 不读不写, refresh 跳过读取强制请求并写回 (默认读取 LLM_CACHE)")
+    parser.add_argument("--trace", action="store_true",
+                        help="导出各阶段耗时: JSON trace + Prometheus textfile (默认读取 TRACE_EXPORT)")
+    parser.add_argument("--sequential", action="store_true",
+                        help="按平台逐个顺序采集（默认并发采集，调试或手动过验证码时使用）")
+    parser.add_argument("--platforms",
+                        help=f"只启用这些平台，逗号分隔 (可选: {','.join(PLATFORMS)}；默认读取 PLATFORMS，为空则全部启用)")
+    parser.add_argument("--outputs",
+                        help=f"生成的报告格式，逗号分隔 (可选: {','.join(OUTPUTS)}；默认读取 OUTPUT_FORMATS)")
+    return parser.parse_args(argv)
+
+def report_telemetry():
+    """打印各阶段耗时分布，并按配置导出 trace / metrics"""
+    tracer = Tracer.shared()
+    summary = tracer.summary()
+    if not summary:
+        return
+    print("\n阶段耗时分布 (按总耗时排序):")
+    for stage, st in list(summary.items())[:12]:
+        errors = f", 失败 {st['errors']}" if st['errors'] else ""
+        print(f"  {stage:<18} {st['count']:>4} 次, 总计 {st['total']:.1f}s, 平均 {st['mean']:.2f}s, 最长 {st['max']:.2f}s{errors}")
+    if Config.TRACE_EXPORT:
+        paths = tracer.export(Config.TELEMETRY_DIR, Config.PROMETHEUS_TEXTFILE)
+        print(f"✅ Trace 已导出: {paths['trace']}")
+        print(f"✅ Prometheus 指标已导出: {paths['metrics']}")
+
+async def run_batch(keywords, concurrency: int = 2, limit: int = 5, sequential: bool = False):
+    from src.pipeline.batch import BatchRunner
+
+    print(f"=== 批量选品模式: {len(keywords)} 个关键词, 并发 {concurrency} ===")
+    runner = BatchRunner(keywords, concurrency=concurrency, limit=limit, sequential=sequential)
+    outcome = await runner.run()
+    stats = outcome["stats"]
+    print("\n" + "="*50)
+    print(f" 吞吐量: {stats['keywords_per_hour']} 关键词/小时")
+    print("="*50)
+    print(f"成功 {stats['succeeded']}/{stats['keywords']}，总耗时 {stats['wall_seconds']}s，"
+          f"浏览器启动 {stats['pool_browser_launches']} 次")
+    print(f"✅ 批量汇总已生成: {outcome['summary_path']}")
+    for path in outcome["exports"]:
+        print(f"✅ 明细已导出: {path}")
+    report_telemetry()
+
+async def main(keyword: str = "yoga mat", limit: int = 5, sequential: bool = False):
+    from src.analysis.market_analyzer import MarketAnalyzer
+    from src.crawlers.page_cache import PageCache
+    from src.crawlers.resource_blocker import blocking_stats
+    from src.pipeline.artifacts import REPORT_DIR, ArtifactStage
+    from src.pipeline.exporters import open_exporters
+    from src.pipeline.orchestrator import KeywordPipeline
+    from src.pipeline.registry import output_formats
 
-async def main():
     print("=== AI 全球电商选品系统 v3.0 (含众筹趋势) ===")
     
-    keyword = "yoga mat" # 默认演示关键词
-    safe_keyword = keyword.replace(" ", "_")
     print(f"Target Keyword: {keyword}")
+    current_keyword.set(keyword)
 
-    # === 1. 销售端数据 (Sales) ===
-    sales_data = []
-    
-    # Task 1: Amazon
-    print(f"\n[1/6] 正在采集 Amazon 数据...")
-    amz = AmazonCrawler()
-    res = await amz.search_products(keyword, limit=5)
-    await amz.close()
-    if res:
-        print(f"✅ Amazon: {len(res)} items")
-        sales_data.extend(res)
-    
-    # Task 2: AliExpress
-    print(f"\n[2/6] 正在采集 AliExpress 数据...")
-    ali = AliExpressCrawler()
-    res = await ali.search_products(keyword, limit=5)
-    await ali.close()
-    if res:
-        print(f"✅ AliExpress: {len(res)} items")
-        sales_data.extend(res)
-
-    # Task 2.1: Temu
-    print(f"\n[新增] 正在采集 Temu 数据...")
-    temu = TemuCrawler()
-    res = await temu.search_products(keyword, limit=5)
-    await temu.close()
-    if res:
-        print(f"✅ Temu: {len(res)} items")
-        sales_data.extend(res)
-
-    # Task 2.2: Shopee
-    print(f"\n[新增] 正在采集 Shopee 数据...")
-    shopee = ShopeeCrawler()
-    res = await shopee.search_products(keyword, limit=5)
-    await shopee.close()
-    if res:
-        print(f"✅ Shopee: {len(res)} items")
-        sales_data.extend(res)
-
-    print(f"\n[新增] 正在通过 TikTok 接口采集实时爆品...")
-    tiktok = TikTokCrawler()
-    # 1. 搜索特定关键词商品
-    res_search = await tiktok.search_products(keyword, limit=5)
-    sales_data.extend(res_search)
-    # 2. 获取全网实时爆品榜单作为参考
-    res_trending = await tiktok.get_trending_products(limit=5)
-    # 趋势榜单数据存入 trend_data 供 AI 分析
-    await tiktok.close()
-    if res_search: print(f"✅ TikTok Shop: {len(res_search)} items")
-    if res_trending: print(f"✅ TikTok Trending: {len(res_trending)} hot items")
+    # === 1~4. 销售 / 趋势 / 供应链 三组并发采集 ===
+    mode = "顺序" if sequential else "并发"
+    print(f"\n[1/2] 正在以{mode}模式采集 销售端 / 趋势端 / 供应链 数据...")
+    # NDJSON / Parquet 明细在各平台采集完成时即追加写出
+    exporters = open_exporters(output_formats(), REPORT_DIR)
+    pipeline = KeywordPipeline(limit=limit, exporters=exporters)
+    try:
+        result = await pipeline.run(keyword, concurrent=not sequential)
+    finally:
+        for exporter in exporters:
+            print(f"✅ {exporter.suffix} 明细已导出: {exporter.close()} ({exporter.rows} 条)")
+
+    for r in result.task_reports:
+        icon = "✅" if r['status'] == "ok" else "⚠️"
+        print(f"{icon} [{r['stage']}] {r['platform']}: {r['items']} items ({r['status']}, {r['elapsed']}s)")
+    block_stats = pipeline.deferred.stats
+    if block_stats["blocked"]:
+        print(f"验证拦截: {block_stats['blocked']} 次, 延后重试 {block_stats['retried']} 次, "
+              f"恢复 {block_stats['recovered']} 个, 放弃 {block_stats['abandoned']} 个")
+    print(f"目标中文关键词: {result.cn_keyword}")
+    print(f"采集阶段总耗时: {result.elapsed:.1f}s")
+    pool_stats = pipeline.pool.stats()
+    print(f"浏览器池: 启动 {pool_stats['browser_launches']} 次 (持久化 {pool_stats['persistent_launches']} 次), "
+          f"租用 {pool_stats['leases']} 次, 并发峰值 {pool_stats['peak_leases']}, 启动耗时 {pool_stats['launch_seconds']}s")
+    for platform, st in blocking_stats().items():
+        print(f"请求拦截 [{platform}]: 拦截 {st['blocked']} / 放行 {st['allowed']}, "
+              f"约节省 {st['est_bytes_saved'] / 1024 / 1024:.1f} MB {st['by_type']}")
+    cache = PageCache.shared()
+    if cache.enabled:
+        print(f"页面缓存 ({cache.mode}): 命中 {cache.stats['hits']} / 未命中 {cache.stats['misses']}, "
+              f"写入 {cache.stats['stores']}, 淘汰 {cache.stats['evictions']}")
+
+    sales_data = result.sales_data
+    trend_data = result.trend_data
+    sourcing_data = result.sourcing_data
 
     if not sales_data:
         print("❌ 未能采集到任何平台的销售数据，程序终止。")
+        report_telemetry()
         return
-
-    # === 2. 趋势端数据 (Trends) ===
-    trend_data = []
-    if res_trending:
-        trend_data.extend(res_trending)
-    print(f"\n[3/6] 正在采集 Kickstarter 创新趋势...")
-    ks = KickstarterCrawler()
-    res = await ks.search_products(keyword, limit=5)
-    await ks.close()
-    if res:
-        print(f"✅ Kickstarter: {len(res)} projects")
-        trend_data.extend(res)
-    else:
-        print("⚠️ 未找到相关 Kickstarter 项目 (可能该品类较传统)")
-
-    # === 3. 翻译关键词 ===
-    print(f"\n[4/6] 智能翻译关键词...")
-    translator = Translator()
-    cn_keyword = translator.translate_to_chinese(keyword)
-    print(f"目标中文关键词: {cn_keyword}")
-    
-    # === 4. 供应链端数据 (Sourcing) ===
-    sourcing_data = []
-    
-    # Task 3: 1688
-    print(f"\n[5/6] 正在采集 1688 货源...")
-    s1688 = Sourcer1688()
-    res = await s1688.search_source(cn_keyword, limit=5)
-    if res:
-        print(f"✅ 1688: {len(res)} suppliers")
-        sourcing_data.extend(res)
-        
-    # Task 4: YiwuGo
-    print(f"      正在采集 义乌购 货源...")
-    sy = SourcerYiwuGo()
-    res = await sy.search_source(cn_keyword, limit=5)
-    if res:
-        print(f"✅ YiwuGo: {len(res)} suppliers")
-        sourcing_data.extend(res)
     
     # === 5. 深度分析 & 报告生成 ===
-    print(f"\n[6/6] 生成全网趋势分析报告...")
+    print(f"\n[2/2] 生成全网趋势分析报告...")
     analyzer = MarketAnalyzer()
-    
-    analysis = analyzer.analyze_potential(sales_data, sourcing_data, trend_data)
+    # 报告产物在线程池中生成，不阻塞事件循环；ARTIFACT_PROCESSES > 0 时仪表盘在独立进程中渲染
+    artifacts = ArtifactStage(processes=Config.ARTIFACT_PROCESSES or 0)
+    streamed = []
+
+    def print_token(delta: str):
+        if not streamed:
+            print("-" * 30)
+            print("🤖 AI 创新洞察:")
+        streamed.append(delta)
+        print(delta, end="", flush=True)
+
+    # AI 点评边生成边输出；同时在线程中搭好 Word 报告中不依赖 AI 文本的部分
+    artifacts.warm_up()
+    analysis, draft = await asyncio.gather(
+        analyzer.analyze_potential(sales_data, sourcing_data, trend_data, on_token=print_token),
+        artifacts.start_report(keyword, sales_data, sourcing_data, trend_data),
+    )
+    if streamed:
+        print()
+    print(f"首条洞察耗时: {analysis.get('time_to_first_insight', 0)}s")
+    llm_cache = analyzer.llm.cache
+    if llm_cache is not None and analyzer.llm.enabled:
+        print(f"LLM 缓存: 命中 {llm_cache.stats['hits']} (内存 {llm_cache.stats['memory_hits']}) / "
+              f"未命中 {llm_cache.stats['misses']}, 命中率 {llm_cache.hit_rate:.0%}")
     
     # 打印简报
     print("\n" + "="*50)
@@ -134,50 +156,48 @@ async def main():
     print(f"Amazon 均价: ${analysis.get('avg_amazon_price_usd', 0)}")
     print(f"供应链均价: ¥{analysis.get('avg_sourcing_price_cny', 0)}")
     
-    if 'ai_analysis' in analysis:
+    if 'ai_analysis' in analysis and not streamed:
         print("-" * 30)
         print("🤖 AI 创新洞察:")
         print(analysis['ai_analysis'])
     print("-" * 50)
 
-    # === 6. 生成可视化图表 ===
-    print(f"\n正在绘制数据仪表盘图表...")
-    visualizer = DataVisualizer()
-    viz_path = visualizer.generate_dashboard(safe_keyword, analysis, sales_data, sourcing_data, trend_data)
-    print(f"✅ 可视化仪表盘已生成: {viz_path}")
-
-    # === 7. 生成 Word 深度分析报告 ===
-    print(f"\n正在生成 Word 深度分析报告...")
-    report_gen = ReportGenerator()
-    docx_path = report_gen.generate_word_report(keyword, analysis, sales_data, sourcing_data, trend_data, viz_path)
-    print(f"✅ Word 深度报告已生成: {docx_path}")
-
-    # === 数据保存 ===
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    report_dir = os.path.join("data", "reports")
-    if not os.path.exists(report_dir):
-        os.makedirs(report_dir)
-        
-    report_file = os.path.join(report_dir, f"TrendAnalysis_{safe_keyword}_{timestamp}.xlsx")
-    
-    with pd.ExcelWriter(report_file, engine='openpyxl') as writer:
-        pd.DataFrame([analysis]).to_excel(writer, sheet_name='Summary', index=False)
-        if sales_data:
-            pd.DataFrame(sales_data).to_excel(writer, sheet_name='Sales', index=False)
-        if sourcing_data:
-            pd.DataFrame(sourcing_data).to_excel(writer, sheet_name='Sourcing', index=False)
-        if trend_data:
-            pd.DataFrame(trend_data).to_excel(writer, sheet_name='Trends_Kickstarter', index=False)
-            
-    print(f"\n✅ 趋势报告已生成: {report_file}")
-    
-    # 清理临时文件
-    for filename in os.listdir("data"):
-        if filename.endswith(".csv"):
-            try:
-                os.remove(os.path.join("data", filename))
-            except:
-                pass
+    # === 6. 仪表盘 / Word / Excel 并行生成（Word 只等待仪表盘图片） ===
+    labels = {"dashboard": "可视化仪表盘", "docx": "Word 深度报告", "excel": "趋势报告"}
+    print(f"\n正在生成报告产物 ({', '.join(artifacts.formats) or '无'})...")
+    try:
+        await artifacts.render(keyword, analysis, sales_data, sourcing_data, trend_data, draft=draft,
+                               on_ready=lambda name, path: print(f"✅ {labels[name]}已生成: {path}"))
+    finally:
+        await artifacts.close()
+    report_telemetry()
+
+async def run_single(keyword: str, limit: int = 5, sequential: bool = False):
+    try:
+        await main(keyword, limit=limit, sequential=sequential)
+    finally:
+        # 翻译与分析共用的 LLM 连接池需在事件循环结束前关闭
+        from src.utils.llm_client import LLMClient
+        await LLMClient.shared().aclose()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # 强制设置标准输出为 utf-8
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    args = parse_args()
+    if args.platforms:
+        Config.ENABLED_PLATFORMS = [p.strip() for p in args.platforms.split(",") if p.strip()]
+    if args.outputs:
+        Config.OUTPUT_FORMATS = [f.strip() for f in args.outputs.split(",") if f.strip()]
+    if args.cache:
+        Config.PAGE_CACHE_MODE = args.cache
+    if args.trace:
+        Config.TRACE_EXPORT = True
+    if args.llm_cache:
+        Config.LLM_CACHE_ENABLED = args.llm_cache != "off"
+        Config.LLM_CACHE_REFRESH = args.llm_cache == "refresh"
+    Config.ensure_dirs()
+    keywords = load_keywords(args.keywords, args.keyword_file) or ["yoga mat"] # 默认演示关键词
+    if len(keywords) > 1:
+        asyncio.run(run_batch(keywords, concurrency=args.concurrency, limit=args.limit, sequential=args.sequential))
+    else:
+        asyncio.run(run_single(keywords[0], limit=args.limit, sequential=args.sequential))
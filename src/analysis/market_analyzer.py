@@ -1,7 +1,12 @@
 import pandas as pd
-from typing import List, Dict
-import re
-from src.utils.llm_client import LLMClient
+from typing import Callable, List, Dict, Optional
+import math
+import time
+from src.analysis.market_frame import Records, build_frame, overall_stats, summarize
+from src.config import Config
+from src.utils.llm_client import LLMClient, is_error_reply
+from src.utils.normalize import parse_price
+from src.utils.telemetry import record_span, traced
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,53 +15,43 @@ class MarketAnalyzer:
     """
     市场分析器：计算利润空间 + AI 智能点评 (全网版)
     """
-    def __init__(self):
-        self.llm = LLMClient()
+    def __init__(self, llm: Optional[LLMClient] = None):
+        self.llm = llm or LLMClient.shared()
     
+    @staticmethod
+    def keyword_stats(sales_data: Records, sourcing_data: Records) -> pd.DataFrame:
+        """
+        多关键词数据集的逐关键词统计（销售均价 / 供应链均价 / 毛利率 / 各平台均价）
+        记录按自身的 keyword 字段分组，供应链记录需带上对应的销售端关键词。
+        """
+        return summarize(build_frame(sales_data, sourcing_data))["keyword"]
+
     @staticmethod
     def clean_price(price_str: str) -> float:
-        """清理价格字符串，转换为浮点数"""
-        if not price_str or price_str == "N/A":
-            return 0.0
-        clean = re.sub(r'[^\d\.]', '', price_str)
-        try:
-            return float(clean)
-        except:
-            return 0.0
+        """清理价格字符串，转换为浮点数（区间价取最低价，无法解析为 0.0）"""
+        low = parse_price(price_str).low
+        return 0.0 if math.isnan(low) else low
 
-    def analyze_potential(self, sales_data: List[Dict], sourcing_data: List[Dict], trend_data: List[Dict] = []) -> Dict:
+    @traced("analysis")
+    async def analyze_potential(self, sales_data: List[Dict], sourcing_data: List[Dict], trend_data: List[Dict] = [],
+                                on_token: Optional[Callable[[str], None]] = None) -> Dict:
         """
         分析选品潜力 (Sales + Sourcing + Trends)
+        :param on_token: 流式模式 (Config.LLM_STREAM) 下每收到一段 AI 点评文本即回调，用于实时输出
         """
-        # 1. 基础数据计算
-        platforms = ["Amazon", "AliExpress", "Temu", "Shopee", "TikTok Shop"]
-        platform_stats = {}
-        
-        all_sales_prices_cny = []
-        exchange_rate = 7.2
-        
-        for p_name in platforms:
-            items = [p for p in sales_data if p_name in p['platform']]
-            prices = [self.clean_price(p['price']) for p in items if p['price'] != "N/A"]
-            avg = sum(prices) / len(prices) if prices else 0
-            platform_stats[p_name] = avg
-            
-            # 统一换算为 CNY 用于计算毛利
-            for pr in prices:
-                all_sales_prices_cny.append(pr * exchange_rate)
-
-        avg_sales_price_cny = sum(all_sales_prices_cny) / len(all_sales_prices_cny) if all_sales_prices_cny else 0
-        
-        src_prices = [self.clean_price(p['price']) for p in sourcing_data if p['price'] != "N/A"]
-        avg_src_price = sum(src_prices) / len(src_prices) if src_prices else 0
-        
-        gross_margin = 0
-        if avg_sales_price_cny > 0:
-            gross_margin = (avg_sales_price_cny - avg_src_price) / avg_sales_price_cny
+        # 首条洞察耗时：从进入分析到拿到第一段真实 AI 文本（非流式模式即整段回复返回的时间），
+        # 失败占位文本不算；没有拿到洞察时记为整个分析的耗时，span 状态为 error
+        started_at, t0 = time.time(), time.perf_counter()
+        first_insight: Optional[float] = None
+        # 1. 基础数据计算（向量化：一张 DataFrame + 一次 groupby，销售价统一换算为 CNY 计算毛利）
+        stats = overall_stats(summarize(build_frame(sales_data, sourcing_data, keyword=""), per_keyword=False))
+        platform_stats = stats["platform_stats"]
+        avg_src_price = stats["avg_sourcing_price"]
+        gross_margin = stats["gross_margin"]
             
         # 2. AI 智能点评
         ai_comment = "AI 分析未启用或配置错误。"
-        if self.llm.client:
+        if self.llm.enabled:
             try:
                 # 提取各平台摘要
                 sales_summary = "\n".join([f"- [{item['platform']}] {item['title'][:30]}... ({item.get('price', 'N/A')})" for item in sales_data[:12]])
@@ -102,10 +97,25 @@ class MarketAnalyzer:
                 """
                 
                 logger.info("正在调用 LLM 生成全网深度分析报告...")
-                ai_comment = self.llm.get_completion(prompt)
+                if Config.LLM_STREAM:
+                    chunks = []
+                    async for delta in self.llm.stream_completion(prompt):
+                        if not chunks and not is_error_reply(delta):
+                            first_insight = time.perf_counter() - t0
+                        chunks.append(delta)
+                        if on_token:
+                            on_token(delta)
+                    ai_comment = "".join(chunks).strip()
+                else:
+                    ai_comment = await self.llm.get_completion(prompt)
+                    if not is_error_reply(ai_comment):
+                        first_insight = time.perf_counter() - t0
             except Exception as e:
                 logger.error(f"AI 分析生成失败: {e}")
                 ai_comment = f"AI 分析生成过程中发生错误: {e}"
+        elapsed = first_insight if first_insight is not None else time.perf_counter() - t0
+        record_span("first_insight", elapsed, start=started_at, status="ok" if first_insight is not None else "error",
+                    stream=Config.LLM_STREAM)
 
         return {
             "avg_amazon_price_usd": round(platform_stats.get('Amazon', 0), 2),
@@ -113,5 +123,6 @@ class MarketAnalyzer:
             "estimated_margin": f"{gross_margin*100:.1f}%",
             "recommendation": "High Potential" if gross_margin > 0.4 else "Medium/Low Potential",
             "ai_analysis": ai_comment,
+            "time_to_first_insight": round(elapsed, 2),
             "platform_stats": platform_stats
         }
@@ -1,8 +1,13 @@
 import os
-from dotenv import load_dotenv
 
-# 加载 .env 文件
-load_dotenv()
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOTENV_PATH = os.path.join(PROJECT_ROOT, ".env")
+
+# 加载 .env 文件（下方类属性在定义时读取环境变量，因此必须在此之前加载）；
+# 没有 .env 时不导入 python-dotenv，也不做目录搜索
+if os.path.exists(DOTENV_PATH):
+    from dotenv import load_dotenv
+    load_dotenv(DOTENV_PATH)
 
 class Config:
     # 1688 配置
@@ -13,19 +18,88 @@ class Config:
     LLM_API_KEY = os.getenv("LLM_API_KEY")
     LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.deepseek.com/v1") 
     LLM_MODEL = os.getenv("LLM_MODEL", "deepseek-chat")
+    # 同时在途的 LLM 请求数 (同时也是连接池大小)、单次请求超时(秒)、失败重试次数与退避基数(秒)
+    LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_RETRY_BACKOFF = float(os.getenv("LLM_RETRY_BACKOFF", "1.0"))
+    # 分析报告以流式 (stream=True) 生成：边生成边输出，并记录首条洞察耗时
+    LLM_STREAM = os.getenv("LLM_STREAM", "True").lower() == "true"
     
     # 爬虫通用配置
     # 修改为 False 以启用有头模式（显示浏览器界面），方便手动登录
     HEADLESS_MODE = os.getenv("HEADLESS_MODE", "False").lower() == "true"
     BROWSER_TYPE = os.getenv("BROWSER_TYPE", "chromium") # chromium, firefox, webkit
+    # 拦截图片/字体/视频与第三方埋点请求，节省带宽与页面加载时间
+    BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "True").lower() == "true"
+    # 搜索页录制/回放缓存: off / record (读穿透并写入) / replay (只读缓存，不访问网络)
+    PAGE_CACHE_MODE = os.getenv("PAGE_CACHE_MODE", "off").lower()
+    PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL_HOURS", "24")) * 3600
+    PAGE_CACHE_MAX_MB = float(os.getenv("PAGE_CACHE_MAX_MB", "500"))
+    # 搜索结果最多翻页数（未显式指定 max_pages 时按数量需求自动翻页，直到此上限）
+    MAX_SEARCH_PAGES = int(os.getenv("MAX_SEARCH_PAGES", "20"))
     
+    # 并发编排配置：单平台默认超时(秒)，可用 PLATFORM_TIMEOUT_<平台名> 单独覆盖
+    # 例如 PLATFORM_TIMEOUT_AMAZON=90, PLATFORM_TIMEOUT_TIKTOK_TRENDING=60
+    PLATFORM_TIMEOUT = float(os.getenv("PLATFORM_TIMEOUT", "150"))
+    # 验证码/登录拦截：被拦截的平台任务立即让出，冷却 BLOCK_RETRY_DELAY 秒后用新的 BrowserContext 重试，最多 BLOCK_RETRIES 次；
+    # 有头模式下重试时给出 CAPTCHA_SOLVE_SECONDS 秒人工处理窗口（在后台进行，不阻塞其他平台与关键词）
+    BLOCK_RETRY_DELAY = float(os.getenv("BLOCK_RETRY_DELAY", "20"))
+    BLOCK_RETRIES = int(os.getenv("BLOCK_RETRIES", "1"))
+    CAPTCHA_SOLVE_SECONDS = float(os.getenv("CAPTCHA_SOLVE_SECONDS", "60"))
+    # 启用的平台（逗号分隔，例如 PLATFORMS=amazon,1688），为空表示全部启用；未启用的爬虫模块不会被导入
+    ENABLED_PLATFORMS = [p.strip() for p in os.getenv("PLATFORMS", "").split(",") if p.strip()]
+    # 生成的报告格式：png 数据仪表盘 / docx Word 报告 / xlsx Excel 报告 / ndjson、parquet 流式明细导出 (parquet 需要 pyarrow)
+    OUTPUT_FORMATS = [f.strip() for f in os.getenv("OUTPUT_FORMATS", "png,docx,xlsx").split(",") if f.strip()]
+    # 报告产物阶段：Word / Excel 写入线程数；仪表盘渲染进程数（0 表示在线程中渲染，未设置时批量模式取关键词并发数）
+    ARTIFACT_THREADS = int(os.getenv("ARTIFACT_THREADS", "4"))
+    ARTIFACT_PROCESSES = int(os.getenv("ARTIFACT_PROCESSES")) if os.getenv("ARTIFACT_PROCESSES") else None
+    # 仪表盘渲染预设：draft (72 dpi) / report (120 dpi，Word 报告默认) / print (300 dpi)
+    DASHBOARD_PRESET = os.getenv("DASHBOARD_PRESET", "report").lower()
+
     # 数据存储路径
-    DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+    DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+    PAGE_CACHE_DIR = os.path.join(DATA_DIR, "page_cache")
+    PRODUCT_STORE_PATH = os.getenv("PRODUCT_STORE_PATH", os.path.join(DATA_DIR, "products.db"))
+
+    # LLM 回复缓存：相同 模型+提示词+temperature 直接复用；翻译结果几乎不变，单独使用更长的 TTL
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "True").lower() == "true"
+    # 刷新模式：跳过缓存读取强制请求接口，新结果照常写回
+    LLM_CACHE_REFRESH = os.getenv("LLM_CACHE_REFRESH", "False").lower() == "true"
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(DATA_DIR, "llm_cache.db"))
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL_HOURS", "24")) * 3600
+    LLM_CACHE_TRANSLATION_TTL = float(os.getenv("LLM_CACHE_TRANSLATION_TTL_DAYS", "30")) * 86400
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+
+    # 英中关键词词典（LLM 翻译结果持续写入）；批量翻译时每次请求包含的关键词数
+    KEYWORD_DICT_PATH = os.getenv("KEYWORD_DICT_PATH", os.path.join(DATA_DIR, "keyword_dict.db"))
+    TRANSLATION_BATCH_SIZE = int(os.getenv("TRANSLATION_BATCH_SIZE", "100"))
+
+    # 汇率表 (JSON，格式见 src/utils/normalize.py 的 FxTable)；文件不存在时使用内置汇率 (1 USD = 7.2 CNY 等)
+    FX_TABLE_PATH = os.getenv("FX_TABLE_PATH", os.path.join(DATA_DIR, "fx_rates.json"))
+
+    # 运行结束时导出各阶段 span：JSON trace (chrome://tracing / Perfetto) + Prometheus textfile
+    TRACE_EXPORT = os.getenv("TRACE_EXPORT", "False").lower() == "true"
+    TELEMETRY_DIR = os.getenv("TELEMETRY_DIR", os.path.join(DATA_DIR, "telemetry"))
+    # node_exporter textfile collector 目录下的文件路径，未设置时写到 TELEMETRY_DIR/botsales.prom
+    PROMETHEUS_TEXTFILE = os.getenv("PROMETHEUS_TEXTFILE")
+
+    @staticmethod
+    def platform_timeout(platform: str) -> float:
+        env_name = "PLATFORM_TIMEOUT_" + platform.upper().replace(" ", "_")
+        return float(os.getenv(env_name, Config.PLATFORM_TIMEOUT))
+
+    @staticmethod
+    def site_url(platform: str, default: str) -> str:
+        """
+        站点根地址，可用 SITE_URL_<平台名> 覆盖（压测/联调时指向本地替身服务）
+        例如 SITE_URL_AMAZON=http://127.0.0.1:8800/amazon
+        """
+        env_name = "SITE_URL_" + platform.upper().replace(" ", "_")
+        return os.getenv(env_name, default).rstrip("/")
 
     @staticmethod
     def ensure_dirs():
+        """创建数据目录（由程序入口调用，导入 Config 本身没有副作用）"""
         if not os.path.exists(Config.DATA_DIR):
             os.makedirs(Config.DATA_DIR)
-
-# 初始化目录
-Config.ensure_dirs()
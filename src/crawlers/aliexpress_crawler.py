@@ -1,138 +0,0 @@
-import asyncio
-from typing import List, Dict, Any
-from playwright.async_api import async_playwright
-from src.crawlers.base_crawler import BaseCrawler
-from src.config import Config
-import urllib.parse
-from fake_useragent import UserAgent
-from playwright_stealth import Stealth
-
-class AliExpressCrawler(BaseCrawler):
-    def __init__(self):
-        super().__init__("aliexpress")
-        self.browser = None
-        self.context = None
-        self.playwright = None
-        self.ua = UserAgent()
-
-    async def _init_browser(self):
-        if not self.playwright:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=Config.HEADLESS_MODE,
-                args=['--disable-blink-features=AutomationControlled']
-            )
-            # 设置 Cookie 以固定为 美国/英语/美元
-            self.context = await self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent=self.ua.random,
-                locale='en-US'
-            )
-            await self.context.add_cookies([{
-                "name": "aep_usuc_f",
-                "value": "region=US&site=glo&b_locale=en_US&c_tp=USD",
-                "domain": ".aliexpress.com",
-                "path": "/"
-            }])
-
-    async def search_products(self, keyword: str, limit: int = 10) -> List[Dict[str, Any]]:
-        await self._init_browser()
-        page = await self.context.new_page()
-        
-        # 应用 Stealth 插件
-        stealth = Stealth()
-        await stealth.apply_stealth_async(page)
-        
-        try:
-            self.logger.info(f"正在 AliExpress 搜索: {keyword}")
-            url = f"https://www.aliexpress.com/wholesale?SearchText={urllib.parse.quote(keyword)}"
-            await page.goto(url, timeout=60000)
-            
-            # --- 检测滑块/登录 ---
-            async def check_interception():
-                title = await page.title()
-                content = await page.content()
-                if "Security" in title or "Slider" in title or "登录" in title or "Verification" in title:
-                    self.logger.warning("⚠️ 检测到 AliExpress 验证/拦截！请在 60 秒内手动完成验证/登录。")
-                    if not Config.HEADLESS_MODE:
-                        for _ in range(60):
-                            await asyncio.sleep(1)
-                            new_title = await page.title()
-                            if "Security" not in new_title and "Verification" not in new_title:
-                                self.logger.info("✅ 验证已完成。")
-                                return True
-                        return False
-                return True
-
-            await check_interception()
-
-            # 等待商品列表
-            try:
-                await page.wait_for_selector('div[class*="list--gallery"], a[href*="/item/"]', timeout=20000)
-            except:
-                self.logger.warning("AliExpress 加载超时，尝试最后一次人工介入机会...")
-                await check_interception()
-                await page.screenshot(path="data/reports/aliexpress_debug.png")
-                
-            await page.evaluate("window.scrollBy(0, 1000)")
-            await asyncio.sleep(2)
-
-            # 使用更健壮的 JS 解析逻辑
-            products = await page.evaluate(f"""(limit) => {{
-                const results = [];
-                // 查找所有包含商品信息的容器
-                const candidates = document.querySelectorAll('a[href*="/item/"]');
-                
-                for (const card of candidates) {{
-                    if (results.length >= limit) break;
-                    
-                    const text = card.innerText;
-                    if (!text.includes('$')) continue;
-                    
-                    let title = "";
-                    const titleEl = card.querySelector('h1, h3, h2, div[class*="title"]');
-                    if (titleEl) title = titleEl.innerText;
-                    
-                    let price = "N/A";
-                    const priceMatch = text.match(/\\$\\s*([\\d\\.,]+)/);
-                    if (priceMatch) price = priceMatch[1];
-                    
-                    let sold = "0";
-                    const soldMatch = text.match(/(\\d+[\\d\\.]*\\w*)\\s+sold/i);
-                    if (soldMatch) sold = soldMatch[1];
-                    
-                    if (price !== "N/A" && !results.find(r => r.link === card.href)) {{
-                        results.push({{
-                            "platform": "AliExpress",
-                            "title": title.trim() || "Product",
-                            "price": price,
-                            "sold": sold,
-                            "link": card.href
-                        }});
-                    }}
-                }}
-                return results;
-            }}""", limit)
-            
-            for p in products:
-                p['keyword'] = keyword
-            
-            self.logger.info(f"成功抓取 {len(products)} 个 AliExpress 商品")
-            return products
-            
-        except Exception as e:
-            self.logger.error(f"AliExpress 抓取失败: {e}")
-            return []
-        finally:
-            await page.close()
-
-    async def get_product_details(self, product_id: str) -> Dict[str, Any]:
-        return {}
-
-    async def close(self):
-        if self.context:
-            await self.context.close()
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
@@ -1,6 +1,14 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional
 import logging
+from src.config import Config
+from src.crawlers.blocking import BlockedError
+from src.crawlers.browser_pool import BrowserPool, random_user_agent
+from src.crawlers.resource_blocker import apply_resource_policy
+from src.crawlers.page_cache import goto_cached, record_page
+from src.utils.normalize import normalize_records
+from src.utils.telemetry import span
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -11,20 +19,135 @@ class BaseCrawler(ABC):
     所有电商爬虫的基类。
     强制子类实现特定的方法，保证系统的一致性。
     """
-    
+    # 价格文本不带货币符号时使用的货币（入库时据此换算 price_cny / price_usd）
+    currency = "USD"
+
     def __init__(self, platform_name: str):
         self.platform_name = platform_name
         self.logger = logger
+        self.pool = BrowserPool.shared()
+        self.context = None
+        self._context_lock = asyncio.Lock()
+
+    def context_options(self) -> Dict[str, Any]:
+        """
+        该平台 BrowserContext 的参数（viewport / locale / user_agent 等），子类按需覆盖
+        """
+        return {
+            'viewport': {'width': 1920, 'height': 1080},
+            'user_agent': random_user_agent()
+        }
+
+    async def _setup_context(self, context):
+        """
+        Context 租用后的初始化钩子（如写入 Cookie），子类按需覆盖
+        """
+        pass
+
+    async def _init_browser(self):
+        """
+        从共享浏览器池租用一个隔离的 BrowserContext（每个爬虫实例只租用一次，
+        同一实例可被多个关键词并发复用，每次搜索各开一个 Page）
+        """
+        async with self._context_lock:
+            if self.context is None:
+                context = await self.pool.lease_context(self.platform_name, **self.context_options())
+                await apply_resource_policy(context, self.platform_name)
+                await self._setup_context(context)
+                self.context = context
+
+    def search_url(self, keyword: str, page_number: int = 1) -> Optional[str]:
+        """
+        第 page_number 页搜索结果的 URL，返回 None 表示该平台不支持继续翻页
+        """
+        return None
 
     @abstractmethod
-    async def search_products(self, keyword: str, limit: int = 10) -> List[Dict[str, Any]]:
+    async def _search_page(self, keyword: str, page_number: int, limit: int) -> List[Dict[str, Any]]:
         """
-        根据关键词搜索商品
+        抓取并解析单页搜索结果
+        :param keyword: 搜索关键词
+        :param page_number: 页码（从 1 开始）
+        :param limit: 本页最多需要的商品数
+        :return: 本页商品数据列表
+        """
+        pass
+
+    async def _goto(self, page, url: str, page_number: int = 1, **kwargs) -> bool:
+        """
+        导航到搜索页（经过录制/回放缓存）
+        :return: 是否由缓存提供（缓存页面无需再滚动/等待懒加载）
+        """
+        with span("navigation", page=page_number) as sp:
+            from_cache = await goto_cached(page, self.platform_name, url, page_number, **kwargs)
+            sp.set(from_cache=from_cache)
+        return from_cache
+
+    async def _record(self, page, url: str, page_number: int = 1, from_cache: bool = False):
+        """录制模式下保存解析前的页面快照"""
+        await record_page(page, self.platform_name, url, page_number, from_cache)
+
+    async def _extract(self, page, script: str, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """在页面内执行解析脚本（单次往返）"""
+        with span("extraction") as sp:
+            items = await page.evaluate(script, args)
+            sp.set(items=len(items))
+        return items
+
+    @staticmethod
+    def _item_key(item: Dict[str, Any]) -> Optional[str]:
+        return item.get('product_url') or item.get('link') or item.get('asin') or None
+
+    async def iter_products(self, keyword: str, max_items: int = 10, max_pages: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        逐页流式产出商品：每解析完一页立即 yield，下游可以边抓边处理，内存中只保留当前页。
+        :param keyword: 搜索关键词
+        :param max_items: 最多产出的商品数
+        :param max_pages: 最多翻页数，默认按需翻页直到 Config.MAX_SEARCH_PAGES
+        """
+        max_pages = max_pages or Config.MAX_SEARCH_PAGES
+        seen = set()
+        count = 0
+
+        for page_number in range(1, max_pages + 1):
+            if page_number > 1 and self.search_url(keyword, page_number) is None:
+                break
+
+            try:
+                page_items = await self._search_page(keyword, page_number, max_items - count)
+            except BlockedError as e:
+                # 翻页时被拦截：已产出的商品照常返回，不再翻页；第一页就被拦截才交给编排器延后重试
+                if count == 0:
+                    raise
+                self.logger.warning(f"{e}（第 {page_number} 页），保留已抓取的 {count} 个商品")
+                return
+            items = normalize_records(page_items, self.currency)
+            fresh = 0
+            for item in items:
+                key = self._item_key(item)
+                if key:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                fresh += 1
+                count += 1
+                yield item
+                if count >= max_items:
+                    return
+
+            # 本页没有新商品（最后一页或平台忽略了页码参数），停止翻页
+            if fresh == 0:
+                break
+
+    async def search_products(self, keyword: str, limit: int = 10, max_pages: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        根据关键词搜索商品（iter_products 的列表封装）
         :param keyword: 搜索关键词
         :param limit: 抓取数量限制
+        :param max_pages: 最多翻页数
         :return: 商品数据列表
         """
-        pass
+        return [item async for item in self.iter_products(keyword, max_items=limit, max_pages=max_pages)]
 
     @abstractmethod
     async def get_product_details(self, product_id: str) -> Dict[str, Any]:
@@ -35,29 +158,22 @@ class BaseCrawler(ABC):
         """
         pass
 
-    @abstractmethod
     async def close(self):
         """
-        资源清理（关闭浏览器等）
+        资源清理：归还 BrowserContext，浏览器由共享池按引用计数关闭
         """
-        pass
+        if self.context is not None:
+            context, self.context = self.context, None
+            await self.pool.return_context(context)
     
-    def save_data(self, data: List[Dict], filename: str):
-        """
-        通用方法：保存数据到本地 data 目录
-        """
-        import pandas as pd
-        import os
-        from src.config import Config
-        
-        filepath = os.path.join(Config.DATA_DIR, filename)
-        df = pd.DataFrame(data)
-        
-        # 简单的去重逻辑
-        if os.path.exists(filepath):
-            existing_df = pd.read_csv(filepath)
-            df = pd.concat([existing_df, df]).drop_duplicates()
-            
-        df.to_csv(filepath, index=False)
-        self.logger.info(f"数据已保存至: {filepath}")
+    def save_data(self, data: List[Dict], filename: Optional[str] = None):
+        """
+        通用方法：写入本地商品库 (data/products.db)。
+        按 (平台, ASIN/goods_id/链接) upsert，并追加一条抓取记录；不再整表读回 CSV 去重。
+        :param filename: 已废弃，仅为兼容旧调用保留
+        """
+        from src.storage.product_store import ProductStore
+
+        count = ProductStore.shared().upsert(data, platform=self.platform_name)
+        self.logger.info(f"{count} 条数据已写入商品库: {ProductStore.shared().db_path}")
 
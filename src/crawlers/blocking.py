@@ -0,0 +1,55 @@
+import asyncio
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable
+
+from src.config import Config
+from src.utils.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# 当前任务的人工处理窗口（秒）：首次采集为 0，检测到拦截立即放弃；
+# 编排器延后重试时在后台任务中设置（见 src.pipeline.deferred），有头模式下才会等待人工处理
+_solve_window: contextvars.ContextVar[float] = contextvars.ContextVar("solve_window", default=0.0)
+
+
+class BlockedError(Exception):
+    """页面被验证码 / 滑块 / 登录拦截：本次采集放弃，由编排器延后用新的 BrowserContext 重试"""
+    def __init__(self, platform: str, reason: str = ""):
+        super().__init__(f"{platform} 被拦截" + (f": {reason}" if reason else ""))
+        self.platform = platform
+        self.reason = reason
+
+
+@contextmanager
+def solve_window(seconds: float):
+    """在此范围内检测到拦截时，有头模式下最多等待 seconds 秒人工处理"""
+    token = _solve_window.set(seconds)
+    try:
+        yield
+    finally:
+        _solve_window.reset(token)
+
+
+def current_solve_window() -> float:
+    return 0.0 if Config.HEADLESS_MODE else _solve_window.get()
+
+
+async def handle_block(platform: str, still_blocked: Callable[[], Awaitable[bool]], reason: str = "") -> None:
+    """
+    检测到拦截后调用：处于人工处理窗口时每秒检查一次 still_blocked，解除即返回（调用方继续解析）；
+    否则（首次采集 / 无头模式 / 窗口内未解除）抛出 BlockedError。
+    """
+    window = current_solve_window()
+    if window > 0:
+        logger.warning(f"⚠️ 检测到 {platform} 验证/拦截！请在 {window:.0f} 秒内手动完成。")
+        deadline = time.monotonic() + window
+        with span("captcha_wait"):
+            while time.monotonic() < deadline:
+                await asyncio.sleep(1)
+                if not await still_blocked():
+                    logger.info("✅ 验证已完成。")
+                    return
+    raise BlockedError(platform, reason)
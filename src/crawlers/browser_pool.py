@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+
+from src.config import Config
+from src.utils.telemetry import span
+
+if TYPE_CHECKING:
+    from fake_useragent import UserAgent
+
+logger = logging.getLogger(__name__)
+
+# 所有平台共用的反自动化检测启动参数
+LAUNCH_ARGS = ['--disable-blink-features=AutomationControlled']
+
+
+@lru_cache(maxsize=1)
+def _user_agent_source() -> "UserAgent":
+    # fake_useragent 导入时加载整份 UA 数据，首次需要时才导入
+    from fake_useragent import UserAgent
+    return UserAgent()
+
+
+def random_user_agent() -> str:
+    """随机 User-Agent（UserAgent 数据只加载一次）"""
+    return _user_agent_source().random
+
+
+class BrowserPool:
+    """
+    进程级共享浏览器池。
+    - 全进程只启动一个 Playwright 驱动和一个浏览器，各爬虫租用彼此隔离的 BrowserContext；
+    - 引用计数管理生命周期：最后一个使用者释放后才关闭浏览器与驱动；
+    - 记录启动耗时、租用次数、并发峰值等指标，可通过 stats() 查看。
+    """
+    _shared: Optional["BrowserPool"] = None
+
+    def __init__(self, headless: Optional[bool] = None, browser_type: Optional[str] = None):
+        self.headless = Config.HEADLESS_MODE if headless is None else headless
+        self.browser_type = browser_type or Config.BROWSER_TYPE
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self._refs = 0
+        self._lock = asyncio.Lock()
+        self._lease_started: Dict[int, float] = {}
+        self.metrics: Dict[str, Any] = {
+            "driver_starts": 0,
+            "browser_launches": 0,
+            "persistent_launches": 0,
+            "launch_seconds": 0.0,
+            "leases": 0,
+            "active_leases": 0,
+            "peak_leases": 0,
+            "lease_seconds": 0.0,
+            "leases_by_platform": {},
+        }
+
+    @classmethod
+    def shared(cls) -> "BrowserPool":
+        """获取进程级共享实例"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    async def acquire(self):
+        """
+        增加一次引用（保持驱动存活）。
+        批量/长流程可以先 acquire 一次，使浏览器在多个爬虫之间保持热启动状态。
+        """
+        async with self._lock:
+            self._refs += 1
+            if self.playwright is None:
+                start = time.perf_counter()
+                with span("driver_start"):
+                    self.playwright = await async_playwright().start()
+                self.metrics["driver_starts"] += 1
+                self.metrics["launch_seconds"] += time.perf_counter() - start
+
+    async def release(self):
+        """减少一次引用，归零时关闭浏览器和驱动"""
+        async with self._lock:
+            self._refs = max(0, self._refs - 1)
+            if self._refs == 0:
+                await self._shutdown()
+
+    async def _get_browser(self) -> Browser:
+        async with self._lock:
+            if self.browser is None or not self.browser.is_connected():
+                start = time.perf_counter()
+                launcher = getattr(self.playwright, self.browser_type)
+                with span("browser_launch", browser=self.browser_type):
+                    self.browser = await launcher.launch(headless=self.headless, args=LAUNCH_ARGS)
+                elapsed = time.perf_counter() - start
+                self.metrics["browser_launches"] += 1
+                self.metrics["launch_seconds"] += elapsed
+                logger.info(f"共享浏览器已启动 ({self.browser_type}, {elapsed:.2f}s)")
+            return self.browser
+
+    async def _shutdown(self):
+        if self.browser:
+            try:
+                await self.browser.close()
+            except Exception as e:
+                logger.warning(f"关闭共享浏览器失败: {e}")
+            self.browser = None
+        if self.playwright:
+            try:
+                await self.playwright.stop()
+            except Exception as e:
+                logger.warning(f"停止 Playwright 驱动失败: {e}")
+            self.playwright = None
+
+    def _on_lease(self, context: BrowserContext, platform: str):
+        self._lease_started[id(context)] = time.perf_counter()
+        self.metrics["leases"] += 1
+        self.metrics["active_leases"] += 1
+        self.metrics["peak_leases"] = max(self.metrics["peak_leases"], self.metrics["active_leases"])
+        by_platform = self.metrics["leases_by_platform"]
+        by_platform[platform] = by_platform.get(platform, 0) + 1
+
+    async def lease_context(self, platform: str = "default", **options) -> BrowserContext:
+        """
+        租用一个隔离的 BrowserContext
+        :param platform: 平台名（仅用于统计）
+        :param options: 透传给 browser.new_context 的参数（viewport / locale / user_agent 等）
+        """
+        await self.acquire()
+        try:
+            browser = await self._get_browser()
+            with span("context_create"):
+                context = await browser.new_context(**options)
+        except Exception:
+            await self.release()
+            raise
+        self._on_lease(context, platform)
+        return context
+
+    async def launch_persistent_context(self, user_data_dir: str, platform: str = "default", **options) -> BrowserContext:
+        """
+        启动带持久化用户目录的 Context（如 1688 登录态）。
+        持久化 Context 必须独占一个浏览器进程，但仍复用共享驱动并纳入引用计数。
+        """
+        await self.acquire()
+        try:
+            start = time.perf_counter()
+            launcher = getattr(self.playwright, self.browser_type)
+            options.setdefault("headless", self.headless)
+            with span("browser_launch", browser=self.browser_type, persistent=True):
+                context = await launcher.launch_persistent_context(user_data_dir=user_data_dir, **options)
+            self.metrics["persistent_launches"] += 1
+            self.metrics["launch_seconds"] += time.perf_counter() - start
+        except Exception:
+            await self.release()
+            raise
+        self._on_lease(context, platform)
+        return context
+
+    async def return_context(self, context: BrowserContext):
+        """归还并关闭 Context，同时释放一次引用"""
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"关闭 BrowserContext 失败: {e}")
+        finally:
+            started = self._lease_started.pop(id(context), None)
+            if started is not None:
+                self.metrics["lease_seconds"] += time.perf_counter() - started
+                self.metrics["active_leases"] -= 1
+            await self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self.metrics)
+        stats["leases_by_platform"] = dict(self.metrics["leases_by_platform"])
+        stats["launch_seconds"] = round(stats["launch_seconds"], 2)
+        stats["lease_seconds"] = round(stats["lease_seconds"], 2)
+        return stats
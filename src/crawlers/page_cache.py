@@ -0,0 +1,157 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, Optional
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.I | re.S)
+
+
+class ReplayMiss(Exception):
+    """回放模式下缓存未命中（回放模式不会访问网络）"""
+    pass
+
+
+class PageCache:
+    """
+    搜索结果页的磁盘缓存（录制 / 回放）。
+    - 键：平台 + URL + 页码；
+    - 值：渲染完成后的 DOM 快照（去掉 <script>，回放时页面不会被脚本重新改写）；
+    - TTL 过期 + 按总体积的 LRU 淘汰（命中时刷新文件 mtime）。
+    模式由 Config.PAGE_CACHE_MODE 决定：
+    - off:    不使用缓存
+    - record: 新鲜缓存直接命中，否则访问网络并写入缓存
+    - replay: 只读缓存，不访问网络
+    """
+    _shared: Optional["PageCache"] = None
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir or Config.PAGE_CACHE_DIR
+        self.ttl = ttl if ttl is not None else Config.PAGE_CACHE_TTL
+        self.max_bytes = max_bytes if max_bytes is not None else Config.PAGE_CACHE_MAX_MB * 1024 * 1024
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @classmethod
+    def shared(cls) -> "PageCache":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @property
+    def mode(self) -> str:
+        return Config.PAGE_CACHE_MODE
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ("record", "replay")
+
+    def _paths(self, platform: str, url: str, page_number: int):
+        digest = hashlib.sha1(f"{platform}|{url}|{page_number}".encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, platform, digest)
+        return base + ".html", base + ".json"
+
+    def get(self, platform: str, url: str, page_number: int = 1) -> Optional[str]:
+        html_path, meta_path = self._paths(platform, url, page_number)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            # 回放模式忽略 TTL：目的就是离线复现
+            if self.mode != "replay" and time.time() - meta["saved_at"] > self.ttl:
+                self._remove(html_path, meta_path)
+                raise FileNotFoundError(html_path)
+            with open(html_path, encoding="utf-8") as f:
+                html = f.read()
+            os.utime(html_path, None)  # LRU: 刷新最近使用时间
+        except (OSError, ValueError, KeyError):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return html
+
+    def put(self, platform: str, url: str, page_number: int, html: str):
+        html_path, meta_path = self._paths(platform, url, page_number)
+        os.makedirs(os.path.dirname(html_path), exist_ok=True)
+        html = _SCRIPT_RE.sub("", html)
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(html)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"platform": platform, "url": url, "page": page_number,
+                       "saved_at": time.time(), "size": len(html)}, f, ensure_ascii=False)
+        self.stats["stores"] += 1
+        self._evict()
+
+    @staticmethod
+    def _remove(*paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".html"):
+                    path = os.path.join(root, name)
+                    st = os.stat(path)
+                    entries.append((st.st_mtime, st.st_size, path))
+                    total += st.st_size
+        if total <= self.max_bytes:
+            return
+        # 淘汰到上限的 90%，避免每次写入都触发一次扫描淘汰
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes * 0.9:
+                break
+            self._remove(path, path[:-5] + ".json")
+            total -= size
+            self.stats["evictions"] += 1
+
+
+async def goto_cached(page, platform: str, url: str, page_number: int = 1, **goto_kwargs) -> bool:
+    """
+    带缓存的页面导航。命中缓存时用缓存快照响应文档请求，其余请求全部拦截（完全不访问网络）。
+    :return: 是否由缓存提供
+    """
+    cache = PageCache.shared()
+    html = cache.get(platform, url, page_number) if cache.enabled else None
+
+    if html is None:
+        if cache.mode == "replay":
+            raise ReplayMiss(f"{platform} 第 {page_number} 页未录制: {url}")
+        await page.goto(url, **goto_kwargs)
+        return False
+
+    served = False
+
+    async def serve(route):
+        nonlocal served
+        # 只响应这次导航本身（主文档），快照中引用的其他资源一律不请求
+        if not served and route.request.is_navigation_request():
+            served = True
+            await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=html)
+        else:
+            await route.abort()
+
+    await page.route("**/*", serve)
+    await page.goto(url, **goto_kwargs)
+    logger.info(f"[{platform}] 使用缓存页面: {url}")
+    return True
+
+
+async def record_page(page, platform: str, url: str, page_number: int = 1, from_cache: bool = False):
+    """录制模式下保存渲染完成的页面快照（缓存命中的页面不重复写入）"""
+    cache = PageCache.shared()
+    if from_cache or cache.mode != "record":
+        return
+    try:
+        cache.put(platform, url, page_number, await page.content())
+    except Exception as e:
+        logger.warning(f"[{platform}] 写入页面缓存失败: {e}")
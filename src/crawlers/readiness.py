@@ -0,0 +1,93 @@
+import logging
+import time
+
+from src.utils.telemetry import span
+
+logger = logging.getLogger(__name__)
+
+# 在页面内用 MutationObserver 监听商品卡片数量：
+# 数量够了立即返回；不够就继续向下滚动触发懒加载；
+# DOM 在 idle 毫秒内没有任何变化（没有更多内容）或超过 budget 总预算时也返回。
+WAIT_FOR_ITEMS_JS = """async ({selector, target, budget, idle, step}) => {
+    const count = () => document.querySelectorAll(selector).length;
+    if (count() >= target) return count();
+
+    return await new Promise(resolve => {
+        let finished = false;
+        let pending = false;
+        let idleTimer = null;
+        let observer = null;
+
+        const finish = () => {
+            if (finished) return;
+            finished = true;
+            if (observer) observer.disconnect();
+            clearTimeout(idleTimer);
+            clearTimeout(budgetTimer);
+            resolve(count());
+        };
+
+        const check = () => {
+            pending = false;
+            if (count() >= target) return finish();
+            window.scrollBy(0, step);
+            clearTimeout(idleTimer);
+            idleTimer = setTimeout(finish, idle);
+        };
+
+        // 合并短时间内的大量 DOM 变化，避免每个节点都触发一次滚动
+        const schedule = () => {
+            if (pending || finished) return;
+            pending = true;
+            setTimeout(check, 50);
+        };
+
+        observer = new MutationObserver(schedule);
+        observer.observe(document.body || document.documentElement, {childList: true, subtree: true});
+        const budgetTimer = setTimeout(finish, budget);
+        check();
+    });
+}"""
+
+
+async def wait_for_items(page, selector: str, target: int, max_wait: float = 8.0, idle: float = 2.0, scroll_step: int = 800) -> int:
+    """
+    事件驱动的页面就绪等待：只滚动到页面上出现 target 个商品卡片为止。
+    :param page: Playwright Page
+    :param selector: 商品卡片的 CSS 选择器
+    :param target: 需要的卡片数量（通常就是 limit）
+    :param max_wait: 最长等待时间(秒)
+    :param idle: DOM 连续无变化多少秒后认为没有更多内容
+    :param scroll_step: 每次滚动的像素
+    :return: 返回时页面上的卡片数量
+    """
+    with span("scroll", target=target) as sp:
+        start = time.perf_counter()
+        found = 0
+        for attempt in range(2):
+            remaining = max_wait - (time.perf_counter() - start)
+            if remaining <= 0:
+                break
+            try:
+                found = await page.evaluate(WAIT_FOR_ITEMS_JS, {
+                    "selector": selector,
+                    "target": max(1, target),
+                    "budget": int(remaining * 1000),
+                    "idle": int(idle * 1000),
+                    "step": scroll_step
+                })
+                break
+            except Exception as e:
+                # 页面跳转会销毁执行上下文：等新页面 DOM 就绪后再试一次
+                if attempt == 0 and not page.is_closed():
+                    try:
+                        await page.wait_for_load_state("domcontentloaded", timeout=max(remaining, 0.1) * 1000)
+                        continue
+                    except Exception:
+                        pass
+                logger.warning(f"等待商品卡片失败 ({selector}): {e}")
+                sp.set(items=0)
+                return 0
+        logger.debug(f"就绪等待 {selector}: {found}/{target} 个, 耗时 {time.perf_counter() - start:.2f}s")
+        sp.set(items=found)
+        return found
@@ -0,0 +1,118 @@
+import logging
+import re
+from typing import Any, Dict
+from urllib.parse import urlparse
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# 第三方统计/广告/埋点域名，对解析结果没有任何作用
+TRACKER_HOSTS = [
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com", "doubleclick.net",
+    "googlesyndication.com", "facebook.net", "facebook.com/tr", "connect.facebook.net",
+    "hotjar.com", "scorecardresearch.com", "criteo.com", "criteo.net", "bat.bing.com",
+    "clarity.ms", "segment.io", "sentry.io", "newrelic.com", "nr-data.net", "branch.io",
+    "amazon-adsystem.com", "fls-na.amazon.com", "unagi.amazon.com",
+    "analytics.tiktok.com", "mon.tiktokv.com", "mcs.tiktokw.us",
+    "arms-retcode.aliyuncs.com", "gm.mmstat.com", "log.mmstat.com",
+]
+
+# 验证码/滑块相关请求永远放行，否则有头模式下无法人工处理
+CAPTCHA_PATTERN = r"captcha|slider|verify|punish|nocaptcha|challenge"
+
+# 每类被拦截资源的平均体积估算(字节)，仅用于估算节省的流量
+EST_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "tracker": 15_000,
+}
+
+DEFAULT_POLICY = {
+    "block_types": ["image", "media", "font"],
+    "block_trackers": True,
+    "allow_patterns": [],
+}
+
+# 各平台策略：allow_patterns 为渲染搜索结果必需的接口，始终放行
+PLATFORM_POLICIES: Dict[str, Dict[str, Any]] = {
+    "amazon": {"allow_patterns": [r"/s\?", r"/s/query"]},
+    "aliexpress": {"allow_patterns": [r"/fn/search", r"/glosearch/api", r"mtop\."]},
+    "temu": {"allow_patterns": [r"/api/poppy/", r"/search_result"]},
+    "shopee": {"allow_patterns": [r"/api/v4/search", r"/api/v4/recommend"]},
+    "tiktok": {"allow_patterns": [r"/api/search", r"/api/shop", r"creative_radar_api"]},
+    "kickstarter": {"allow_patterns": [r"/discover/advanced", r"/graph"]},
+    # 1688 解析依赖商品卡片的实际高度 (offsetHeight)，图片不能拦截
+    "1688": {"block_types": ["media", "font"], "allow_patterns": [r"mtop\.", r"/offer_search"]},
+    "yiwugo": {"allow_patterns": [r"/search/"]},
+}
+
+# 本次运行的拦截统计：平台 -> 计数
+_STATS: Dict[str, Dict[str, Any]] = {}
+
+
+def _policy_for(platform: str) -> Dict[str, Any]:
+    key = platform.split("_")[0].lower()  # shopee_com.my -> shopee
+    policy = dict(DEFAULT_POLICY)
+    policy.update(PLATFORM_POLICIES.get(key, {}))
+    return policy
+
+
+def blocking_stats() -> Dict[str, Dict[str, Any]]:
+    """本次运行各平台的拦截统计 (blocked / allowed / est_bytes_saved / by_type)"""
+    return {k: dict(v, by_type=dict(v["by_type"])) for k, v in _STATS.items()}
+
+
+class ResourceBlocker:
+    """
+    Context 级请求拦截：屏蔽图片/字体/视频与第三方埋点，平台必需的接口走白名单放行。
+    只读取 img.src 等属性，不需要真正下载图片。
+    """
+    def __init__(self, platform: str, policy: Dict[str, Any] = None):
+        self.platform = platform
+        policy = policy or _policy_for(platform)
+        self.block_types = set(policy["block_types"])
+        self.block_trackers = policy["block_trackers"]
+        self.allow_re = re.compile("|".join(policy["allow_patterns"] + [CAPTCHA_PATTERN]), re.I)
+        self.stats = _STATS.setdefault(platform, {"blocked": 0, "allowed": 0, "est_bytes_saved": 0, "by_type": {}})
+
+    @staticmethod
+    def _is_tracker(url: str) -> bool:
+        parsed = urlparse(url)
+        target = parsed.netloc + parsed.path
+        return any(host in target for host in TRACKER_HOSTS)
+
+    def _block_reason(self, resource_type: str, url: str):
+        if self.allow_re.search(url):
+            return None
+        if resource_type in self.block_types:
+            return resource_type
+        if self.block_trackers and self._is_tracker(url):
+            return "tracker"
+        return None
+
+    async def handle(self, route):
+        request = route.request
+        reason = self._block_reason(request.resource_type, request.url)
+        if reason is None:
+            self.stats["allowed"] += 1
+            await route.fallback()
+            return
+        self.stats["blocked"] += 1
+        self.stats["est_bytes_saved"] += EST_BYTES.get(reason, 0)
+        self.stats["by_type"][reason] = self.stats["by_type"].get(reason, 0) + 1
+        await route.abort()
+
+    async def attach(self, context):
+        await context.route("**/*", self.handle)
+
+
+async def apply_resource_policy(context, platform: str):
+    """按平台策略为 Context 挂载请求拦截（BLOCK_RESOURCES=false 时关闭）"""
+    if not Config.BLOCK_RESOURCES:
+        return None
+    blocker = ResourceBlocker(platform)
+    await blocker.attach(context)
+    return blocker
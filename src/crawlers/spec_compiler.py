@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+# 站点规则文件目录：每个平台一个 <name>.json，见 SpecCrawler
+SPEC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "specs")
+
+# 生成脚本的结构发生变化时递增，使旧的编译结果失效
+COMPILER_VERSION = 1
+
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_PLACEHOLDER = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+# 已编译的解析脚本：(规则名, 规则版本, 编译器版本, 规则内容摘要) -> JS
+_SCRIPTS: Dict[Tuple[str, int, int, str], str] = {}
+
+
+def spec_names() -> List[str]:
+    """specs 目录下全部规则名（文件名去掉 .json，按名称排序）"""
+    if not os.path.isdir(SPEC_DIR):
+        return []
+    return sorted(f[:-5] for f in os.listdir(SPEC_DIR) if f.endswith(".json"))
+
+
+@lru_cache(maxsize=None)
+def load_spec(name: str) -> Dict[str, Any]:
+    """读取站点规则（进程内缓存，调用方不应修改返回的 dict）"""
+    with open(os.path.join(SPEC_DIR, f"{name}.json"), "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    spec.setdefault("name", name)
+    return spec
+
+
+def spec_fingerprint(spec: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(spec, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:12]
+
+
+def compile_spec(spec: Dict[str, Any]) -> str:
+    """
+    把站点规则编译为一段 page.evaluate 解析脚本 ({limit, keyword}) => [记录, ...]，
+    按 (规则名, version, 内容摘要) 缓存，同一规则只编译一次。
+    """
+    key = (spec["name"], int(spec.get("version", 1)), COMPILER_VERSION, spec_fingerprint(spec))
+    script = _SCRIPTS.get(key)
+    if script is None:
+        script = _SCRIPTS[key] = _ScriptBuilder(spec).build()
+    return script
+
+
+def _js(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+class _ScriptBuilder:
+    """
+    字段规则 (fields 中的每一项) 可以是：
+    - "css 选择器"                      等价于 {"selector": ...}，取元素 innerText
+    - {"selector", "attr" | "prop"}    取属性 (getAttribute) 或 DOM 属性 (如 href 得到绝对地址)；省略 selector 表示卡片本身
+    - {"regex", "group", "flags"}      在 selector 取到的文本上匹配，省略 selector 时匹配整张卡片的 innerText
+    - {"template": "...{field}..."}    用已解析的字段拼接，任一引用字段为空则结果为空
+    - {"arg": "keyword"} / {"const": ...} / {"location": true}
+    - {"first": [规则, ...]}           依次尝试，取第一个非空结果
+    以及字段级的 default (结果为空时的占位值) 与 prefix / suffix (结果非空时追加)。
+    以 "_" 开头的字段只作中间值，不出现在输出记录中。
+    """
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.name = spec["name"]
+        self.regexes: List[str] = []
+        self.defined: List[str] = []
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"站点规则 {self.name}: {message}")
+
+    def _regex(self, rule: Dict[str, Any]) -> str:
+        # 正则在脚本开头创建一次，所有卡片共用
+        self.regexes.append(f"new RegExp({_js(rule['regex'])}, {_js(rule.get('flags', ''))})")
+        return f"R{len(self.regexes) - 1}"
+
+    def _source(self, rule: Dict[str, Any]) -> str:
+        el = f"card.querySelector({_js(rule['selector'])})" if "selector" in rule else "card"
+        if "attr" in rule:
+            return f"$attr({el}, {_js(rule['attr'])})"
+        if "prop" in rule:
+            return f"$prop({el}, {_js(rule['prop'])})"
+        if "selector" not in rule and "regex" in rule:
+            return "text()"
+        return f"$text({el})"
+
+    def _template(self, template: str) -> str:
+        refs = _PLACEHOLDER.findall(template)
+        for ref in refs:
+            if ref not in self.defined:
+                raise self._error(f"模板 {template!r} 引用了未定义（或定义在其后）的字段 {ref}")
+        parts, pos = [], 0
+        for m in _PLACEHOLDER.finditer(template):
+            if m.start() > pos:
+                parts.append(_js(template[pos:m.start()]))
+            parts.append(f"f_{m.group(1)}")
+            pos = m.end()
+        if pos < len(template):
+            parts.append(_js(template[pos:]))
+        joined = " + ".join(parts) or '""'
+        if not refs:
+            return joined
+        return f"(({' && '.join(f'f_{r}' for r in refs)}) ? {joined} : \"\")"
+
+    def _rule(self, rule: Any) -> str:
+        """单条规则 -> 求值为字符串的 JS 表达式（缺失时为空串）"""
+        if isinstance(rule, str):
+            rule = {"selector": rule}
+        if "template" in rule:
+            return self._template(rule["template"])
+        if "arg" in rule:
+            if rule["arg"] not in ("keyword", "limit"):
+                raise self._error(f"未知参数 {rule['arg']}")
+            return f"String(args.{rule['arg']} ?? \"\")"
+        if "const" in rule:
+            return _js(rule["const"])
+        if rule.get("location"):
+            return "window.location.href"
+        source = self._source(rule)
+        if "regex" in rule:
+            return f"$match({source}, {self._regex(rule)}, {int(rule.get('group', 1))})"
+        return source
+
+    def _field(self, name: str, rule: Any) -> List[str]:
+        if not _IDENT.match(name):
+            raise self._error(f"字段名 {name!r} 不是合法标识符")
+        options = rule if isinstance(rule, dict) else {}
+        alternatives = options.get("first", [rule])
+        var = f"f_{name}"
+        lines = [f"let {var} = {self._rule(alternatives[0])};"]
+        lines += [f"if (!{var}) {var} = {self._rule(alt)};" for alt in alternatives[1:]]
+        prefix, suffix = options.get("prefix", ""), options.get("suffix", "")
+        if prefix or suffix:
+            lines.append(f"if ({var}) {var} = {_js(prefix)} + {var} + {_js(suffix)};")
+        if "default" in options:
+            lines.append(f"if (!{var}) {var} = {_js(options['default'])};")
+        self.defined.append(name)
+        return lines
+
+    def build(self) -> str:
+        spec = self.spec
+        cards = spec["cards"]
+        cards = [cards] if isinstance(cards, str) else list(cards)
+        fields = spec["fields"]
+
+        body: List[str] = []
+        if spec.get("require_text"):
+            body.append(f"if (!text().includes({_js(spec['require_text'])})) continue;")
+        for name, rule in fields.items():
+            body += self._field(name, rule)
+        for name in spec.get("require", []):
+            if name not in fields:
+                raise self._error(f"require 中的字段 {name} 未定义")
+            body.append(f"if (!f_{name}) continue;")
+        unique = spec.get("unique")
+        if unique:
+            if unique not in fields:
+                raise self._error(f"unique 字段 {unique} 未定义")
+            body.append(f"if (seen.has(f_{unique})) continue;")
+            body.append(f"seen.add(f_{unique});")
+        record = [f"\"platform\": {_js(spec['platform'])}"]
+        record += [f"{_js(name)}: f_{name}" for name in fields if not name.startswith("_")]
+        body.append("results.push({" + ", ".join(record) + "});")
+
+        regexes = "".join(f"    const R{i} = {expr};\n" for i, expr in enumerate(self.regexes))
+        inner = "".join(f"            {line}\n" for line in body)
+        return (
+            "(args) => {\n"
+            f"    // {self.name} v{spec.get('version', 1)} (spec compiler v{COMPILER_VERSION})\n"
+            "    const limit = args.limit;\n"
+            "    const $text = (el) => el ? (el.innerText || \"\").trim() : \"\";\n"
+            "    const $attr = (el, name) => el ? (el.getAttribute(name) || \"\") : \"\";\n"
+            "    const $prop = (el, name) => el ? String(el[name] || \"\") : \"\";\n"
+            "    const $match = (value, re, group) => {\n"
+            "        const m = value.match(re);\n"
+            "        return m ? (m[group] ?? \"\") : \"\";\n"
+            "    };\n"
+            f"{regexes}"
+            f"    const selectors = {_js(cards)};\n"
+            "    let cards = [];\n"
+            "    for (const selector of selectors) {\n"
+            "        cards = document.querySelectorAll(selector);\n"
+            "        if (cards.length) break;\n"
+            "    }\n"
+            "    const results = [];\n"
+            "    const seen = new Set();\n"
+            "    for (const card of cards) {\n"
+            "        if (results.length >= limit) break;\n"
+            "        try {\n"
+            "            // 卡片全文只在规则需要时读取一次（innerText 会触发布局）\n"
+            "            let cardText = null;\n"
+            "            const text = () => cardText === null ? (cardText = card.innerText || \"\") : cardText;\n"
+            f"{inner}"
+            "        } catch (e) {\n"
+            "            continue;\n"
+            "        }\n"
+            "    }\n"
+            "    return results;\n"
+            "}"
+        )
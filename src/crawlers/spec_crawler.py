@@ -0,0 +1,172 @@
+import os
+import urllib.parse
+from typing import Any, Dict, List, Optional
+
+from playwright_stealth import Stealth
+
+from src.config import Config
+from src.crawlers.base_crawler import BaseCrawler
+from src.crawlers.blocking import BlockedError, current_solve_window, handle_block
+from src.crawlers.browser_pool import random_user_agent
+from src.crawlers.readiness import wait_for_items
+from src.crawlers.spec_compiler import compile_spec, load_spec
+from src.utils.telemetry import span
+
+
+class SpecCrawler(BaseCrawler):
+    """
+    由站点规则 (src/crawlers/specs/<name>.json) 驱动的通用搜索页爬虫。
+    导航 / 验证拦截检测 / 等待列表 / 滚动加载 / 录制回放 / 单次 evaluate 解析的流程对所有平台相同，
+    平台之间的差异（URL 模板、卡片与字段选择器、正则、滚动策略、Context 参数）全部写在规则文件中，
+    规则中的字段在首次使用时编译为一段解析脚本并按规则版本缓存（见 spec_compiler）。
+    """
+    def __init__(self, spec: str, region: Optional[str] = None):
+        """
+        :param spec: 规则名（specs 目录下的文件名，不含 .json）
+        :param region: 多站点平台的站点（如 Shopee 的 com.my / sg），默认取规则中的 default_region
+        """
+        self.spec = load_spec(spec)
+        self.region = region or self.spec.get("default_region")
+        regional = self.spec.get("regions", {}).get(self.region, {}) if self.region else {}
+        context_name = self.spec.get("context", self.spec["name"])
+        super().__init__(f"{context_name}_{self.region}" if self.region else context_name)
+        self.label = self.spec["platform"]
+        self.currency = regional.get("currency", self.spec.get("currency", "USD"))
+        self.base_url = Config.site_url(self.spec.get("site", self.spec["name"]),
+                                        self.spec["base_url"].format(region=self.region or ""))
+        self.script = compile_spec(self.spec)
+        cards = self.spec["cards"]
+        self.card_selector = cards if isinstance(cards, str) else ", ".join(cards)
+
+    def context_options(self) -> Dict[str, Any]:
+        options = {
+            'viewport': self.spec.get("viewport", {'width': 1920, 'height': 1080}),
+            'user_agent': random_user_agent()
+        }
+        if self.spec.get("locale"):
+            options['locale'] = self.spec["locale"]
+        return options
+
+    async def _setup_context(self, context):
+        # 例如 AliExpress 用 Cookie 固定 美国/英语/美元
+        if self.spec.get("cookies"):
+            await context.add_cookies(self.spec["cookies"])
+
+    def search_url(self, keyword: str, page_number: int = 1) -> Optional[str]:
+        url_spec = self.spec["url"]
+        # 无限滚动的平台没有页码参数 (规则中不写 page)
+        if page_number > 1 and not url_spec.get("page"):
+            return None
+        quote = urllib.parse.quote_plus if url_spec.get("quote") == "plus" else urllib.parse.quote
+        url = self.base_url + url_spec["path"].format(keyword=quote(keyword))
+        if page_number > 1:
+            # first_page: 平台的第一页页码（Shopee 从 0 开始）
+            url += url_spec["page"].format(page=page_number - 1 + url_spec.get("first_page", 1))
+        return url
+
+    async def _is_blocked(self, page, content: bool = False) -> bool:
+        """
+        title 标记随时有效；content 标记（页面 HTML 中任意位置的文本，如 Cookie 横幅、"verify" 字样）
+        只在 content=True 且商品列表没有出现时才算拦截，正常的搜索页即使带有这些文本也照常解析
+        """
+        blocked = self.spec.get("blocked", {})
+        fold = (lambda s: s.lower()) if blocked.get("ignore_case") else (lambda s: s)
+        if blocked.get("title"):
+            title = fold(await page.title())
+            if any(fold(marker) in title for marker in blocked["title"]):
+                return True
+        if content and blocked.get("content") and not await page.query_selector(self.card_selector):
+            html = fold(await page.content())
+            if any(fold(marker) in html for marker in blocked["content"]):
+                return True
+        return False
+
+    async def _check_blocked(self, page, content: bool = False):
+        """
+        检测验证码/滑块/登录拦截（规则中的 blocked 标记）：首次采集直接抛出 BlockedError，
+        由编排器延后重试；重试时（有头模式）在人工处理窗口内等待拦截解除
+        :param content: 是否同时检查 content 标记（只在等待商品列表超时后检查）
+        """
+        if not self.spec.get("blocked") or not await self._is_blocked(page, content):
+            return
+        await handle_block(self.label, lambda: self._is_blocked(page, content), "验证/拦截页面")
+
+    async def _dismiss(self, page):
+        """关闭语言选择 / 登录引导等弹窗（规则中的 dismiss 选择器，找不到就跳过）"""
+        for selector in self.spec.get("dismiss", []):
+            try:
+                button = await page.query_selector(selector)
+                if button:
+                    await button.click()
+            except Exception:
+                pass
+
+    async def _wait_for_list(self, page):
+        wait = self.spec.get("wait", {})
+        selector = wait.get("selector", self.card_selector)
+        try:
+            with span("selector_wait"):
+                await page.wait_for_selector(selector, timeout=wait.get("timeout", 20) * 1000)
+            return
+        except Exception:
+            self.logger.warning(f"{self.label} 页面加载超时")
+        await self._check_blocked(page, content=True)
+        if self.spec.get("manual_wait") and not Config.HEADLESS_MODE:
+            # 没有固定拦截标记的页面（如需要登录）：首次采集不等待，延后重试时在人工处理窗口内列表出现即继续
+            window = current_solve_window()
+            if window <= 0:
+                raise BlockedError(self.label, "列表未加载（可能需要登录）")
+            self.logger.warning(f"⚠️ {self.label} 列表未加载，请在 {window:.0f} 秒内手动登录/验证。")
+            try:
+                with span("captcha_wait"):
+                    await page.wait_for_selector(selector, timeout=window * 1000)
+                return
+            except Exception:
+                pass
+        # 截图方便排查
+        try:
+            await page.screenshot(path=os.path.join(Config.DATA_DIR, "reports", f"{self.spec['name']}_debug.png"))
+        except Exception:
+            pass
+
+    async def _search_page(self, keyword: str, page_number: int, limit: int) -> List[Dict[str, Any]]:
+        await self._init_browser()
+        page = await self.context.new_page()
+        try:
+            if self.spec.get("stealth", True):
+                # 隐藏自动化特征
+                await Stealth().apply_stealth_async(page)
+
+            self.logger.info(f"正在 {self.label} 搜索: {keyword} (第 {page_number} 页)")
+            url = self.search_url(keyword, page_number)
+            from_cache = await self._goto(page, url, page_number, timeout=60000)
+
+            await self._dismiss(page)
+            await self._check_blocked(page)
+            await self._wait_for_list(page)
+
+            # 滚动到足够数量的商品出现为止（缓存快照已是完整页面，无需滚动）
+            scroll = self.spec.get("scroll", False)
+            if scroll and not from_cache:
+                options = scroll if isinstance(scroll, dict) else {}
+                await wait_for_items(page, self.card_selector, limit, **options)
+            await self._record(page, url, page_number, from_cache)
+
+            # 一次 evaluate 提取全部卡片的全部字段
+            products = await self._extract(page, self.script, {"limit": limit, "keyword": keyword})
+            for p in products:
+                p['keyword'] = keyword
+
+            self.logger.info(f"成功抓取 {len(products)} 个 {self.label} 商品")
+            return products
+
+        except BlockedError:
+            raise
+        except Exception as e:
+            self.logger.error(f"{self.label} 抓取失败: {e}")
+            return []
+        finally:
+            await page.close()
+
+    async def get_product_details(self, product_id: str) -> Dict[str, Any]:
+        return {}
@@ -0,0 +1,171 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from src.config import Config
+from src.pipeline.registry import load_output, output_formats
+from src.utils.telemetry import span, traced
+
+if TYPE_CHECKING:
+    from src.utils.report_generator import ReportDraft
+
+logger = logging.getLogger(__name__)
+
+REPORT_DIR = os.path.join("data", "reports")
+
+# DataVisualizer 复用同一个 Figure 对象，同一进程内的仪表盘渲染必须串行
+_PYPLOT_LOCK = threading.Lock()
+# 每个进程（主进程或渲染进程）按输出目录缓存一个 DataVisualizer，字体查找与主题设置只做一次
+_VISUALIZERS: Dict[str, Any] = {}
+
+
+def safe_name(keyword: str) -> str:
+    return keyword.replace(" ", "_")
+
+
+@traced("excel_write")
+def write_excel_report(keyword: str, analysis: Dict, sales_data: List[Dict], sourcing_data: List[Dict], trend_data: List[Dict], report_dir: str = REPORT_DIR) -> str:
+    """
+    写出单个关键词的 Excel 趋势报告 (Summary / Sales / Sourcing / Trends 四个工作表)，逐行流式写入
+    """
+    from src.pipeline.exporters import write_sheets
+
+    if not os.path.exists(report_dir):
+        os.makedirs(report_dir)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_file = os.path.join(report_dir, f"TrendAnalysis_{safe_name(keyword)}_{timestamp}.xlsx")
+    return write_sheets(report_file, [
+        ("Summary", [analysis]),
+        ("Sales", sales_data),
+        ("Sourcing", sourcing_data),
+        ("Trends_Kickstarter", trend_data),
+    ])
+
+
+def _visualizer(report_dir: str) -> Any:
+    visualizer = _VISUALIZERS.get(report_dir)
+    if visualizer is None:
+        visualizer = _VISUALIZERS[report_dir] = load_output("png")(report_dir)
+    return visualizer
+
+
+def _render_dashboard(report_dir: str, name: str, analysis: Dict, sales_data: List[Dict], sourcing_data: List[Dict], trend_data: List[Dict]) -> str:
+    """渲染仪表盘 PNG（在线程或渲染进程中执行）"""
+    with _PYPLOT_LOCK:
+        return _visualizer(report_dir).generate_dashboard(name, analysis, sales_data, sourcing_data, trend_data)
+
+
+def _warm_up(report_dir: str) -> None:
+    """渲染进程预热：提前导入 matplotlib / seaborn 并完成字体查找"""
+    with _PYPLOT_LOCK:
+        _visualizer(report_dir)
+
+
+class ArtifactStage:
+    """
+    报告产物阶段：仪表盘 PNG、Word 深度报告、Excel 趋势报告在线程池（仪表盘可用进程池）中并行生成，不阻塞事件循环。
+    - Word 报告只等待仪表盘 PNG（需要插入图片），Excel 与二者同时写出；
+    - processes > 0 时仪表盘在独立进程中渲染，多个关键词的图表真正并行；否则在线程中串行渲染；
+    - 同一实例可被多个关键词并发使用（批量模式下关键词 N 的报告与关键词 N+1 的采集同时进行），用完需 close()。
+    """
+    def __init__(self, report_dir: str = REPORT_DIR, formats: Optional[List[str]] = None, processes: int = 0,
+                 threads: Optional[int] = None):
+        """
+        :param formats: 要生成的格式 (png / docx / xlsx)，默认 Config.OUTPUT_FORMATS；未启用的格式不导入对应依赖
+        :param processes: 仪表盘渲染进程数，0 表示在线程中渲染
+        :param threads: Word / Excel（及线程模式下仪表盘）的线程数，默认 Config.ARTIFACT_THREADS
+        """
+        self.report_dir = report_dir
+        self.formats = output_formats() if formats is None else formats
+        self.processes = processes if "png" in self.formats else 0
+        self.report_gen = load_output("docx")(report_dir) if "docx" in self.formats else None
+        self._threads = ThreadPoolExecutor(max_workers=threads or Config.ARTIFACT_THREADS, thread_name_prefix="artifact")
+        self._processes: Optional[ProcessPoolExecutor] = None
+        if self.processes:
+            # spawn：不 fork 带着事件循环与浏览器驱动线程的主进程
+            self._processes = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+
+    def warm_up(self):
+        """让渲染进程在采集期间提前完成启动与 matplotlib 导入，首个关键词的仪表盘不再承担这部分耗时"""
+        if self._processes is not None:
+            for _ in range(self.processes):
+                self._processes.submit(_warm_up, self.report_dir)
+
+    async def _in_thread(self, fn: Callable, *args) -> Any:
+        # 与 asyncio.to_thread 一样带上 contextvars（关键词标签），但使用本阶段的有界线程池
+        ctx = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(self._threads, functools.partial(ctx.run, fn, *args))
+
+    async def start_report(self, keyword: str, sales_data: List[Dict], sourcing_data: List[Dict], trend_data: List[Dict]) -> Optional["ReportDraft"]:
+        """在线程中搭好 Word 报告中不依赖 AI 文本的部分（与 LLM 分析并行），未启用 docx 时返回 None"""
+        if self.report_gen is None:
+            return None
+        return await self._in_thread(self.report_gen.start_report, keyword, sales_data, sourcing_data, trend_data)
+
+    async def dashboard(self, keyword: str, analysis: Dict, sales_data: List[Dict], sourcing_data: List[Dict], trend_data: List[Dict]) -> str:
+        args = (self.report_dir, safe_name(keyword), analysis, list(sales_data), list(sourcing_data), list(trend_data))
+        if self._processes is None:
+            return await self._in_thread(_render_dashboard, *args)
+        # 渲染进程中的 span 不会回到本进程，这里在主进程记录一次
+        with span("dashboard_render", executor="process"):
+            return await asyncio.get_running_loop().run_in_executor(self._processes, _render_dashboard, *args)
+
+    async def _docx(self, keyword: str, analysis: Dict, sales_data: List[Dict], sourcing_data: List[Dict], trend_data: List[Dict],
+                    draft: Optional["ReportDraft"], dashboard: Optional[asyncio.Future]) -> str:
+        # 未启用或未能生成仪表盘时，Word 报告自动省略图表一节
+        viz_path = await dashboard if dashboard is not None else None
+        if draft is not None:
+            return await self._in_thread(self.report_gen.finish_report, draft, analysis, viz_path)
+        return await self._in_thread(self.report_gen.generate_word_report, keyword, analysis, sales_data, sourcing_data, trend_data, viz_path)
+
+    async def render(self, keyword: str, analysis: Dict, sales_data: List[Dict], sourcing_data: List[Dict], trend_data: List[Dict],
+                     draft: Optional["ReportDraft"] = None,
+                     on_ready: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """
+        生成单个关键词的全部产物
+        :param draft: start_report 预先搭好的 Word 半成品，只需补齐 AI 点评与仪表盘
+        :param on_ready: 每个产物完成时回调 (产物名, 路径)，例如即时打印
+        :return: {"dashboard": ..., "docx": ..., "excel": ...}，只含成功生成的产物；单个产物失败只记录日志
+        """
+        paths: Dict[str, Any] = {}
+
+        async def produce(name: str, job) -> Optional[str]:
+            try:
+                path = await job
+            except Exception as e:
+                logger.error(f"[{keyword}] {name} 生成失败: {e}")
+                return None
+            paths[name] = path
+            if on_ready is not None:
+                on_ready(name, path)
+            return path
+
+        jobs = []
+        dashboard = None
+        if "png" in self.formats:
+            dashboard = asyncio.ensure_future(produce("dashboard", self.dashboard(keyword, analysis, sales_data, sourcing_data, trend_data)))
+            jobs.append(dashboard)
+        if "docx" in self.formats:
+            jobs.append(produce("docx", self._docx(keyword, analysis, sales_data, sourcing_data, trend_data, draft, dashboard)))
+        if "xlsx" in self.formats:
+            jobs.append(produce("excel", self._in_thread(write_excel_report, keyword, analysis, sales_data, sourcing_data, trend_data, self.report_dir)))
+        with span("artifacts"):
+            await asyncio.gather(*jobs)
+        return {name: paths[name] for name in ("dashboard", "docx", "excel") if name in paths}
+
+    def _shutdown(self):
+        self._threads.shutdown(wait=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=True)
+
+    async def close(self):
+        """等待进行中的产物写完并关闭线程池 / 渲染进程"""
+        await asyncio.to_thread(self._shutdown)
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.analysis.market_analyzer import MarketAnalyzer
+from src.config import Config
+from src.crawlers.browser_pool import BrowserPool
+from src.crawlers.resource_blocker import blocking_stats
+from src.pipeline.artifacts import REPORT_DIR, ArtifactStage
+from src.pipeline.exporters import open_exporters, write_sheets
+from src.pipeline.orchestrator import KeywordPipeline, PipelineResult
+from src.utils.llm_client import LLMClient
+from src.utils.telemetry import Tracer, current_keyword
+from src.utils.translator import Translator
+
+logger = logging.getLogger(__name__)
+
+
+class BatchRunner:
+    """
+    多关键词批量选品：一条长生命周期流水线 + 有界并发。
+    - 浏览器、各平台 BrowserContext、LLM 连接池在所有关键词之间复用；
+    - 同时处理（采集 + 分析）的关键词数由 concurrency 控制；报告产物在线程 / 进程池中生成，
+      不占用并发名额，关键词 N 的报告渲染与关键词 N+1 的采集同时进行；
+    - 每个关键词产出一套报告，最后汇总一份 BatchSummary，核心指标为每小时处理关键词数。
+    """
+    def __init__(self, keywords: List[str], concurrency: int = 2, limit: int = 5, sequential: bool = False, report_dir: str = REPORT_DIR):
+        self.keywords = keywords
+        self.concurrency = max(1, concurrency)
+        self.limit = limit
+        self.sequential = sequential
+        self.report_dir = report_dir
+        self.pool = BrowserPool.shared()
+
+        self.llm = LLMClient.shared()
+        self.analyzer = MarketAnalyzer(self.llm)
+        self.translator = Translator(self.llm)
+        # 只导入启用的报告格式对应的生成器 (matplotlib / python-docx)；仪表盘默认按关键词并发数开渲染进程
+        processes = Config.ARTIFACT_PROCESSES
+        if processes is None:
+            processes = min(self.concurrency, os.cpu_count() or 1)
+        self.artifacts = ArtifactStage(report_dir, processes=processes)
+        # 所有关键词的明细追加到同一个 NDJSON / Parquet 文件
+        self.exporters = open_exporters(self.artifacts.formats, report_dir)
+        self.pipeline = KeywordPipeline(limit=limit, translator=self.translator, pool=self.pool, keep_alive=True,
+                                        exporters=self.exporters)
+
+    async def _collect(self, keyword: str, row: Dict[str, Any]) -> Optional[Tuple[PipelineResult, Dict, Any]]:
+        """采集 + 分析，返回 (采集结果, 分析结果, Word 半成品)；没有销售数据时返回 None"""
+        result = await self.pipeline.run(keyword, concurrent=not self.sequential)
+        row.update({
+            "cn_keyword": result.cn_keyword,
+            "sales_items": len(result.sales_data),
+            "sourcing_items": len(result.sourcing_data),
+            "trend_items": len(result.trend_data),
+            "crawl_seconds": round(result.elapsed, 1),
+        })
+        # 各采集阶段耗时 = 该阶段最慢平台的耗时
+        for report in result.task_reports:
+            key = f"{report['stage']}_seconds"
+            row[key] = max(row.get(key, 0.0), report["elapsed"])
+        if not result.sales_data:
+            row["status"] = "no_sales_data"
+            return None
+
+        # 异步 LLM 调用：多个关键词的分析并发进行，总并发受 LLMClient 的 Semaphore 限制；
+        # 等待 AI 点评的同时在线程中搭好 Word 报告中不依赖 AI 文本的部分
+        stage_start = time.perf_counter()
+        analysis, draft = await asyncio.gather(
+            self.analyzer.analyze_potential(result.sales_data, result.sourcing_data, result.trend_data),
+            self.artifacts.start_report(keyword, result.sales_data, result.sourcing_data, result.trend_data),
+        )
+        row.update({
+            "avg_amazon_price_usd": analysis.get("avg_amazon_price_usd"),
+            "avg_sourcing_price_cny": analysis.get("avg_sourcing_price_cny"),
+            "estimated_margin": analysis.get("estimated_margin"),
+            "recommendation": analysis.get("recommendation"),
+            "first_insight_seconds": analysis.get("time_to_first_insight"),
+            "analysis_seconds": round(time.perf_counter() - stage_start, 2),
+        })
+        return result, analysis, draft
+
+    async def _process(self, keyword: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        # 每个关键词运行在独立的 Task 中，分析 / 报告阶段的 span 同样带上关键词标签
+        current_keyword.set(keyword)
+        start = time.perf_counter()
+        row: Dict[str, Any] = {"keyword": keyword, "status": "ok"}
+        try:
+            async with semaphore:
+                collected = await self._collect(keyword, row)
+            # 已归还并发名额：报告在线程 / 进程池中生成的同时，下一个关键词开始采集
+            if collected is not None:
+                result, analysis, draft = collected
+                stage_start = time.perf_counter()
+                paths = await self.artifacts.render(keyword, analysis, result.sales_data, result.sourcing_data,
+                                                    result.trend_data, draft=draft)
+                row.update(paths)
+                row["artifact_seconds"] = round(time.perf_counter() - stage_start, 2)
+        except Exception as e:
+            logger.error(f"关键词 {keyword} 处理失败: {e}")
+            row["status"] = f"error: {e}"
+        finally:
+            row["total_seconds"] = round(time.perf_counter() - start, 1)
+            print(f"{'✅' if row['status'] == 'ok' else '⚠️'} [{keyword}] {row['status']} ({row['total_seconds']}s)")
+        return row
+
+    async def run(self) -> Dict[str, Any]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        start = time.perf_counter()
+
+        # 所有关键词的翻译合并成少量批量请求，与采集同时进行；
+        # 各关键词的供应链阶段查询翻译时直接命中词典或等待所在批次，不再逐个请求 LLM
+        prewarm = asyncio.create_task(self.translator.translate_many(self.keywords, head=self.concurrency))
+        self.artifacts.warm_up()
+        await self.pool.acquire()
+        try:
+            rows = await asyncio.gather(*(self._process(kw, semaphore) for kw in self.keywords))
+            try:
+                await prewarm
+            except Exception as e:
+                logger.warning(f"批量翻译失败: {e}")
+        finally:
+            await self.pipeline.close()
+            await self.pool.release()
+            await self.llm.aclose()
+            await self.artifacts.close()
+            exports = [exporter.close() for exporter in self.exporters]
+
+        wall = time.perf_counter() - start
+        done = sum(1 for r in rows if r["status"] == "ok")
+        run_stats = {
+            "keywords": len(self.keywords),
+            "succeeded": done,
+            "concurrency": self.concurrency,
+            "wall_seconds": round(wall, 1),
+            "keywords_per_hour": round(len(self.keywords) / wall * 3600, 1) if wall > 0 else 0.0,
+        }
+        run_stats.update({f"pool_{k}": v for k, v in self.pool.stats().items() if k != "leases_by_platform"})
+        run_stats.update({f"llm_{k}": v for k, v in self.llm.stats.items()})
+        run_stats.update({f"block_{k}": v for k, v in self.pipeline.deferred.stats.items()})
+        llm_cache = self.llm.cache
+        if llm_cache is not None:
+            run_stats["llm_cache_hits"] = llm_cache.stats["hits"]
+            run_stats["llm_cache_hit_rate"] = round(llm_cache.hit_rate, 3)
+        blocked = blocking_stats().values()
+        run_stats["blocked_requests"] = sum(st["blocked"] for st in blocked)
+        run_stats["est_mb_saved"] = round(sum(st["est_bytes_saved"] for st in blocked) / 1024 / 1024, 1)
+        summary_path = self._write_summary(list(rows), run_stats)
+        return {"rows": list(rows), "stats": run_stats, "summary_path": summary_path, "exports": exports}
+
+    def _write_summary(self, rows: List[Dict[str, Any]], run_stats: Dict[str, Any]) -> str:
+        if not os.path.exists(self.report_dir):
+            os.makedirs(self.report_dir)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.report_dir, f"BatchSummary_{timestamp}.xlsx")
+        stages = Tracer.shared().summary()
+        stage_rows = [{"stage": name, **{k: round(v, 3) for k, v in st.items()}} for name, st in stages.items()]
+        return write_sheets(path, [("Run", [run_stats]), ("Keywords", rows), ("Stages", stage_rows)])
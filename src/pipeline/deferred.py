@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.config import Config
+from src.crawlers.blocking import current_solve_window, solve_window
+from src.utils.telemetry import span
+
+if TYPE_CHECKING:
+    from src.pipeline.orchestrator import PlatformTask
+
+logger = logging.getLogger(__name__)
+
+
+class DeferredQueue:
+    """
+    被拦截（验证码 / 滑块 / 登录）任务的延后队列，每个 KeywordPipeline 一个，批量模式下所有关键词共用。
+    - 平台被拦截后进入冷却期，冷却期内该平台的新任务不再访问站点，直接排队；
+    - 排队的任务在后台等待冷却结束后重试，编排器为重试新建爬虫实例（新的 BrowserContext / User-Agent），
+      有头模式下重试带 solve_seconds 秒人工处理窗口；等待与重试期间其余平台、其余关键词照常进行；
+    - 同一任务最多重试 retries 次，仍被拦截则放弃（该平台本关键词无数据）。
+    """
+    def __init__(self, delay: Optional[float] = None, retries: Optional[int] = None, solve_seconds: Optional[float] = None):
+        self.delay = Config.BLOCK_RETRY_DELAY if delay is None else delay
+        self.retries = Config.BLOCK_RETRIES if retries is None else retries
+        self.solve_seconds = Config.CAPTCHA_SOLVE_SECONDS if solve_seconds is None else solve_seconds
+        self._cooldown: Dict[str, float] = {}
+        self.stats: Dict[str, int] = {"blocked": 0, "deferred": 0, "retried": 0, "recovered": 0, "abandoned": 0}
+
+    def cooling_down(self, platform: str) -> bool:
+        return self._cooldown.get(platform, 0.0) > time.monotonic()
+
+    def block(self, platform: str):
+        """记录一次拦截，平台进入（或延长）冷却期"""
+        self.stats["blocked"] += 1
+        self._cooldown[platform] = max(self._cooldown.get(platform, 0.0), time.monotonic() + self.delay)
+
+    def defer(self, task: "PlatformTask", run: Callable[["PlatformTask"], Awaitable[List[Dict[str, Any]]]]) -> Optional[asyncio.Task]:
+        """
+        把任务排入后台重试，返回的 asyncio.Task 结果为 (重试任务, 记录)；已用完重试次数时返回 None
+        :param run: 执行一次平台任务的协程函数（编排器的 _run_task，重试再次被拦截时会继续排队）
+        """
+        if task.attempt >= self.retries:
+            self.stats["abandoned"] += 1
+            logger.warning(f"[{task.name}] 重试 {task.attempt} 次后仍被拦截，已放弃")
+            return None
+        self.stats["deferred"] += 1
+        logger.info(f"[{task.name}] 已移入延后队列，{self.delay:.0f}s 后重试")
+        return asyncio.create_task(self._retry(task, run))
+
+    async def _retry(self, task: "PlatformTask", run) -> Tuple["PlatformTask", List[Dict[str, Any]]]:
+        with span("block_deferred", platform=task.name):
+            # 冷却期可能被其他关键词的拦截延长，等到真正结束
+            while self.cooling_down(task.name):
+                await asyncio.sleep(self._cooldown[task.name] - time.monotonic())
+        self.stats["retried"] += 1
+        with solve_window(self.solve_seconds):
+            # 只有真正会等待人工处理时（有头模式）才为重试放宽超时
+            retry = task.retry(extra_timeout=current_solve_window())
+            records = await run(retry)
+        if records:
+            self.stats["recovered"] += 1
+        return retry, records
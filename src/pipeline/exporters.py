@@ -0,0 +1,181 @@
+import json
+import logging
+import math
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.pipeline.registry import OUTPUTS, load_output
+
+logger = logging.getLogger(__name__)
+
+# 边采集边写出的格式（每个平台任务完成即追加），其余格式在分析完成后由 ArtifactStage 生成
+STREAMING_FORMATS = ("ndjson", "parquet")
+
+# Parquet 固定列：入库归一化字段 (src.utils.normalize) + 原始价格/链接，其余字段以 JSON 放在 extra 列
+PARQUET_COLUMNS: List[Tuple[str, str]] = [
+    ("keyword", "string"), ("stage", "string"), ("platform", "string"), ("title", "string"),
+    ("price", "string"), ("currency", "string"), ("price_min", "float64"), ("price_max", "float64"),
+    ("price_cny", "float64"), ("price_usd", "float64"), ("sold_count", "float64"), ("review_count", "float64"),
+    ("rating_value", "float64"), ("link", "string"), ("extra", "string"),
+]
+
+
+def _clean(value: Any) -> Any:
+    """NaN -> None（JSON 与 Excel 都没有 NaN），非标量转为字符串"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _columns(records: Iterable[Dict[str, Any]]) -> List[str]:
+    """所有记录字段的并集，按首次出现的顺序（与 pd.DataFrame(records) 的列顺序一致）"""
+    return list(dict.fromkeys(key for record in records for key in record))
+
+
+def write_sheets(path: str, sheets: Iterable[Tuple[str, List[Dict[str, Any]]]]) -> str:
+    """
+    以 openpyxl write-only 模式逐行写出多个工作表：不构建 DataFrame，行写出后即刷到临时文件，
+    内存占用与行数无关。空列表的工作表不写出。
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for title, rows in sheets:
+        if not rows:
+            continue
+        sheet = workbook.create_sheet(title)
+        columns = _columns(rows)
+        sheet.append(columns)
+        for row in rows:
+            sheet.append([_clean(row.get(column)) for column in columns])
+    workbook.save(path)
+    return path
+
+
+class StreamingExporter(ABC):
+    """
+    边采集边写出的导出器：每个平台任务完成后 write() 一批记录，close() 后返回文件路径。
+    一次运行（单关键词或整个批量）共用一个文件，记录自带 keyword 与 stage 字段。
+    write() 在线程中调用（KeywordPipeline 通过 asyncio.to_thread），内部加锁保证多平台并发写入安全。
+    """
+    suffix = ""
+
+    def __init__(self, report_dir: str):
+        if not os.path.exists(report_dir):
+            os.makedirs(report_dir)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.path = os.path.join(report_dir, f"Records_{timestamp}.{self.suffix}")
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def write(self, stage: str, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        with self._lock:
+            self._write(stage, records)
+            self.rows += len(records)
+
+    @abstractmethod
+    def _write(self, stage: str, records: List[Dict[str, Any]]):
+        """写出一批记录（已在锁内调用）"""
+        pass
+
+    def close(self) -> str:
+        return self.path
+
+
+class NdjsonExporter(StreamingExporter):
+    """每条记录一行 JSON（附 stage 字段），每批写完立即 flush，下游可以 tail -f 增量消费"""
+    suffix = "ndjson"
+
+    def __init__(self, report_dir: str):
+        super().__init__(report_dir)
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def _write(self, stage: str, records: List[Dict[str, Any]]):
+        lines = [json.dumps({"stage": stage, **{k: _clean(v) for k, v in r.items()}}, ensure_ascii=False) for r in records]
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+
+    def close(self) -> str:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        return self.path
+
+
+class ParquetExporter(StreamingExporter):
+    """
+    固定列的 Parquet 文件（需要 pyarrow）。记录先缓冲，满 row_group_size 行写出一个 row group，
+    内存中最多保留一个 row group。
+    """
+    suffix = "parquet"
+
+    def __init__(self, report_dir: str, row_group_size: int = 5000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet 导出需要安装 pyarrow (pip install pyarrow)") from e
+        super().__init__(report_dir)
+        self._pa = pa
+        self.schema = pa.schema([(name, pa.string() if kind == "string" else pa.float64()) for name, kind in PARQUET_COLUMNS])
+        self._writer = pq.ParquetWriter(self.path, self.schema)
+        self.row_group_size = row_group_size
+        self._buffer: Dict[str, List[Any]] = {name: [] for name, _ in PARQUET_COLUMNS}
+
+    @staticmethod
+    def _number(value: Any) -> Optional[float]:
+        return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) and not math.isnan(value) else None
+
+    def _write(self, stage: str, records: List[Dict[str, Any]]):
+        known = {name for name, _ in PARQUET_COLUMNS}
+        for r in records:
+            row = {"stage": stage, "link": r.get("product_url") or r.get("link")}
+            extra = {k: _clean(v) for k, v in r.items() if k not in known and k != "product_url"}
+            for name, kind in PARQUET_COLUMNS:
+                if name == "extra":
+                    value = json.dumps(extra, ensure_ascii=False) if extra else None
+                elif name in row:
+                    value = row[name]
+                else:
+                    value = r.get(name)
+                if kind == "string":
+                    value = None if value is None else str(value)
+                else:
+                    value = self._number(value)
+                self._buffer[name].append(value)
+        if len(self._buffer["stage"]) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer["stage"]:
+            return
+        self._writer.write_table(self._pa.Table.from_pydict(self._buffer, schema=self.schema))
+        self._buffer = {name: [] for name, _ in PARQUET_COLUMNS}
+
+    def close(self) -> str:
+        with self._lock:
+            if self._writer is not None:
+                self._flush()
+                self._writer.close()
+                self._writer = None
+        return self.path
+
+
+def open_exporters(formats: List[str], report_dir: str) -> List[StreamingExporter]:
+    """创建已启用的流式导出器；缺少可选依赖等错误只跳过该格式"""
+    exporters = []
+    for fmt in formats:
+        if fmt not in STREAMING_FORMATS or fmt not in OUTPUTS:
+            continue
+        try:
+            exporters.append(load_output(fmt)(report_dir))
+        except Exception as e:
+            logger.warning(f"{fmt} 导出不可用，已跳过: {e}")
+    return exporters
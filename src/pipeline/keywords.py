@@ -0,0 +1,23 @@
+from typing import List, Optional
+
+
+def load_keywords(keywords: Optional[List[str]] = None, keyword_file: Optional[str] = None) -> List[str]:
+    """
+    合并命令行关键词与关键词文件（每行一个，# 开头为注释），保持顺序去重
+    """
+    merged = list(keywords or [])
+    if keyword_file:
+        with open(keyword_file, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    merged.append(line)
+
+    seen = set()
+    result = []
+    for kw in merged:
+        kw = kw.strip()
+        if kw and kw.lower() not in seen:
+            seen.add(kw.lower())
+            result.append(kw)
+    return result
@@ -0,0 +1,290 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
+
+from src.config import Config
+from src.crawlers.blocking import BlockedError
+from src.crawlers.browser_pool import BrowserPool
+from src.pipeline.deferred import DeferredQueue
+from src.pipeline.registry import PlatformSpec, platforms
+from src.storage.product_store import ProductStore
+from src.utils.telemetry import current_keyword, current_platform, span
+
+if TYPE_CHECKING:
+    from src.pipeline.exporters import StreamingExporter
+    from src.utils.translator import Translator
+
+logger = logging.getLogger(__name__)
+
+
+class PlatformTask:
+    """
+    单个平台的采集任务：独立超时 + 异常隔离。
+    任何一个平台超时或报错都只会让该平台返回空列表，不影响其他平台；
+    被拦截时状态为 blocked，由 KeywordPipeline 交给 DeferredQueue 延后重试（attempt 为重试序号）。
+    """
+    def __init__(self, name: str, stage: str, runner: Callable[[], Awaitable[List[Dict[str, Any]]]], timeout: Optional[float] = None):
+        self.name = name
+        self.stage = stage
+        self.runner = runner
+        self.timeout = timeout if timeout is not None else Config.platform_timeout(name)
+        self.status = "pending"
+        self.elapsed = 0.0
+        self.items = 0
+        self.attempt = 0
+
+    def retry(self, extra_timeout: float = 0.0) -> "PlatformTask":
+        """同一平台任务的下一次尝试（extra_timeout: 留给人工处理窗口的额外时间）"""
+        task = PlatformTask(self.name, self.stage, self.runner, self.timeout + extra_timeout)
+        task.attempt = self.attempt + 1
+        return task
+
+    async def run(self) -> List[Dict[str, Any]]:
+        start = time.perf_counter()
+        # 平台标签只在本任务内生效（顺序模式下多个任务共用同一个 asyncio Task）
+        token = current_platform.set(self.name)
+        try:
+            with span("crawl", stage=self.stage) as sp:
+                result = await asyncio.wait_for(self.runner(), timeout=self.timeout)
+                result = result or []
+                sp.set(items=len(result))
+            self.status = "ok" if result else "empty"
+            self.items = len(result)
+            return result
+        except asyncio.TimeoutError:
+            self.status = "timeout"
+            logger.warning(f"[{self.name}] 超过 {self.timeout:.0f}s 未完成，已取消")
+            return []
+        except BlockedError as e:
+            self.status = "blocked"
+            logger.warning(f"[{self.name}] {e}")
+            return []
+        except Exception as e:
+            self.status = "error"
+            logger.error(f"[{self.name}] 采集失败: {e}")
+            return []
+        finally:
+            self.elapsed = time.perf_counter() - start
+            current_platform.reset(token)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "platform": self.name,
+            "stage": self.stage,
+            "status": self.status,
+            "items": self.items,
+            "elapsed": round(self.elapsed, 2),
+            "attempt": self.attempt
+        }
+
+
+class PipelineResult:
+    """单个关键词的采集结果"""
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+        self.cn_keyword = keyword
+        self.sales_data: List[Dict[str, Any]] = []
+        self.trend_data: List[Dict[str, Any]] = []
+        self.sourcing_data: List[Dict[str, Any]] = []
+        self.task_reports: List[Dict[str, Any]] = []
+        self.elapsed = 0.0
+        # 被拦截、正在后台等待重试的任务
+        self.deferred: List[asyncio.Task] = []
+
+    def add(self, stage: str, records: List[Dict[str, Any]]):
+        getattr(self, f"{stage}_data").extend(records)
+
+
+async def _crawl(factory: Callable[[], Any], method: str, *args, **kwargs) -> List[Dict[str, Any]]:
+    """创建爬虫 -> 调用方法 -> 无论成功/失败/取消都关闭浏览器"""
+    crawler = factory()
+    try:
+        return await getattr(crawler, method)(*args, **kwargs)
+    finally:
+        await crawler.close()
+
+
+class KeywordPipeline:
+    """
+    单关键词采集编排器。
+    - 并发模式：销售 / 趋势 / 供应链三组任务同时进行，组内各平台也并行；
+      供应链组在关键词翻译完成后立即启动，不等待销售端爬虫结束。
+    - 顺序模式：按原有顺序逐个执行，便于调试（如需手动过验证码）。
+    - keep_alive=True 时爬虫/找货器实例（及其 BrowserContext）在多个关键词之间复用，
+      用完需调用 close()；默认每个任务结束即关闭。
+    - 参与的平台来自 src.pipeline.registry（Config.ENABLED_PLATFORMS），爬虫模块在任务首次运行时才导入。
+    - exporters: 流式导出器 (NDJSON / Parquet)，每个平台任务完成即把其记录追加写出，不等整个关键词结束。
+    - 被拦截的平台任务立即让出，移入 DeferredQueue 在后台冷却后用新的爬虫实例重试，
+      其余平台照常进行；关键词在所有重试结束后才返回结果。
+    """
+    def __init__(self, limit: int = 5, translator: Optional["Translator"] = None, pool: Optional[BrowserPool] = None, keep_alive: bool = False,
+                 exporters: Optional[List["StreamingExporter"]] = None):
+        self.limit = limit
+        self.translator = translator
+        self.pool = pool or BrowserPool.shared()
+        self.keep_alive = keep_alive
+        self.exporters = list(exporters or [])
+        self.deferred = DeferredQueue()
+        self._instances: Dict[str, Any] = {}
+        # 被拦截后不再复用的实例：可能仍有其他关键词在使用，统一在 close() 时关闭
+        self._retired: List[Any] = []
+
+    async def _call(self, spec: PlatformSpec, *args, **kwargs) -> List[Dict[str, Any]]:
+        factory = spec.factory()
+        if not self.keep_alive:
+            return await _crawl(factory, spec.method, *args, **kwargs)
+        # 同一个爬虫类、同样的构造参数服务多个平台任务时共用实例
+        instance = self._instances.get(spec.instance_key)
+        if instance is None:
+            instance = self._instances[spec.instance_key] = factory()
+        try:
+            return await getattr(instance, spec.method)(*args, **kwargs)
+        except BlockedError:
+            # 被拦截的 Context 不再复用，重试时新建实例；持久化 Context 的实例（如 1688）无法并存第二份，继续复用
+            if getattr(instance, "persistent_context", False):
+                raise
+            if self._instances.get(spec.instance_key) is instance:
+                self._retired.append(self._instances.pop(spec.instance_key))
+            raise
+
+    async def close(self):
+        """关闭 keep_alive 模式下缓存的所有实例"""
+        instances, self._instances = list(self._instances.values()) + self._retired, {}
+        self._retired = []
+        for instance in instances:
+            try:
+                await instance.close()
+            except Exception as e:
+                logger.warning(f"关闭 {type(instance).__name__} 失败: {e}")
+
+    def _tasks(self, stage: str, keyword: str) -> List[PlatformTask]:
+        tasks = []
+        for spec in platforms(stage):
+            args = (keyword,) if spec.keyword else ()
+            tasks.append(PlatformTask(spec.name, stage, lambda spec=spec, args=args: self._call(spec, *args, limit=self.limit)))
+        return tasks
+
+    def _sales_tasks(self, keyword: str) -> List[PlatformTask]:
+        return self._tasks("sales", keyword)
+
+    def _trend_tasks(self, keyword: str) -> List[PlatformTask]:
+        return self._tasks("trend", keyword)
+
+    def _sourcing_tasks(self, cn_keyword: str) -> List[PlatformTask]:
+        return self._tasks("sourcing", cn_keyword)
+
+    async def _translate(self, keyword: str) -> str:
+        if self.translator is None:
+            from src.utils.translator import Translator
+            self.translator = Translator()
+        try:
+            # 异步 LLM 调用，等待期间各平台爬虫照常运行
+            with span("translation"):
+                return await self.translator.translate_to_chinese(keyword)
+        except Exception as e:
+            logger.warning(f"关键词翻译失败，使用原词: {e}")
+            return keyword
+
+    async def _persist(self, records: List[Dict[str, Any]]):
+        """写入本地商品库（upsert + 追加抓取历史），失败不影响本次分析"""
+        if not records:
+            return
+        try:
+            with span("persist", items=len(records)):
+                await asyncio.to_thread(ProductStore.shared().upsert, records)
+        except Exception as e:
+            logger.warning(f"写入商品库失败: {e}")
+
+    async def _export(self, stage: str, records: List[Dict[str, Any]]):
+        """把一个平台的记录追加到各流式导出器，失败只记录日志"""
+        for exporter in self.exporters:
+            try:
+                with span("export", format=exporter.suffix, items=len(records)):
+                    await asyncio.to_thread(exporter.write, stage, records)
+            except Exception as e:
+                logger.warning(f"{exporter.suffix} 导出失败: {e}")
+
+    async def _run_task(self, result: PipelineResult, task: PlatformTask) -> List[Dict[str, Any]]:
+        if self.deferred.cooling_down(task.name):
+            # 平台刚被拦截（通常是另一个关键词）：冷却期内不访问站点，直接排队
+            task.status = "deferred"
+        else:
+            records = await task.run()
+            if task.status != "blocked":
+                if records and self.exporters:
+                    await self._export(task.stage, records)
+                return records
+            self.deferred.block(task.name)
+        job = self.deferred.defer(task, lambda retry: self._run_task(result, retry))
+        if job is not None:
+            result.deferred.append(job)
+        return []
+
+    async def _run_group(self, result: PipelineResult, tasks: List[PlatformTask], concurrent: bool) -> List[Dict[str, Any]]:
+        if concurrent:
+            groups = await asyncio.gather(*(self._run_task(result, t) for t in tasks))
+        else:
+            groups = [await self._run_task(result, t) for t in tasks]
+        return [item for group in groups for item in group]
+
+    async def _drain(self, result: PipelineResult) -> List[PlatformTask]:
+        """等待后台重试全部结束（重试再次被拦截会继续排队），记录并入对应阶段，返回重试任务"""
+        retried = []
+        while result.deferred:
+            jobs, result.deferred = result.deferred, []
+            for task, records in await asyncio.gather(*jobs):
+                retried.append(task)
+                result.add(task.stage, records)
+        return retried
+
+    async def _sourcing_stage(self, result: PipelineResult, concurrent: bool) -> List[PlatformTask]:
+        # 未启用任何供应链平台时不需要翻译
+        if not platforms("sourcing"):
+            return []
+        result.cn_keyword = await self._translate(result.keyword)
+        logger.info(f"目标中文关键词: {result.cn_keyword}")
+        tasks = self._sourcing_tasks(result.cn_keyword)
+        result.sourcing_data = await self._run_group(result, tasks, concurrent)
+        return tasks
+
+    async def run(self, keyword: str, concurrent: bool = True) -> PipelineResult:
+        # 关键词标签由本流程内所有 span 继承（含各平台子任务与翻译线程）
+        token = current_keyword.set(keyword)
+        try:
+            with span("collect", concurrent=concurrent):
+                return await self._run(keyword, concurrent)
+        finally:
+            current_keyword.reset(token)
+
+    async def _run(self, keyword: str, concurrent: bool) -> PipelineResult:
+        result = PipelineResult(keyword)
+        start = time.perf_counter()
+
+        sales_tasks = self._sales_tasks(keyword)
+        trend_tasks = self._trend_tasks(keyword)
+
+        # 整个关键词流程持有一次浏览器池引用，避免顺序模式下平台之间反复冷启动
+        await self.pool.acquire()
+        try:
+            if concurrent:
+                result.sales_data, result.trend_data, sourcing_tasks = await asyncio.gather(
+                    self._run_group(result, sales_tasks, True),
+                    self._run_group(result, trend_tasks, True),
+                    self._sourcing_stage(result, True),
+                )
+            else:
+                result.sales_data = await self._run_group(result, sales_tasks, False)
+                result.trend_data = await self._run_group(result, trend_tasks, False)
+                sourcing_tasks = await self._sourcing_stage(result, False)
+            # 被拦截的平台在后台冷却、重试，其余平台已全部完成
+            retried = await self._drain(result)
+        finally:
+            for job in result.deferred:
+                job.cancel()
+            await self.pool.release()
+
+        await self._persist(result.sales_data + result.trend_data + result.sourcing_data)
+        result.task_reports = [t.report() for t in sales_tasks + trend_tasks + sourcing_tasks + retried]
+        result.elapsed = time.perf_counter() - start
+        return result
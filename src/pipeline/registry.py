@@ -0,0 +1,166 @@
+import importlib
+import logging
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config import Config
+from src.crawlers.spec_compiler import load_spec, spec_names
+
+logger = logging.getLogger(__name__)
+
+# 第三方平台插件的 entry point 分组：值指向一个 PlatformSpec 实例，例如
+#   [project.entry-points."botsales.platforms"]
+#   ebay = "botsales_ebay:SPEC"
+ENTRY_POINT_GROUP = "botsales.platforms"
+
+
+@lru_cache(maxsize=None)
+def load(target: str) -> Any:
+    """按 "模块路径:属性名" 导入对象（首次调用才 import 对应模块，结果缓存）"""
+    module_name, _, attr = target.partition(":")
+    obj = importlib.import_module(module_name)
+    for part in attr.split(".") if attr else []:
+        obj = getattr(obj, part)
+    return obj
+
+
+def platform_key(name: str) -> str:
+    """平台名 -> 命令行 / 环境变量中使用的键，例如 "TikTok Shop" -> "tiktok_shop" """
+    return name.strip().lower().replace(" ", "_").replace("-", "_")
+
+
+class PlatformSpec:
+    """
+    一个采集平台的登记信息。爬虫类以字符串形式登记，只有平台被启用并真正运行时才导入，
+    未启用的平台不会加载 playwright_stealth / fake_useragent 等依赖。
+    """
+    def __init__(self, name: str, stage: str, target: str, method: str = "search_products", keyword: bool = True,
+                 options: Optional[Dict[str, Any]] = None):
+        """
+        :param stage: sales / trend / sourcing
+        :param target: 爬虫类 "模块路径:类名"
+        :param method: 采集方法名，签名为 (keyword, limit=...) 或 keyword=False 时的 (limit=...)
+        :param keyword: 采集方法是否接收关键词
+        :param options: 构造爬虫时传入的关键字参数（如 SpecCrawler 的规则名），默认无参数构造
+        """
+        self.name = name
+        self.key = platform_key(name)
+        self.stage = stage
+        self.target = target
+        self.method = method
+        self.keyword = keyword
+        self.options = dict(options or {})
+
+    @property
+    def instance_key(self) -> str:
+        """keep_alive 模式下复用实例的键：同一个类、同样的构造参数共用一个实例"""
+        return self.target + "".join(f"|{k}={v}" for k, v in sorted(self.options.items()))
+
+    def load(self) -> type:
+        return load(self.target)
+
+    def factory(self) -> Callable[[], Any]:
+        """无参数的爬虫构造函数"""
+        cls = self.load()
+        return partial(cls, **self.options) if self.options else cls
+
+    def __repr__(self) -> str:
+        return f"PlatformSpec({self.name!r}, {self.stage!r}, {self.target!r})"
+
+
+# 内置平台（登记顺序即采集任务与报告中的顺序）
+PLATFORMS: Dict[str, PlatformSpec] = {}
+
+# 由站点规则驱动的搜索页爬虫（src/crawlers/specs/*.json）
+SPEC_CRAWLER = "src.crawlers.spec_crawler:SpecCrawler"
+
+
+def register_platform(spec: PlatformSpec) -> PlatformSpec:
+    """登记（或覆盖同名）平台"""
+    PLATFORMS[spec.key] = spec
+    return spec
+
+
+def _spec_platforms() -> List[PlatformSpec]:
+    """specs 目录下带 register 段的站点规则，按 register.order 排序；新增平台只需新增一个规则文件"""
+    entries = []
+    for name in spec_names():
+        register = load_spec(name).get("register")
+        if register:
+            entries.append((register.get("order", 100), name, register))
+    return [PlatformSpec(register["name"], register["stage"], SPEC_CRAWLER, options={"spec": name})
+            for _, name, register in sorted(entries, key=lambda e: (e[0], e[1]))]
+
+
+for _spec in (
+    *_spec_platforms(),
+    PlatformSpec("1688", "sourcing", "src.sourcing.sourcer_1688:Sourcer1688", "search_source"),
+    PlatformSpec("YiwuGo", "sourcing", "src.sourcing.sourcer_yiwugo:SourcerYiwuGo", "search_source"),
+):
+    register_platform(_spec)
+
+_entry_points_loaded = False
+_warned = set()
+
+
+def _load_entry_points(enabled: Optional[set]):
+    """登记已安装插件提供的平台；只 import 被启用的插件"""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    from importlib.metadata import entry_points
+
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        if enabled and platform_key(ep.name) not in enabled:
+            continue
+        try:
+            spec = ep.load()
+        except Exception as e:
+            logger.warning(f"平台插件 {ep.name} 加载失败: {e}")
+            continue
+        if isinstance(spec, PlatformSpec):
+            register_platform(spec)
+        else:
+            logger.warning(f"平台插件 {ep.name} 未指向 PlatformSpec，已忽略")
+
+
+def platforms(stage: Optional[str] = None) -> List[PlatformSpec]:
+    """
+    已启用的平台（Config.ENABLED_PLATFORMS 为空表示全部启用）
+    :param stage: 只返回指定阶段 (sales / trend / sourcing) 的平台
+    """
+    enabled = {platform_key(p) for p in Config.ENABLED_PLATFORMS} or None
+    _load_entry_points(enabled)
+    if enabled:
+        unknown = enabled - set(PLATFORMS) - _warned
+        if unknown:
+            _warned.update(unknown)
+            logger.warning(f"未知平台: {', '.join(sorted(unknown))}（可选: {', '.join(PLATFORMS)}）")
+    return [spec for spec in PLATFORMS.values()
+            if (enabled is None or spec.key in enabled) and (stage is None or spec.stage == stage)]
+
+
+# 报告产物：格式 -> 生成器 "模块路径:属性名"，同样按需导入 (matplotlib / python-docx / openpyxl / pyarrow)
+# ndjson / parquet 为流式导出，各平台采集完成即追加写入（见 src.pipeline.exporters）
+OUTPUTS: Dict[str, str] = {
+    "png": "src.utils.visualizer:DataVisualizer",
+    "docx": "src.utils.report_generator:ReportGenerator",
+    "xlsx": "src.pipeline.artifacts:write_excel_report",
+    "ndjson": "src.pipeline.exporters:NdjsonExporter",
+    "parquet": "src.pipeline.exporters:ParquetExporter",
+}
+
+
+def output_formats() -> List[str]:
+    """已启用的报告格式（按 OUTPUTS 的登记顺序）"""
+    enabled = {f.strip().lower() for f in Config.OUTPUT_FORMATS}
+    unknown = enabled - set(OUTPUTS) - _warned
+    if unknown:
+        _warned.update(unknown)
+        logger.warning(f"未知报告格式: {', '.join(sorted(unknown))}（可选: {', '.join(OUTPUTS)}）")
+    return [fmt for fmt in OUTPUTS if fmt in enabled]
+
+
+def load_output(fmt: str) -> Any:
+    return load(OUTPUTS[fmt])
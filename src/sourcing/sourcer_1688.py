@@ -1,36 +1,136 @@
 import asyncio
 from typing import List, Dict, Any
-from playwright.async_api import async_playwright, TimeoutError
+from playwright.async_api import TimeoutError
 import urllib.parse
 from src.config import Config
+from src.crawlers.blocking import BlockedError, handle_block
+from src.crawlers.browser_pool import BrowserPool
+from src.crawlers.page_cache import PageCache, ReplayMiss, goto_cached, record_page
+from src.crawlers.resource_blocker import apply_resource_policy
+from src.crawlers.readiness import wait_for_items
+from src.utils.normalize import normalize_records
+from src.utils.telemetry import span
 import logging
 import os
 
 logger = logging.getLogger(__name__)
 
+# 搜索结果解析脚本（线性时间）：
+# 1. 候选 = 含图片、可见且足够高的链接（排除小图标），按 href 去重，优先 offer 详情链接；
+# 2. 商品卡片 = 向上不超过 MAX_DEPTH 层、子树内只包含这一个候选的最高祖先节点
+#    （不依赖 1688 的 class 命名，改版后仍然有效）；
+# 3. 每个卡片只遍历一次文本节点，从中识别价格 / 标题 / 供应商。
+# 全程不读取 innerText（避免反复触发布局），每个节点只访问常数次。
+SOURCER_1688_EXTRACT_JS = """({limit}) => {
+    const MAX_DEPTH = 6;
+    const PRICE_RE = /¥\\s*(\\d+(?:\\.\\d{1,2})?)/;
+    const NUMBER_RE = /^\\d+\\.\\d{1,2}$/;
+    const SUPPLIER_RE = /(公司|商行|厂|经营部|店)$/;
+
+    // 1. 候选链接
+    const visited = new Set();
+    const hrefs = new Set();
+    let candidates = [];
+    for (const img of document.querySelectorAll('a[href] img')) {
+        const link = img.closest('a[href]');
+        if (visited.has(link)) continue;
+        visited.add(link);
+        if (hrefs.has(link.href) || link.offsetHeight < 50) continue;
+        hrefs.add(link.href);
+        candidates.push({link, img});
+    }
+    const offers = candidates.filter(c => /offer|detail\\.1688/.test(c.link.href));
+    if (offers.length) candidates = offers;
+
+    // 2. 每个祖先节点包含的候选数（每个候选最多向上 MAX_DEPTH 层）
+    const owners = new Map();
+    for (const {link} of candidates) {
+        let el = link.parentElement;
+        for (let d = 0; el && d < MAX_DEPTH; d++, el = el.parentElement) {
+            owners.set(el, (owners.get(el) || 0) + 1);
+        }
+    }
+
+    const results = [];
+    for (const {link, img} of candidates) {
+        if (results.length >= limit) break;
+
+        let card = link;
+        let el = link.parentElement;
+        for (let d = 0; el && d < MAX_DEPTH && owners.get(el) === 1; d++, el = el.parentElement) {
+            card = el;
+        }
+
+        // 3. 卡片内文本片段（按文档顺序）
+        const segments = [];
+        const walker = document.createTreeWalker(card, NodeFilter.SHOW_TEXT);
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            const text = node.nodeValue.trim();
+            if (text) segments.push(text);
+        }
+
+        // 价格：优先 "¥" 开头（价格常被拆成 ¥ / 整数 / 小数 多个节点），其次纯数字价格
+        let price = "";
+        for (let i = 0; i < segments.length && !price; i++) {
+            if (!segments[i].includes('¥')) continue;
+            const match = segments.slice(i, i + 4).join('').match(PRICE_RE);
+            if (match) price = `¥${match[1]}`;
+        }
+        if (!price) price = segments.find(s => NUMBER_RE.test(s)) || "";
+
+        // 供应商：以公司/商行/厂等结尾的名称（长度下限排除 "源头工厂" 之类的服务标签）
+        const supplier = segments.find(s => s.length >= 6 && s.length < 40 && SUPPLIER_RE.test(s)) || "1688 Supplier";
+
+        // 标题：链接 title > 图片 alt > 第一段长度适中、不含价格的文本
+        let title = link.title || (img.alt && img.alt.length > 5 ? img.alt : "");
+        if (!title) {
+            title = segments.find(s => s.length > 5 && s.length < 100 && !s.includes('¥') && s !== supplier) || "";
+        }
+
+        if (price && title) {
+            results.push({
+                "platform": "1688",
+                "title": title.trim(),
+                "price": price,
+                "supplier": supplier,
+                "link": link.href
+            });
+        }
+    }
+    return results;
+}"""
+
 class Sourcer1688:
     """
     1688 找货器 (支持持久化登录)
     """
+    # 持久化用户目录同一时间只能被一个浏览器进程打开：被拦截后不能新建实例重试，
+    # 编排器继续复用本实例（重试时新开 Page，人工验证留下的登录状态也随之保留）
+    persistent_context = True
+
     def __init__(self):
-        self.base_url = "https://www.1688.com/"
+        self.base_url = Config.site_url("1688", "https://www.1688.com") + "/"
+        self.search_base_url = Config.site_url("1688_search", "https://s.1688.com")
         self.user_data_dir = os.path.join(Config.DATA_DIR, "browser_data_1688")
         if not os.path.exists(self.user_data_dir):
             os.makedirs(self.user_data_dir)
+        self.pool = BrowserPool.shared()
+        self.context = None
+        self._context_lock = asyncio.Lock()
             
-    async def _safe_screenshot(self, page, filename):
-        """安全截图，防止因浏览器关闭而崩溃"""
-        try:
-            if not page.is_closed():
-                await page.screenshot(path=filename)
-        except Exception as e:
-            logger.warning(f"截图失败 ({filename}): {e}")
-
-    async def search_source(self, keyword: str, limit: int = 5) -> List[Dict[str, Any]]:
-        async with async_playwright() as p:
-            try:
-                context = await p.chromium.launch_persistent_context(
-                    user_data_dir=self.user_data_dir,
+    async def _init_browser(self):
+        """
+        启动持久化 Context（同一用户目录只能被一个浏览器进程打开，
+        因此多个关键词并发时共用这一个 Context，各自开 Page）。
+        回放模式只读缓存、不需要登录态，改用普通 Context，不启动持久化用户目录。
+        """
+        async with self._context_lock:
+            if self.context is None and PageCache.shared().mode == "replay":
+                self.context = await self.pool.lease_context("1688")
+            elif self.context is None:
+                self.context = await self.pool.launch_persistent_context(
+                    self.user_data_dir,
+                    "1688",
                     headless=Config.HEADLESS_MODE,
                     args=[
                         '--disable-blink-features=AutomationControlled',
@@ -40,139 +140,109 @@ class Sourcer1688:
                     viewport=None,
                     user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
                 )
-            except Exception as e:
-                logger.error(f"启动浏览器失败: {e}")
-                return []
-            
-            page = await context.new_page()
+                await apply_resource_policy(self.context, "1688")
+
+    async def close(self):
+        if self.context is not None:
+            context, self.context = self.context, None
+            await self.pool.return_context(context)
+
+    @staticmethod
+    async def _is_blocked(page) -> bool:
+        title = await page.title()
+        return "验证" in title or "安全" in title or "登录" in title
+
+    async def _safe_screenshot(self, page, filename):
+        """安全截图，防止因浏览器关闭而崩溃"""
+        try:
+            if not page.is_closed():
+                await page.screenshot(path=filename)
+        except Exception as e:
+            logger.warning(f"截图失败 ({filename}): {e}")
+
+    async def _search_from_home(self, page, keyword: str, url: str):
+        """从首页搜索框搜索（更接近真人操作）；找不到搜索框时直接跳转搜索结果 URL"""
+        try:
+            with span("navigation"):
+                await page.goto(self.base_url, timeout=60000)
+        except Exception as e:
+            logger.warning(f"打开首页超时: {e}")
+
+        # 拦截检测：首次采集直接让出（BlockedError），延后重试时有头模式下等待人工完成验证
+        if await self._is_blocked(page):
+            await handle_block("1688", lambda: self._is_blocked(page), "验证/登录页面")
+
+        try:
+            with span("selector_wait"):
+                search_input = await page.wait_for_selector('#alisearch-keywords, .search-input-input, input[name="keywords"]', timeout=10000)
+            if search_input:
+                await search_input.click()
+                await search_input.fill(keyword)
+                await asyncio.sleep(0.5)
+                await page.keyboard.press('Enter')
+            else:
+                raise Exception("Search input not found")
+        except Exception as e:
+            logger.warning(f"首页搜索框未找到，尝试跳转 URL...")
+            with span("navigation"):
+                await page.goto(url)
+
+    async def search_source(self, keyword: str, limit: int = 5) -> List[Dict[str, Any]]:
+        try:
+            await self._init_browser()
+        except Exception as e:
+            logger.error(f"启动浏览器失败: {e}")
+            return []
+        
+        page = None
+        try:
+            page = await self.context.new_page()
+            logger.info(f"正在 1688 寻找货源: {keyword}")
+            url = f"{self.search_base_url}/selloffer/offer_search.htm?keywords={urllib.parse.quote(keyword)}"
+
+            if PageCache.shared().enabled:
+                # 录制/回放模式直接打开搜索结果 URL（缓存按 URL 录制，不走首页搜索框）；
+                # 回放模式不访问网络，未录制时抛出 ReplayMiss
+                with span("navigation") as sp:
+                    from_cache = await goto_cached(page, "1688", url, 1, timeout=60000)
+                    sp.set(from_cache=from_cache)
+                if not from_cache and await self._is_blocked(page):
+                    await handle_block("1688", lambda: self._is_blocked(page), "验证/登录页面")
+            else:
+                from_cache = False
+                await self._search_from_home(page, keyword, url)
+
+            # 等待商品卡片出现（带图的 offer 链接），够数即返回
+            await wait_for_items(page, 'a[href*="offer"] img', limit)
+            await record_page(page, "1688", url, 1, from_cache)
+
+            logger.info("开始解析商品数据...")
+            with span("extraction") as sp:
+                sources = await page.evaluate(SOURCER_1688_EXTRACT_JS, {"limit": limit})
+                sp.set(items=len(sources))
             
-            try:
-                logger.info(f"正在 1688 寻找货源: {keyword}")
-                
-                try:
-                    await page.goto("https://www.1688.com/", timeout=60000)
-                except Exception as e:
-                    logger.warning(f"打开首页超时: {e}")
-
-                # 人工介入检测
-                if not Config.HEADLESS_MODE:
-                    title = await page.title()
-                    if "验证" in title or "安全" in title or "登录" in title:
-                        logger.warning(">>> 检测到拦截，请在 60秒 内手动完成验证！<<<")
-                        await asyncio.sleep(60)
-
-                # 搜索流程
-                try:
-                    search_input = await page.wait_for_selector('#alisearch-keywords, .search-input-input, input[name="keywords"]', timeout=10000)
-                    if search_input:
-                        await search_input.click()
-                        await search_input.fill(keyword)
-                        await asyncio.sleep(0.5)
-                        await page.keyboard.press('Enter')
-                    else:
-                        raise Exception("Search input not found")
-                except Exception as e:
-                    logger.warning(f"首页搜索框未找到，尝试跳转 URL...")
-                    url = f"https://s.1688.com/selloffer/offer_search.htm?keywords={urllib.parse.quote(keyword)}"
-                    await page.goto(url)
-
-                if not Config.HEADLESS_MODE:
-                    await asyncio.sleep(3) # 等待页面加载
-
-                # -------------------------------------------------------
-                # 改进后的 JS 解析逻辑 (基于 debug 结果优化)
-                # -------------------------------------------------------
-                logger.info("开始解析商品数据...")
-                sources = await page.evaluate(f"""(limit) => {{
-                    const results = [];
-                    // 1. 找到所有包含图片的链接 (这通常是商品的主图)
-                    const links = Array.from(document.querySelectorAll('a'));
-                    
-                    for (const link of links) {{
-                        if (results.length >= limit) break;
-                        
-                        // 过滤条件：必须有子图片，且可见高度足够（避免小图标）
-                        const img = link.querySelector('img');
-                        if (!img || link.offsetHeight < 50) continue;
-                        
-                        // 2. 以这个链接为基准，向上寻找“商品卡片容器”
-                        // 并在容器内寻找标题和价格
-                        let container = link.parentElement;
-                        let price = "";
-                        let title = "";
-                        
-                        // 向上遍历 5 层，寻找包含价格信息的区域
-                        for (let i = 0; i < 5; i++) {{
-                            if (!container) break;
-                            
-                            // 获取容器内所有文本
-                            const text = container.innerText;
-                            
-                            // 检查价格：找 "¥" 符号或纯数字价格模式
-                            if (!price && (text.includes('¥') || /[0-9]+\\.[0-9]{{2}}/.test(text))) {{
-                                // 尝试找到具体的价格节点
-                                const priceNode = Array.from(container.querySelectorAll('*')).find(el => 
-                                    el.innerText && (el.innerText.includes('¥') || /^\\d+(\\.\\d+)?$/.test(el.innerText.trim())) && el.innerText.length < 15
-                                );
-                                if (priceNode) price = priceNode.innerText.trim();
-                                else if (text.includes('¥')) {{
-                                    // 如果找不到节点，尝试正则提取
-                                    const match = text.match(/¥\\s*([\\d\\.]+)/);
-                                    if (match) price = match[0];
-                                }}
-                            }}
-                            
-                            // 检查标题：通常是除了价格以外最长的一段字
-                            if (!title) {{
-                                if (link.title) title = link.title;
-                                else if (img.alt && img.alt.length > 5) title = img.alt;
-                                else {{
-                                    // 尝试找标题节点 (文本长度适中，不含价格)
-                                    const titleNode = Array.from(container.querySelectorAll('div, span, a')).find(el => 
-                                        el.innerText && el.innerText.length > 5 && el.innerText.length < 100 && !el.innerText.includes('¥')
-                                    );
-                                    if (titleNode) title = titleNode.innerText.trim();
-                                }}
-                            }}
-                            
-                            // 如果都找到了，就认为这是一个商品块
-                            if (price && title) break;
-                            
-                            container = container.parentElement;
-                        }}
-                        
-                        if (price && title) {{
-                            // 去重
-                            if (!results.find(r => r.link === link.href)) {{
-                                results.push({{
-                                    "platform": "1688",
-                                    "title": title,
-                                    "price": price,
-                                    "supplier": "1688 Supplier",
-                                    "link": link.href
-                                }});
-                            }}
-                        }}
-                    }}
-                    return results;
-                }}""", limit)
-                
-                for s in sources:
-                    s["search_term"] = keyword
-
-                if sources:
-                    logger.info(f"成功解析 {len(sources)} 个商品")
-                else:
-                    logger.warning("未解析到数据。可能需要进一步调整 DOM 遍历深度。")
-                    await self._safe_screenshot(page, "debug_1688_parse_fail.png")
-
-                return sources
-                
-            except Exception as e:
-                logger.error(f"1688 搜索过程出错: {e}")
-                await self._safe_screenshot(page, "debug_1688_crash.png")
-                return []
-            finally:
-                # 在主程序中通常需要关闭 context，但在持久化模式下可能希望能保持
-                if context:
-                    await context.close()
+            for s in sources:
+                s["search_term"] = keyword
+            normalize_records(sources, currency="CNY")
+
+            if sources:
+                logger.info(f"成功解析 {len(sources)} 个商品")
+            else:
+                logger.warning("未解析到数据。可能需要进一步调整 DOM 遍历深度。")
+                await self._safe_screenshot(page, "debug_1688_parse_fail.png")
+
+            return sources
+
+        except BlockedError:
+            raise
+        except ReplayMiss as e:
+            logger.warning(f"1688 回放缓存未命中: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"1688 搜索过程出错: {e}")
+            await self._safe_screenshot(page, "debug_1688_crash.png")
+            return []
+        finally:
+            # 只关闭本次搜索的 Page，持久化 Context 由 close() 统一归还
+            if page:
+                await page.close()
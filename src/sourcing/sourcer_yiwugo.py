@@ -1,85 +1,117 @@
 import asyncio
 from typing import List, Dict, Any
-from playwright.async_api import async_playwright
 import urllib.parse
 from src.config import Config
+from src.crawlers.browser_pool import BrowserPool
+from src.crawlers.page_cache import ReplayMiss, goto_cached, record_page
+from src.crawlers.resource_blocker import apply_resource_policy
+from src.utils.normalize import normalize_records
+from src.utils.telemetry import span
 import logging
 import os
 
 logger = logging.getLogger(__name__)
 
+# 搜索结果解析脚本：单次往返返回结构化记录
+YIWUGO_EXTRACT_JS = """({limit, keyword}) => {
+    const sources = [];
+    for (const item of document.querySelectorAll('.pro_item')) {
+        if (sources.length >= limit) break;
+        try {
+            // 标题
+            const titleEl = item.querySelector('.product_title a');
+            const title = titleEl ? (titleEl.getAttribute('title') || "") : "Unknown";
+
+            // 价格 (义乌购价格通常是范围，或者是 "¥12.5")
+            const priceEl = item.querySelector('.pri-num em, .pri_price');
+            const price = priceEl ? priceEl.innerText : "N/A";
+
+            // 供应商
+            const companyEl = item.querySelector('.shop_name a, .company_name');
+            const company = companyEl ? companyEl.innerText : "Unknown Shop";
+
+            // 链接
+            let link = titleEl ? (titleEl.getAttribute('href') || "") : "";
+            if (link && !link.startsWith('http')) link = `https://www.yiwugo.com${link}`;
+
+            sources.push({
+                "platform": "YiwuGo",
+                "search_term": keyword,
+                "title": title.trim(),
+                "price": price.trim(),
+                "supplier": company.trim(),
+                "link": link
+            });
+        } catch (e) {
+            continue;
+        }
+    }
+    return sources;
+}"""
+
 class SourcerYiwuGo:
     """
     义乌购找货器
     """
     def __init__(self):
-        self.base_url = "https://www.yiwugo.com/search/s.html"
+        self.base_url = Config.site_url("yiwugo", "https://www.yiwugo.com") + "/search/s.html"
         # 义乌购可能也需要 Cookie，但通常匿名搜索较宽松
-        
+        self.pool = BrowserPool.shared()
+        self.context = None
+        self._context_lock = asyncio.Lock()
+
+    async def _init_browser(self):
+        async with self._context_lock:
+            if self.context is None:
+                self.context = await self.pool.lease_context(
+                    "yiwugo",
+                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+                )
+                await apply_resource_policy(self.context, "yiwugo")
+
+    async def close(self):
+        if self.context is not None:
+            context, self.context = self.context, None
+            await self.pool.return_context(context)
+
     async def search_source(self, keyword: str, limit: int = 5) -> List[Dict[str, Any]]:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=Config.HEADLESS_MODE,
-                args=['--disable-blink-features=AutomationControlled']
-            )
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-            page = await context.new_page()
+        await self._init_browser()
+        page = None
+        try:
+            page = await self.context.new_page()
+            logger.info(f"正在 义乌购 寻找货源: {keyword}")
+            # 义乌购搜索 URL 格式
+            url = f"{self.base_url}?q={urllib.parse.quote(keyword)}"
+            # 与各爬虫的搜索页一样经过录制/回放缓存（回放模式不访问网络，未录制时抛出 ReplayMiss）
+            with span("navigation") as sp:
+                from_cache = await goto_cached(page, "YiwuGo", url, 1, timeout=30000)
+                sp.set(from_cache=from_cache)
             
+            # 等待商品列表
+            # 义乌购商品项通常是 li.pro_item 或 div.product_list
             try:
-                logger.info(f"正在 义乌购 寻找货源: {keyword}")
-                # 义乌购搜索 URL 格式
-                url = f"{self.base_url}?q={urllib.parse.quote(keyword)}"
-                await page.goto(url, timeout=30000)
-                
-                # 等待商品列表
-                # 义乌购商品项通常是 li.pro_item 或 div.product_list
-                try:
+                with span("selector_wait"):
                     await page.wait_for_selector('.pro_list_product_img, .pro_item', timeout=10000)
-                except:
-                    logger.warning("义乌购加载超时或无结果")
-                    
-                items = await page.query_selector_all('.pro_item')
+            except:
+                logger.warning("义乌购加载超时或无结果")
+            await record_page(page, "YiwuGo", url, 1, from_cache)
                 
-                sources = []
-                for item in items[:limit]:
-                    try:
-                        # 标题
-                        title_el = await item.query_selector('.product_title a')
-                        title = await title_el.get_attribute('title') if title_el else "Unknown"
-                        
-                        # 价格 (义乌购价格通常是范围，或者是 "¥12.5")
-                        price_el = await item.query_selector('.pri-num em, .pri_price')
-                        price = await price_el.inner_text() if price_el else "N/A"
-                        
-                        # 供应商
-                        company_el = await item.query_selector('.shop_name a, .company_name')
-                        company = await company_el.inner_text() if company_el else "Unknown Shop"
-                        
-                        # 链接
-                        link_el = await item.query_selector('.product_title a')
-                        link = await link_el.get_attribute('href') if link_el else ""
-                        if link and not link.startswith('http'):
-                            link = f"https://www.yiwugo.com{link}"
-                            
-                        sources.append({
-                            "platform": "YiwuGo",
-                            "search_term": keyword,
-                            "title": title.strip(),
-                            "price": price.strip(),
-                            "supplier": company.strip(),
-                            "link": link
-                        })
-                    except Exception as e:
-                        continue
-                        
-                logger.info(f"成功在义乌购找到 {len(sources)} 个货源")
-                return sources
-                
-            except Exception as e:
-                logger.error(f"义乌购 搜索出错: {e}")
-                return []
-            finally:
-                await browser.close()
+            # 一次 evaluate 提取全部商品项（原先每个字段一次 CDP 往返）
+            with span("extraction") as sp:
+                sources = await page.evaluate(YIWUGO_EXTRACT_JS, {"limit": limit, "keyword": keyword})
+                sp.set(items=len(sources))
+            normalize_records(sources, currency="CNY")
+                    
+            logger.info(f"成功在义乌购找到 {len(sources)} 个货源")
+            return sources
+            
+        except ReplayMiss as e:
+            logger.warning(f"义乌购 回放缓存未命中: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"义乌购 搜索出错: {e}")
+            return []
+        finally:
+            if page:
+                await page.close()
 
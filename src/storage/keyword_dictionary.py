@@ -0,0 +1,150 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    source      TEXT PRIMARY KEY,
+    normalized  TEXT NOT NULL,
+    target      TEXT NOT NULL,
+    origin      TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_terms_normalized ON terms(normalized);
+"""
+
+# 内置词条（原 Translator.mock_dict），LLM 不可用时仍能覆盖演示关键词
+SEED_TERMS = {
+    "yoga mat": "瑜伽垫",
+    "running shoes": "跑步鞋",
+    "wireless earbuds": "无线耳机",
+    "water bottle": "水杯",
+    "phone case": "手机壳",
+}
+
+_NON_WORD_RE = re.compile(r"[^\w]+", re.U)
+
+
+def _singular(token: str) -> str:
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def normalize_keyword(text: str) -> str:
+    """
+    归一化：小写、去标点、合并空白、简单去复数
+    例如 "Yoga-Mats " -> "yoga mat"
+    """
+    tokens = _NON_WORD_RE.sub(" ", text.lower().replace("_", " ")).split()
+    return " ".join(_singular(t) for t in tokens)
+
+
+def exact_key(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class KeywordDictionary:
+    """
+    英 -> 中 关键词词典 (SQLite)，随 LLM 翻译结果持续增长。
+    查找顺序：精确 (大小写/空白无关) -> 归一化 -> 最长子短语（均走索引，不做线性扫描）。
+    """
+    _shared: Optional["KeywordDictionary"] = None
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or Config.KEYWORD_DICT_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"exact": 0, "normalized": 0, "partial": 0, "misses": 0, "stores": 0}
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.add(SEED_TERMS, origin="seed", replace=False)
+
+    @classmethod
+    def shared(cls) -> "KeywordDictionary":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def add(self, terms: Dict[str, str], origin: str = "llm", replace: bool = True) -> int:
+        """写入一批词条（单个事务）；replace=False 时不覆盖已有词条"""
+        now = time.time()
+        rows = [(exact_key(src), normalize_keyword(src), dst.strip(), origin, now)
+                for src, dst in terms.items() if src.strip() and dst and dst.strip()]
+        if not rows:
+            return 0
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        with self._lock, self.conn:
+            self.conn.executemany(f"{verb} INTO terms (source, normalized, target, origin, created_at) VALUES (?, ?, ?, ?, ?)", rows)
+        self.stats["stores"] += len(rows)
+        return len(rows)
+
+    def _find(self, column: str, value: str) -> Optional[Tuple[str, str]]:
+        row = self.conn.execute(f"SELECT source, target FROM terms WHERE {column} = ? LIMIT 1", (value,)).fetchone()
+        if row is not None:
+            self.conn.execute("UPDATE terms SET hits = hits + 1 WHERE source = ?", (row[0],))
+        return row
+
+    def lookup(self, text: str, partial: bool = False) -> Optional[str]:
+        """
+        :param partial: 精确/归一化均未命中时，按最长子短语匹配（例如 "yoga mat for kids" -> "瑜伽垫"）
+        """
+        normalized = normalize_keyword(text)
+        with self._lock, self.conn:
+            row = self._find("source", exact_key(text))
+            if row is not None:
+                self.stats["exact"] += 1
+                return row[1]
+            if normalized:
+                row = self._find("normalized", normalized)
+                if row is not None:
+                    self.stats["normalized"] += 1
+                    return row[1]
+            if partial:
+                for phrase in _sub_phrases(normalized):
+                    row = self._find("normalized", phrase)
+                    if row is not None:
+                        self.stats["partial"] += 1
+                        return row[1]
+        self.stats["misses"] += 1
+        return None
+
+    def lookup_many(self, texts: Iterable[str]) -> Dict[str, str]:
+        """批量查找（精确 + 归一化），返回命中的 原文 -> 译文"""
+        found = {}
+        for text in texts:
+            target = self.lookup(text)
+            if target is not None:
+                found[text] = target
+        return found
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def _sub_phrases(normalized: str) -> List[str]:
+    """按长度降序列出所有连续子短语（不含整句本身）"""
+    tokens = normalized.split()
+    phrases = []
+    for size in range(len(tokens) - 1, 0, -1):
+        for start in range(len(tokens) - size + 1):
+            phrases.append(" ".join(tokens[start:start + size]))
+    return phrases
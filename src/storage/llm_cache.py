@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key         TEXT PRIMARY KEY,
+    model       TEXT,
+    response    TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    expires_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_completions_accessed ON completions(accessed_at);
+"""
+
+
+def completion_key(model: str, system_prompt: str, prompt: str, temperature: float) -> str:
+    """内容寻址键：模型 + 系统提示词 + 用户提示词 + temperature 的 SHA-256"""
+    payload = json.dumps([model, system_prompt, prompt, round(float(temperature), 4)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    LLM 回复的本地缓存 (SQLite) + 进程内 LRU。
+    - 键为 completion_key()，同一提示词重复运行不再请求接口；
+    - 每条记录有独立过期时间（翻译结果几乎不变，可用更长的 TTL）；
+    - 条目数超过上限时按最近访问时间 (LRU) 淘汰；
+    - 热点条目（如关键词翻译）留在内存中，命中时不访问磁盘。
+    只缓存成功的回复，失败结果不落盘。
+    """
+    _shared: Optional["LLMCache"] = None
+
+    def __init__(self, db_path: Optional[str] = None, ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None, memory_entries: int = 512):
+        self.db_path = db_path or Config.LLM_CACHE_PATH
+        self.ttl = ttl if ttl is not None else Config.LLM_CACHE_TTL
+        self.max_entries = max_entries if max_entries is not None else Config.LLM_CACHE_MAX_ENTRIES
+        self.memory_entries = memory_entries
+        self.stats: Dict[str, int] = {"hits": 0, "memory_hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0}
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    @classmethod
+    def shared(cls) -> "LLMCache":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    @property
+    def enabled(self) -> bool:
+        return Config.LLM_CACHE_ENABLED
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def _remember(self, key: str, response: str, expires_at: float):
+        self._memory[key] = (response, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and cached[1] > now:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return cached[0]
+            self._memory.pop(key, None)
+
+            row = self.conn.execute("SELECT response, expires_at FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self.stats["expired"] += 1
+                    with self.conn:
+                        self.conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self.stats["misses"] += 1
+                return None
+            with self.conn:
+                # LRU: 刷新最近访问时间
+                self.conn.execute("UPDATE completions SET accessed_at = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self._remember(key, row[0], row[1])
+            self.stats["hits"] += 1
+            return row[0]
+
+    def put(self, key: str, response: str, model: Optional[str] = None, ttl: Optional[float] = None):
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO completions (key, model, response, created_at, expires_at, accessed_at, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (key, model, response, now, expires_at, now),
+                )
+            self._remember(key, response, expires_at)
+            self.stats["stores"] += 1
+            self._evict(now)
+
+    def _evict(self, now: float):
+        with self.conn:
+            self.stats["expired"] += self.conn.execute("DELETE FROM completions WHERE expires_at <= ?", (now,)).rowcount
+            count = self.conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+            if count <= self.max_entries:
+                return
+            # 淘汰到上限的 90%，避免每次写入都触发淘汰
+            excess = count - int(self.max_entries * 0.9)
+            removed = self.conn.execute(
+                "DELETE FROM completions WHERE key IN (SELECT key FROM completions ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            ).rowcount
+        self.stats["evictions"] += removed
+        # 内存层只是磁盘的子集，淘汰后整体清空，下次命中时按需重新载入
+        self._memory.clear()
+
+    def clear(self):
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM completions")
+            self._memory.clear()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
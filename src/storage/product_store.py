@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    platform    TEXT NOT NULL,
+    product_key TEXT NOT NULL,
+    keyword     TEXT,
+    title       TEXT,
+    price       TEXT,
+    link        TEXT,
+    first_seen  REAL NOT NULL,
+    last_seen   REAL NOT NULL,
+    data        TEXT NOT NULL,
+    PRIMARY KEY (platform, product_key)
+);
+CREATE INDEX IF NOT EXISTS idx_products_keyword ON products(keyword, platform);
+CREATE INDEX IF NOT EXISTS idx_products_last_seen ON products(last_seen);
+
+CREATE TABLE IF NOT EXISTS observations (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    platform    TEXT NOT NULL,
+    product_key TEXT NOT NULL,
+    keyword     TEXT,
+    crawled_at  REAL NOT NULL,
+    price       TEXT,
+    sold        TEXT,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_obs_keyword ON observations(keyword, crawled_at);
+CREATE INDEX IF NOT EXISTS idx_obs_platform ON observations(platform, crawled_at);
+CREATE INDEX IF NOT EXISTS idx_obs_product ON observations(platform, product_key, crawled_at);
+"""
+
+UPSERT_SQL = """
+INSERT INTO products (platform, product_key, keyword, title, price, link, first_seen, last_seen, data)
+VALUES (:platform, :product_key, :keyword, :title, :price, :link, :crawled_at, :crawled_at, :data)
+ON CONFLICT(platform, product_key) DO UPDATE SET
+    keyword   = excluded.keyword,
+    title     = excluded.title,
+    price     = excluded.price,
+    link      = excluded.link,
+    last_seen = excluded.last_seen,
+    data      = excluded.data
+"""
+
+OBSERVATION_SQL = """
+INSERT INTO observations (platform, product_key, keyword, crawled_at, price, sold, data)
+VALUES (:platform, :product_key, :keyword, :crawled_at, :price, :sold, :data)
+"""
+
+
+def normalize_link(link: str) -> str:
+    """
+    链接规范化：协议与域名小写、查询参数按名称排序，保留查询参数与片段
+    （商品 ID 可能在查询参数中，TikTok 热榜按 #rank-N 区分卡片）
+    """
+    parts = urlparse(link.strip())
+    query = urlencode(sorted(parse_qs(parts.query, keep_blank_values=True).items()), doseq=True)
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.params, query, parts.fragment))
+
+
+def natural_key(record: Dict[str, Any]) -> Optional[str]:
+    """
+    商品自然键：ASIN > goods_id > 规范化的完整链接 > 标题哈希；既无链接也无标题时返回 None（不入库）
+    """
+    if record.get("asin"):
+        return f"asin:{record['asin']}"
+    link = record.get("product_url") or record.get("link") or ""
+    if link:
+        goods_id = parse_qs(urlparse(link).query).get("goods_id")
+        if goods_id:
+            return f"goods_id:{goods_id[0]}"
+        return f"url:{normalize_link(link)}"
+    title = str(record.get("title") or "")
+    if not title:
+        return None
+    return "title:" + hashlib.sha1(title.encode("utf-8")).hexdigest()[:16]
+
+
+class ProductStore:
+    """
+    嵌入式商品库 (SQLite)。
+    - products:     每个 (平台, 自然键) 一行，重复抓取时 upsert 为最新状态；
+    - observations: 只追加的抓取历史，用于价格/销量趋势；
+    - keyword / platform / 抓取时间 均有索引，写入代价与历史数据量无关。
+    """
+    _shared: Optional["ProductStore"] = None
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or Config.PRODUCT_STORE_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    @classmethod
+    def shared(cls) -> "ProductStore":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def upsert(self, records: Iterable[Dict[str, Any]], platform: Optional[str] = None) -> int:
+        """
+        写入一批商品（单个事务）
+        :param platform: 记录中没有 platform 字段时使用
+        :return: 写入条数
+        """
+        now = time.time()
+        rows = []
+        skipped = 0
+        for record in records:
+            key = natural_key(record)
+            if key is None:
+                skipped += 1
+                continue
+            rows.append({
+                "platform": record.get("platform") or platform or "unknown",
+                "product_key": key,
+                "keyword": record.get("keyword") or record.get("search_term"),
+                "title": record.get("title"),
+                "price": None if record.get("price") is None else str(record.get("price")),
+                "sold": None if record.get("sold") is None else str(record.get("sold")),
+                "link": record.get("product_url") or record.get("link"),
+                "crawled_at": now,
+                "data": json.dumps(record, ensure_ascii=False, default=str),
+            })
+        if skipped:
+            logger.warning(f"{skipped} 条记录既无链接也无标题，未写入商品库")
+        if not rows:
+            return 0
+        with self._lock, self.conn:
+            self.conn.executemany(UPSERT_SQL, rows)
+            self.conn.executemany(OBSERVATION_SQL, rows)
+        return len(rows)
+
+    def query(self, keyword: Optional[str] = None, platform: Optional[str] = None,
+              since: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """按关键词 / 平台 / 最近抓取时间查询最新商品状态"""
+        sql = "SELECT data FROM products WHERE 1=1"
+        params: List[Any] = []
+        if keyword is not None:
+            sql += " AND keyword = ?"
+            params.append(keyword)
+        if platform is not None:
+            sql += " AND platform = ?"
+            params.append(platform)
+        if since is not None:
+            sql += " AND last_seen >= ?"
+            params.append(since)
+        sql += " ORDER BY last_seen DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [json.loads(row["data"]) for row in self.conn.execute(sql, params)]
+
+    def history(self, platform: str, product_key: str) -> List[Dict[str, Any]]:
+        """单个商品的抓取历史（按时间升序）"""
+        sql = ("SELECT crawled_at, keyword, price, sold FROM observations "
+               "WHERE platform = ? AND product_key = ? ORDER BY crawled_at")
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, (platform, product_key))]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -1,42 +1,224 @@
-from openai import OpenAI
-from src.config import Config
+import asyncio
 import logging
+import random
+import time
+from typing import AsyncIterator, Optional
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from src.config import Config
+from src.storage.llm_cache import LLMCache, completion_key
+from src.utils.telemetry import span
 
 logger = logging.getLogger(__name__)
 
+# 可重试的错误：超时 / 连接失败 / 限流 (429) / 服务端 5xx；鉴权、参数错误直接失败
+RETRYABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+# 调用失败 / 未配置时代替回复文本返回的占位内容（调用方据此区分真实回复，见 is_error_reply）
+ERROR_REPLY_PREFIX = "Error calling LLM:"
+NOT_CONFIGURED_REPLY = "Error: LLM not configured"
+
+
+def is_error_reply(text: str) -> bool:
+    return text.startswith((ERROR_REPLY_PREFIX, NOT_CONFIGURED_REPLY))
+
+
 class LLMClient:
-    def __init__(self):
-        self.client = None
-        if Config.LLM_API_KEY:
-            try:
-                self.client = OpenAI(
-                    api_key=Config.LLM_API_KEY,
-                    base_url=Config.LLM_BASE_URL
-                )
-                logger.info(f"LLM Client 初始化成功 (Model: {Config.LLM_MODEL})")
-            except Exception as e:
-                logger.error(f"LLM Client 初始化失败: {e}")
+    """
+    异步 LLM 客户端 (OpenAI 兼容接口)。
+    - 全进程共用一个实例 (shared())，翻译 / 分析共享同一个 httpx 连接池；
+    - Semaphore 限制同时在途的请求数，批量模式下多个关键词的调用排队而不是一起打爆接口；
+    - 每次请求独立超时，超时 / 连接失败 / 429 / 5xx 按指数退避 + 抖动重试；
+    - 成功的回复写入 LLMCache，相同请求直接由缓存返回（不占并发名额，不产生 llm_call span）。
+    httpx 连接池与 Semaphore 绑定事件循环：首次请求时创建，在新的事件循环中使用时关闭旧连接池后重建。
+    """
+    _shared: Optional["LLMClient"] = None
+
+    def __init__(self, concurrency: Optional[int] = None, timeout: Optional[float] = None, max_retries: Optional[int] = None):
+        self.concurrency = concurrency or Config.LLM_CONCURRENCY
+        self.timeout = timeout or Config.LLM_TIMEOUT
+        self.max_retries = Config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.client: Optional[AsyncOpenAI] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"calls": 0, "retries": 0, "failures": 0}
+        # 是否配置了 LLM（调用方据此决定是否启用 AI 功能）；连接池在首次请求时才创建
+        self.enabled = bool(Config.LLM_API_KEY)
+        if self.enabled:
+            logger.info(f"LLM Client 已配置 (Model: {Config.LLM_MODEL}, 并发上限 {self.concurrency})")
         else:
             logger.warning("未配置 LLM_API_KEY，AI 功能将不可用。")
 
-    def get_completion(self, prompt: str, system_prompt: str = "You are a helpful assistant.") -> str:
+    @classmethod
+    def shared(cls) -> "LLMClient":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _connect(self):
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            timeout=httpx.Timeout(self.timeout, connect=min(10.0, self.timeout)),
+        )
+        # 重试由本类统一处理（带日志与统计），关闭 SDK 自带的重试
+        self.client = AsyncOpenAI(
+            api_key=Config.LLM_API_KEY,
+            base_url=Config.LLM_BASE_URL,
+            http_client=self._http,
+            max_retries=0,
+        )
+
+    async def _bind_loop(self) -> asyncio.Semaphore:
+        """首次请求、aclose() 之后或事件循环变化时（重新）创建连接池与 Semaphore，旧连接池先关闭"""
+        loop = asyncio.get_running_loop()
+        if self.client is None or self._loop is not loop:
+            await self._close_http()
+            self._connect()
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def _close_http(self):
+        http, self._http, self.client = self._http, None, None
+        if http is not None:
+            try:
+                await http.aclose()
+            except Exception as e:
+                logger.warning(f"关闭 LLM 连接池失败: {e}")
+
+    @property
+    def cache(self) -> Optional[LLMCache]:
+        if not Config.LLM_CACHE_ENABLED:
+            return None
+        try:
+            return LLMCache.shared()
+        except Exception as e:
+            logger.warning(f"LLM 缓存不可用，直接请求接口: {e}")
+            Config.LLM_CACHE_ENABLED = False
+            return None
+
+    async def get_completion(self, prompt: str, system_prompt: str = "You are a helpful assistant.",
+                             temperature: float = 0.7, cache_ttl: Optional[float] = None, bypass_cache: bool = False,
+                             json_mode: bool = False) -> str:
         """
         调用 LLM 获取回复
+        :param json_mode: 要求模型返回 JSON 对象 (response_format=json_object)，提示词中需说明输出结构
+        :param cache_ttl: 本条回复的缓存有效期(秒)，默认 Config.LLM_CACHE_TTL
+        :param bypass_cache: 跳过缓存读取强制请求接口（结果仍会写回缓存）
         """
-        if not self.client:
-            return "Error: LLM not configured"
+        if not self.enabled:
+            return NOT_CONFIGURED_REPLY
+
+        cache = self.cache
+        key = completion_key(Config.LLM_MODEL, system_prompt, prompt, temperature)
+        if cache is not None and not (bypass_cache or Config.LLM_CACHE_REFRESH):
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
 
         try:
-            response = self.client.chat.completions.create(
-                model=Config.LLM_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
+            semaphore = await self._bind_loop()
+            with span("llm_call", model=Config.LLM_MODEL) as sp:
+                async with semaphore:
+                    extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+                    response = await self._create_with_retry(prompt, system_prompt, temperature, sp, **extra)
+                if response.usage:
+                    sp.set(prompt_tokens=response.usage.prompt_tokens, completion_tokens=response.usage.completion_tokens)
+            content = response.choices[0].message.content.strip()
         except Exception as e:
+            self.stats["failures"] += 1
             logger.error(f"LLM 调用失败: {e}")
-            return f"Error calling LLM: {str(e)}"
+            return f"{ERROR_REPLY_PREFIX} {str(e)}"
+
+        self._store(cache, key, content, cache_ttl)
+        return content
+
+    async def stream_completion(self, prompt: str, system_prompt: str = "You are a helpful assistant.",
+                                temperature: float = 0.7, cache_ttl: Optional[float] = None,
+                                bypass_cache: bool = False) -> AsyncIterator[str]:
+        """
+        流式调用 LLM，逐段产出回复文本 (stream=True)
+        缓存命中时一次性产出完整回复；完整回复在流结束后写入缓存。
+        只在收到第一段文本之前重试，已输出部分内容后中断则保留已输出的部分。
+        """
+        if not self.enabled:
+            yield NOT_CONFIGURED_REPLY
+            return
+
+        cache = self.cache
+        key = completion_key(Config.LLM_MODEL, system_prompt, prompt, temperature)
+        if cache is not None and not (bypass_cache or Config.LLM_CACHE_REFRESH):
+            cached = cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        try:
+            semaphore = await self._bind_loop()
+            with span("llm_call", model=Config.LLM_MODEL, stream=True) as sp:
+                async with semaphore:
+                    start = time.perf_counter()
+                    stream = await self._create_with_retry(prompt, system_prompt, temperature, sp, stream=True)
+                    async for event in stream:
+                        delta = event.choices[0].delta.content if event.choices else None
+                        if not delta:
+                            continue
+                        if not chunks:
+                            sp.set(first_token_seconds=round(time.perf_counter() - start, 3))
+                        chunks.append(delta)
+                        yield delta
+                sp.set(chunks=len(chunks))
+        except Exception as e:
+            self.stats["failures"] += 1
+            logger.error(f"LLM 流式调用失败 (已接收 {len(chunks)} 段): {e}")
+            if not chunks:
+                yield f"{ERROR_REPLY_PREFIX} {str(e)}"
+            return
+
+        self._store(cache, key, "".join(chunks).strip(), cache_ttl)
+
+    @staticmethod
+    def _store(cache: Optional[LLMCache], key: str, content: str, ttl: Optional[float]):
+        if cache is None or not content:
+            return
+        try:
+            cache.put(key, content, model=Config.LLM_MODEL, ttl=ttl)
+        except Exception as e:
+            logger.warning(f"写入 LLM 缓存失败: {e}")
+
+    async def _create_with_retry(self, prompt: str, system_prompt: str, temperature: float, sp, **extra):
+        for attempt in range(self.max_retries + 1):
+            self.stats["calls"] += 1
+            sp.set(attempts=attempt + 1)
+            try:
+                return await self.client.chat.completions.create(
+                    model=Config.LLM_MODEL,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=temperature,
+                    timeout=self.timeout,
+                    **extra,
+                )
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = Config.LLM_RETRY_BACKOFF * (2 ** attempt) + random.uniform(0, Config.LLM_RETRY_BACKOFF)
+                self.stats["retries"] += 1
+                logger.warning(f"LLM 请求失败 ({type(e).__name__})，{delay:.1f}s 后第 {attempt + 1} 次重试")
+                await asyncio.sleep(delay)
 
+    async def aclose(self):
+        """关闭连接池；之后再次请求时在当前事件循环中重新创建"""
+        await self._close_http()
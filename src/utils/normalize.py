@@ -0,0 +1,307 @@
+import json
+import logging
+import math
+import os
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Union
+
+from src.config import Config
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 内置汇率（粗略值，1 USD = x 单位货币）；可用 Config.FX_TABLE_PATH 指向的本地 JSON 覆盖/补充
+DEFAULT_FX = {
+    "base": "USD",
+    "rates": {
+        "USD": 1.0, "CNY": 7.2, "EUR": 0.92, "GBP": 0.79, "JPY": 150.0, "KRW": 1350.0,
+        "HKD": 7.8, "TWD": 32.0, "SGD": 1.35, "MYR": 4.7, "THB": 36.0, "IDR": 16000.0,
+        "VND": 25000.0, "PHP": 57.0, "AUD": 1.52, "CAD": 1.36, "BRL": 5.0, "MXN": 17.0,
+    },
+}
+
+# 货币符号 -> ISO 代码（按顺序匹配，长的前缀在前；"$" / "¥" 有歧义，单独按平台默认货币判断）
+CURRENCY_SYMBOLS = [
+    ("US$", "USD"), ("US $", "USD"), ("SG$", "SGD"), ("S$", "SGD"), ("NT$", "TWD"), ("HK$", "HKD"),
+    ("A$", "AUD"), ("C$", "CAD"), ("R$", "BRL"), ("RM", "MYR"), ("Rp", "IDR"), ("RMB", "CNY"),
+    ("₱", "PHP"), ("฿", "THB"), ("₫", "VND"), ("€", "EUR"), ("£", "GBP"), ("₩", "KRW"),
+    ("元", "CNY"), ("円", "JPY"),
+]
+_DOLLARS = {"USD", "SGD", "TWD", "HKD", "AUD", "CAD", "MXN"}
+# 这些货币通常没有小数位，"1.234" 是千分位而不是小数
+_ZERO_DECIMAL = {"IDR", "VND", "KRW", "JPY"}
+# 国内供应链平台默认人民币，其余平台默认美元
+_CNY_PLATFORMS = ("1688", "yiwugo", "义乌购")
+
+_NUMBER_RE = re.compile(r"\d[\d,.]*")
+_ISO_RE = re.compile(r"\b([A-Z]{3})\b")
+_RANGE_SEP_RE = re.compile(r"[-–—~～至]|\bto\b", re.I)
+# 英文单位字母后面不能紧跟字母（"12 watching"、"3 months" 中的 w / m 不是单位），中文单位不限
+_COUNT_RE = re.compile(r"(\d[\d,.]*)\s*([kKmMwW](?![A-Za-z])|[千万亿])?")
+_COUNT_UNITS = {"": 1, "k": 1e3, "千": 1e3, "w": 1e4, "万": 1e4, "m": 1e6, "亿": 1e8}
+
+NAN = float("nan")
+
+
+class PriceQuote(NamedTuple):
+    """一条原始价格解析后的结果；无法解析时 low/high 为 NaN"""
+    low: float
+    high: float
+    currency: str
+
+
+class FxTable:
+    """
+    汇率表：统一换算为人民币 (CNY)。
+    文件格式与常见汇率接口一致：{"base": "USD", "rates": {"CNY": 7.2, "EUR": 0.92, ...}}，
+    即 1 单位 base = rates[x] 单位 x；文件中的币种覆盖内置值，未列出的沿用内置值。
+    """
+    _shared: Optional["FxTable"] = None
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path if path is not None else Config.FX_TABLE_PATH
+        self.cny_per_unit: Dict[str, float] = {}
+        self._load(DEFAULT_FX)
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._load(json.load(f))
+                logger.info(f"已加载汇率表: {self.path}")
+            except (OSError, ValueError) as e:
+                logger.warning(f"汇率表 {self.path} 读取失败，使用内置汇率: {e}")
+
+    @classmethod
+    def shared(cls) -> "FxTable":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def _load(self, table: Dict[str, Any]):
+        base = str(table.get("base", "USD")).upper()
+        rates = {str(k).upper(): float(v) for k, v in table.get("rates", {}).items() if v}
+        rates[base] = 1.0
+        if "CNY" in rates:
+            cny_per_base = rates["CNY"]
+        elif base in self.cny_per_unit:
+            cny_per_base = self.cny_per_unit[base]
+        else:
+            raise ValueError(f"汇率表缺少 CNY 且基准货币 {base} 未知")
+        self.cny_per_unit.update({code: cny_per_base / rate for code, rate in rates.items()})
+
+    def rate(self, currency: str, to: str = "CNY") -> float:
+        """1 单位 currency 折合多少 to；未知币种返回 NaN"""
+        src, dst = self.cny_per_unit.get(currency), self.cny_per_unit.get(to)
+        return src / dst if src and dst else NAN
+
+    def convert(self, amount: float, currency: str, to: str = "CNY") -> float:
+        return amount * self.rate(currency, to)
+
+
+def platform_currency(platform: Optional[str]) -> str:
+    """原始价格不带货币符号时按平台推断：1688 / 义乌购为人民币，其余为美元"""
+    name = (platform or "").lower()
+    return "CNY" if any(p in name for p in _CNY_PLATFORMS) else "USD"
+
+
+def _detect_currency(text: str, default: str) -> str:
+    for symbol, code in CURRENCY_SYMBOLS:
+        if symbol in text:
+            return code
+    match = _ISO_RE.search(text)
+    if match and match.group(1) in FxTable.shared().cny_per_unit:
+        return match.group(1)
+    if "¥" in text or "￥" in text:
+        return "JPY" if default == "JPY" else "CNY"
+    if "$" in text:
+        return default if default in _DOLLARS else "USD"
+    return default
+
+
+def _to_number(token: str, grouped: bool = False) -> float:
+    """
+    "1,299.00" / "12,99" / "1.234.567" -> float。
+    逗号与点同时出现时靠后的为小数点；只有逗号时恰好 3 位的分组视为千分位 ("12,99" 为欧式小数)，
+    只有点时多个点才视为千分位 ("1.234.567")。
+    :param grouped: 只可能是整数（销量、零小数货币），分隔符一律视为千分位
+    """
+    token = token.rstrip(".,")
+    if "," in token and "." in token:
+        decimal = "." if token.rfind(".") > token.rfind(",") else ","
+        token = token.replace("," if decimal == "." else ".", "").replace(",", ".")
+    else:
+        for sep in (",", "."):
+            if sep not in token:
+                continue
+            groups = token.split(sep)
+            if grouped or len(groups) > 2 or (sep == "," and len(groups[-1]) == 3):
+                token = token.replace(sep, "")
+            else:
+                token = token.replace(sep, ".")
+    try:
+        return float(token)
+    except ValueError:
+        return NAN
+
+
+@lru_cache(maxsize=65536)
+def parse_price(raw: Any, currency: str = "USD") -> PriceQuote:
+    """
+    解析单个原始价格（结果按 (原始值, 默认货币) 缓存）：
+    "$12.99" / "US $1,299.00" / "¥1.5-3.0" / "$10.99 - $15.99" / "RM12.90" / "12,99 €" / "1.2万"
+    区间价返回 (最低, 最高)，单价 low == high；"N/A"、空串等返回 NaN。
+    :param currency: 原始文本没有货币符号时使用的货币
+    """
+    if raw is None or (isinstance(raw, float) and math.isnan(raw)):
+        return PriceQuote(NAN, NAN, currency)
+    if isinstance(raw, (int, float)):
+        return PriceQuote(float(raw), float(raw), currency)
+    text = str(raw).strip()
+    code = _detect_currency(text, currency)
+    matches = list(_NUMBER_RE.finditer(text))
+    if not matches:
+        return PriceQuote(NAN, NAN, code)
+    grouped = code in _ZERO_DECIMAL
+    low = _to_number(matches[0].group(), grouped)
+    high = low
+    if len(matches) > 1:
+        gap = text[matches[0].end():matches[1].start()]
+        if len(gap) <= 8 and _RANGE_SEP_RE.search(gap):
+            high = _to_number(matches[1].group(), grouped)
+    if "万" in text[matches[0].end():matches[0].end() + 2]:
+        low, high = low * 1e4, high * 1e4
+    if high < low:
+        low, high = high, low
+    return PriceQuote(low, high, code)
+
+
+@lru_cache(maxsize=65536)
+def parse_count(raw: Any) -> Optional[int]:
+    """销量/评论数："1.2K+" -> 1200, "10k+ sold" -> 10000, "2.3万" -> 23000, "(1,234)" -> 1234；无法解析返回 None"""
+    if raw is None or (isinstance(raw, float) and math.isnan(raw)):
+        return None
+    if isinstance(raw, (int, float)):
+        return int(raw)
+    match = _COUNT_RE.search(str(raw))
+    if not match:
+        return None
+    unit = (match.group(2) or "").lower()
+    value = _to_number(match.group(1), grouped=not unit)
+    return None if math.isnan(value) else int(round(value * _COUNT_UNITS[unit]))
+
+
+@lru_cache(maxsize=4096)
+def parse_rating(raw: Any) -> Optional[float]:
+    """评分："4.5 out of 5 stars" -> 4.5；无法解析返回 None"""
+    if raw is None:
+        return None
+    match = _NUMBER_RE.search(str(raw))
+    if not match:
+        return None
+    value = _to_number(match.group())
+    return None if math.isnan(value) or value > 5 else value
+
+
+def _clean(value: float) -> Optional[float]:
+    return None if math.isnan(value) else round(value, 4)
+
+
+def normalize_record(record: Dict[str, Any], currency: Optional[str] = None) -> Dict[str, Any]:
+    """
+    给单条记录附加归一化字段（原地修改并返回），原始字段保持不变：
+    - price_min / price_max / currency / price_cny / price_usd (区间价按最低价折算)
+    - sold_count / review_count / rating_value
+    """
+    if "price" in record:
+        quote = parse_price(record["price"], currency or platform_currency(record.get("platform")))
+        fx = FxTable.shared()
+        record["price_min"] = _clean(quote.low)
+        record["price_max"] = _clean(quote.high)
+        record["currency"] = quote.currency
+        record["price_cny"] = _clean(quote.low * fx.rate(quote.currency, "CNY"))
+        record["price_usd"] = _clean(quote.low * fx.rate(quote.currency, "USD"))
+    if "sold" in record:
+        record["sold_count"] = parse_count(record["sold"])
+    if "reviews_count" in record:
+        record["review_count"] = parse_count(record["reviews_count"])
+    if "rating" in record:
+        record["rating_value"] = parse_rating(record["rating"])
+    return record
+
+
+def normalize_records(records: List[Dict[str, Any]], currency: Optional[str] = None) -> List[Dict[str, Any]]:
+    """采集入库时调用：逐条附加归一化字段，重复的原始字符串走缓存"""
+    for record in records:
+        normalize_record(record, currency)
+    return records
+
+
+def price_columns(values: Iterable[Any], currencies: Union[Iterable[str], "pd.Categorical"],
+                  fields: Optional[Iterable[str]] = None) -> Dict[str, "np.ndarray"]:
+    """
+    向量化解析一整列原始价格：按 (原始值, 默认货币) 去重，每个不同取值只解析一次，再按 code 展开。
+    返回 price_min / price_max / price_cny / price_usd (float64，无法解析为 NaN) 与 currency (object)。
+    :param currencies: 每行的默认货币；传入 Categorical 时直接使用其 codes，省去一次 factorize
+    :param fields: 只展开这些列（例如只要 price_cny），默认全部
+    """
+    # 爬虫入库只用到上面的标量解析，numpy / pandas 在需要整列解析时才导入
+    import numpy as np
+    import pandas as pd
+
+    values = values if isinstance(values, np.ndarray) else np.asarray(list(values), dtype=object)
+    value_codes, value_uniques = pd.factorize(values)
+    if isinstance(currencies, pd.Categorical):
+        currency_codes, currency_uniques = np.asarray(currencies.codes), currencies.categories
+    else:
+        currency_codes, currency_uniques = pd.factorize(
+            currencies if isinstance(currencies, np.ndarray) else np.asarray(list(currencies), dtype=object))
+    # 缺失值的 code 为 -1：统一映射到末尾追加的 None
+    value_codes = np.where(value_codes < 0, len(value_uniques), value_codes)
+    currency_codes = np.where(currency_codes < 0, len(currency_uniques), currency_codes)
+    value_uniques = list(value_uniques) + [None]
+    currency_uniques = list(currency_uniques) + ["USD"]
+
+    if len(currency_uniques) == 2 and (currency_codes == 0).all():
+        # 只有一种默认货币（例如全是销售端记录）：按取值去重即可
+        codes, value_index, currency_index = value_codes, range(len(value_uniques)), [0] * len(value_uniques)
+    else:
+        # (取值, 货币) 组合用哈希去重（factorize），比 np.unique 排序整列快
+        codes, pairs = pd.factorize(value_codes.astype("int64") * len(currency_uniques) + currency_codes)
+        value_index, currency_index = (part.tolist() for part in np.divmod(pairs, len(currency_uniques)))
+    quotes = [parse_price(value_uniques[v], currency_uniques[c]) for v, c in zip(value_index, currency_index)]
+    low, high, quote_currencies = zip(*quotes) if quotes else ((), (), ())
+    low, high = np.array(low, dtype="float64"), np.array(high, dtype="float64")
+    # 汇率按币种（通常只有一两种）查一次，再按 code 展开
+    fx = FxTable.shared()
+    quote_codes, names = pd.factorize(np.array(quote_currencies, dtype=object))
+    columns = {
+        "price_min": lambda: low,
+        "price_max": lambda: high,
+        "currency": lambda: np.asarray(names, dtype=object)[quote_codes],
+        "price_cny": lambda: low * np.array([fx.rate(n, "CNY") for n in names], dtype="float64")[quote_codes],
+        "price_usd": lambda: low * np.array([fx.rate(n, "USD") for n in names], dtype="float64")[quote_codes],
+    }
+    # 先在去重后的取值上算好，最后才按 code 展开到每一行
+    return {name: columns[name]()[codes] for name in (fields or columns)}
+
+
+def count_column(values: Iterable[Any]) -> "np.ndarray":
+    """向量化解析销量/评论数列 (float64，无法解析为 NaN)"""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values if isinstance(values, np.ndarray) else np.asarray(list(values), dtype=object))
+    parsed = [parse_count(u) for u in uniques]
+    counts = np.array([NAN if c is None else c for c in parsed] + [NAN], dtype="float64")
+    return counts[codes]
+
+
+def record_price_cny(record: Dict[str, Any]) -> Optional[float]:
+    """记录的人民币价格：优先使用入库时附加的 price_cny，旧数据现场解析"""
+    if "price_cny" in record:
+        return record["price_cny"]
+    quote = parse_price(record.get("price"), platform_currency(record.get("platform")))
+    return _clean(quote.low * FxTable.shared().rate(quote.currency, "CNY"))
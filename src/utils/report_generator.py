@@ -4,6 +4,16 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 import os
 from datetime import datetime
 from typing import List, Dict
+from src.utils.telemetry import traced
+
+class ReportDraft:
+    """start_report 生成的半成品文档及其待填位置"""
+    def __init__(self, keyword: str, doc, ai_paragraph, viz_paragraphs):
+        self.keyword = keyword
+        self.doc = doc
+        self.ai_paragraph = ai_paragraph
+        self.viz_paragraphs = viz_paragraphs
+
 
 class ReportGenerator:
     """
@@ -18,6 +28,15 @@ class ReportGenerator:
         """
         生成 Word 格式的深度分析报告
         """
+        draft = self.start_report(keyword, sales_data, sourcing_data, trend_data)
+        return self.finish_report(draft, analysis, viz_path)
+
+    @traced("docx_build")
+    def start_report(self, keyword: str, sales_data: List[Dict], sourcing_data: List[Dict], trend_data: List[Dict]) -> "ReportDraft":
+        """
+        先搭建不依赖 AI 点评与仪表盘的部分（标题、各数据表格），
+        AI 点评与仪表盘位置留空，可与 LLM 分析并行执行，由 finish_report 补齐。
+        """
         doc = Document()
         
         # 1. 标题
@@ -30,16 +49,17 @@ class ReportGenerator:
         run = p.add_run(f'分析关键词: {keyword}\n生成时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
         run.font.size = Pt(12)
 
-        # 3. 核心结论 (AI点评)
+        # 3. 核心结论 (AI点评)，内容待填
         doc.add_heading('一、 核心结论与 AI 策略建议', level=1)
-        doc.add_paragraph(analysis.get('ai_analysis', '暂无 AI 分析内容'))
+        ai_paragraph = doc.add_paragraph()
 
-        # 4. 数据仪表盘
-        if viz_path and os.path.exists(viz_path):
-            doc.add_heading('二、 数据可视化概览', level=1)
-            doc.add_picture(viz_path, width=Inches(6.0))
-            p = doc.add_paragraph('图表 1: 价格对比、利润空间及众筹热度分析')
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        # 4. 数据仪表盘，图片待填（无图时整节移除）
+        viz_paragraphs = [
+            doc.add_heading('二、 数据可视化概览', level=1),
+            doc.add_paragraph(),
+            doc.add_paragraph('图表 1: 价格对比、利润空间及众筹热度分析'),
+        ]
+        viz_paragraphs[2].alignment = WD_ALIGN_PARAGRAPH.CENTER
 
         # 5. 市场详情 (Amazon/AliExpress)
         doc.add_heading('三、 销售渠道详情 (Amazon / AliExpress)', level=1)
@@ -81,10 +101,21 @@ class ReportGenerator:
                 doc.add_paragraph(f"  - 已筹金额: {item.get('pledged', '')} ({item.get('percent_funded', '')} funded)")
                 doc.add_paragraph(f"  - 核心点: {item.get('description', '')}")
 
+        return ReportDraft(keyword, doc, ai_paragraph, viz_paragraphs)
+
+    @traced("docx_write")
+    def finish_report(self, draft: "ReportDraft", analysis: Dict, viz_path: str) -> str:
+        """填入 AI 点评与仪表盘图片并保存，返回文档路径"""
+        draft.ai_paragraph.add_run(analysis.get('ai_analysis', '暂无 AI 分析内容'))
+        if viz_path and os.path.exists(viz_path):
+            draft.viz_paragraphs[1].add_run().add_picture(viz_path, width=Inches(6.0))
+        else:
+            for p in draft.viz_paragraphs:
+                p._element.getparent().remove(p._element)
+
         # 保存文档
-        safe_keyword = keyword.replace(" ", "_")
+        safe_keyword = draft.keyword.replace(" ", "_")
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_path = os.path.join(self.output_dir, f"AnalysisReport_{safe_keyword}_{timestamp}.docx")
-        doc.save(report_path)
+        draft.doc.save(report_path)
         return report_path
-
@@ -0,0 +1,251 @@
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# 当前关键词 / 平台标签：在流水线入口和平台任务中设置，
+# asyncio 子任务与 asyncio.to_thread 会自动继承，下游 span 无需层层传参
+current_keyword: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_keyword", default=None)
+current_platform: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_platform", default=None)
+
+# Prometheus 直方图桶 (秒)
+BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300]
+
+
+class Span:
+    """
+    一段计时区间，可用于 with / async with。
+    退出时自动记录耗时与状态 (ok / error / timeout / cancelled)，异常照常抛出。
+    """
+    def __init__(self, tracer: "Tracer", name: str, platform: Optional[str] = None, keyword: Optional[str] = None, **attrs):
+        self.tracer = tracer
+        self.name = name
+        self.platform = platform if platform is not None else current_platform.get()
+        self.keyword = keyword if keyword is not None else current_keyword.get()
+        self.attrs: Dict[str, Any] = attrs
+        self.status = "ok"
+        self.start = 0.0
+        self.duration = 0.0
+        self._t0 = 0.0
+
+    def set(self, **attrs):
+        """补充属性，例如解析出的记录数"""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._t0
+        if exc_type is not None:
+            # 按类名判断，asyncio / Playwright 的超时异常都叫 TimeoutError
+            self.status = {"TimeoutError": "timeout", "CancelledError": "cancelled"}.get(exc_type.__name__, "error")
+            self.attrs.setdefault("error", exc_type.__name__)
+        self.tracer._record(self)
+        return False
+
+    async def __aenter__(self) -> "Span":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "platform": self.platform,
+            "keyword": self.keyword,
+            "start": self.start,
+            "duration": round(self.duration, 6),
+            "status": self.status,
+            "thread": threading.get_ident(),
+            "attrs": self.attrs,
+        }
+
+
+class Tracer:
+    """
+    进程内 span 收集器。
+    - span():         记录一个阶段 (浏览器启动 / 导航 / 验证码等待 / 选择器等待 / 滚动 / 解析 / 翻译 / LLM / 报告写入 ...)
+    - summary():      按阶段汇总次数与耗时
+    - export_json():  Chrome Trace Event 格式，可直接拖入 chrome://tracing 或 Perfetto 查看时间线
+    - export_prometheus(): node_exporter textfile 格式（按 stage / platform 聚合，不带 keyword 标签以控制基数）
+    """
+    _shared: Optional["Tracer"] = None
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "Tracer":
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def span(self, name: str, platform: Optional[str] = None, keyword: Optional[str] = None, **attrs) -> Span:
+        return Span(self, name, platform, keyword, **attrs)
+
+    def record(self, name: str, duration: float, start: Optional[float] = None, status: str = "ok",
+               platform: Optional[str] = None, keyword: Optional[str] = None, **attrs) -> Span:
+        """
+        记录一个已结束的区间（起止点不在同一个 with 块内时使用，例如流式回复的首段到达时间）
+        :param start: 开始时刻 (time.time())，默认按 duration 倒推
+        """
+        sp = Span(self, name, platform, keyword, **attrs)
+        sp.duration = duration
+        sp.start = start if start is not None else time.time() - duration
+        sp.status = status
+        self._record(sp)
+        return sp
+
+    def _record(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def reset(self):
+        with self._lock:
+            self.spans = []
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """阶段 -> {count, errors, total, mean, max}，按总耗时降序"""
+        with self._lock:
+            spans = list(self.spans)
+        stages: Dict[str, Dict[str, Any]] = {}
+        for s in spans:
+            st = stages.setdefault(s.name, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0})
+            st["count"] += 1
+            st["errors"] += s.status != "ok"
+            st["total"] += s.duration
+            st["max"] = max(st["max"], s.duration)
+        for st in stages.values():
+            st["mean"] = st["total"] / st["count"]
+        return dict(sorted(stages.items(), key=lambda kv: kv[1]["total"], reverse=True))
+
+    def export_json(self, path: str) -> str:
+        with self._lock:
+            spans = list(self.spans)
+        pid = os.getpid()
+        # 同一关键词的 span 放在同一条泳道 (tid)，泳道名为关键词
+        lanes: Dict[str, int] = {}
+        events = []
+        for s in spans:
+            lane = s.keyword or "main"
+            if lane not in lanes:
+                lanes[lane] = len(lanes) + 1
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": lanes[lane], "args": {"name": lane}})
+            label = " ".join(part for part in (s.name, s.platform) if part)
+            events.append({
+                "name": label,
+                "cat": s.name,
+                "ph": "X",
+                "ts": int(s.start * 1_000_000),
+                "dur": int(s.duration * 1_000_000),
+                "pid": pid,
+                "tid": lanes[lane],
+                "args": dict(s.attrs, platform=s.platform, keyword=s.keyword, status=s.status),
+            })
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms",
+                       "spans": [s.to_dict() for s in spans]}, f, ensure_ascii=False, default=str)
+        return path
+
+    def export_prometheus(self, path: str) -> str:
+        with self._lock:
+            spans = list(self.spans)
+        buckets: Dict[tuple, List[int]] = defaultdict(lambda: [0] * len(BUCKETS))
+        sums: Dict[tuple, float] = defaultdict(float)
+        counts: Dict[tuple, int] = defaultdict(int)
+        errors: Dict[tuple, int] = defaultdict(int)
+        for s in spans:
+            key = (s.name, s.platform or "")
+            sums[key] += s.duration
+            counts[key] += 1
+            if s.status != "ok":
+                errors[key] += 1
+            for i, bound in enumerate(BUCKETS):
+                if s.duration <= bound:
+                    buckets[key][i] += 1
+
+        def labels(key, **extra) -> str:
+            pairs = {"stage": key[0], "platform": key[1], **extra}
+            return ",".join(f'{k}="{_escape(v)}"' for k, v in pairs.items())
+
+        lines = [
+            "# HELP botsales_stage_duration_seconds Duration of pipeline stages.",
+            "# TYPE botsales_stage_duration_seconds histogram",
+        ]
+        for key in sorted(counts):
+            for bound, value in zip(BUCKETS, buckets[key]):
+                lines.append(f"botsales_stage_duration_seconds_bucket{{{labels(key, le=bound)}}} {value}")
+            lines.append(f"botsales_stage_duration_seconds_bucket{{{labels(key, le='+Inf')}}} {counts[key]}")
+            lines.append(f"botsales_stage_duration_seconds_sum{{{labels(key)}}} {sums[key]:.6f}")
+            lines.append(f"botsales_stage_duration_seconds_count{{{labels(key)}}} {counts[key]}")
+        lines += [
+            "# HELP botsales_stage_errors_total Pipeline stages that raised or were cancelled.",
+            "# TYPE botsales_stage_errors_total counter",
+        ]
+        for key in sorted(counts):
+            lines.append(f"botsales_stage_errors_total{{{labels(key)}}} {errors[key]}")
+        lines += [
+            "# HELP botsales_last_run_timestamp_seconds Time the metrics were exported.",
+            "# TYPE botsales_last_run_timestamp_seconds gauge",
+            f"botsales_last_run_timestamp_seconds {time.time():.0f}",
+        ]
+
+        # textfile collector 要求原子替换，先写临时文件再 rename
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+        return path
+
+    def export(self, directory: str, prom_path: Optional[str] = None) -> Dict[str, str]:
+        """导出 JSON trace 与 Prometheus textfile，返回两个文件路径"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return {
+            "trace": self.export_json(os.path.join(directory, f"trace_{timestamp}.json")),
+            "metrics": self.export_prometheus(prom_path or os.path.join(directory, "botsales.prom")),
+        }
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def span(name: str, platform: Optional[str] = None, keyword: Optional[str] = None, **attrs) -> Span:
+    """在共享 Tracer 上开启一个 span"""
+    return Tracer.shared().span(name, platform, keyword, **attrs)
+
+
+def record_span(name: str, duration: float, start: Optional[float] = None, status: str = "ok", **attrs) -> Span:
+    """在共享 Tracer 上记录一个已结束的区间"""
+    return Tracer.shared().record(name, duration, start, status, **attrs)
+
+
+def traced(name: str):
+    """把整个函数 / 协程记录为一个 span"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
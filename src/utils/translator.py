@@ -1,38 +1,133 @@
+import asyncio
+import json
+import re
+from src.config import Config
+from src.storage.keyword_dictionary import KeywordDictionary, exact_key, normalize_keyword
 from src.utils.llm_client import LLMClient
+from typing import Dict, Iterable, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+BATCH_PROMPT = """Please translate each of the following Amazon product keywords into a concise Chinese search term for 1688 sourcing.
+Return a JSON object whose keys are the original keywords exactly as given and whose values are the Chinese terms. No explanation.
+
+Keywords (JSON array):
+{keywords}"""
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.I)
+
+
 class Translator:
     """
-    智能翻译工具：优先使用 LLM，失败则回退到字典
+    智能翻译工具：词典优先，未收录的关键词批量交给 LLM，结果写回词典
+    - 查找顺序：词典精确 -> 词典归一化 -> LLM (一次请求翻译一批，JSON 输出) -> 词典子短语 -> 原词；
+    - 同一关键词正在被某个批次翻译时，单个查询直接等待该批次结果，不重复请求。
     """
-    def __init__(self):
-        self.llm = LLMClient()
-        self.mock_dict = {
-            "yoga mat": "瑜伽垫",
-            "running shoes": "跑步鞋",
-            "wireless earbuds": "无线耳机",
-            "water bottle": "水杯",
-            "phone case": "手机壳"
-        }
-    
-    def translate_to_chinese(self, text: str) -> str:
-        # 1. 尝试 LLM 翻译
-        if self.llm.client:
+    def __init__(self, llm: Optional[LLMClient] = None, dictionary: Optional[KeywordDictionary] = None):
+        # 默认使用进程共享的 LLMClient（同一个 HTTP 连接池与并发上限）
+        self.llm = llm or LLMClient.shared()
+        self.dictionary = dictionary or KeywordDictionary.shared()
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def translate_to_chinese(self, text: str) -> str:
+        return (await self.translate_many([text]))[text]
+
+    async def translate_many(self, texts: Iterable[str], batch_size: Optional[int] = None, head: int = 0) -> Dict[str, str]:
+        """
+        批量翻译，返回 原文 -> 中文 (无法翻译时为原文)
+        :param head: 前 head 个关键词单独成一个小批次先返回，批量模式下最先开始处理的关键词不必等待大批次
+        """
+        results: Dict[str, str] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        todo: Dict[str, List[str]] = {}  # 归一化键 -> 原文列表
+        seen = set()
+        for text in texts:
+            if text in seen:
+                continue
+            seen.add(text)
+            # 1. 词典 (精确 / 归一化)
+            target = self.dictionary.lookup(text)
+            if target is not None:
+                results[text] = target
+                continue
+            key = normalize_keyword(text) or exact_key(text)
+            if key in self._pending:
+                waiting[text] = self._pending[key]
+            else:
+                todo.setdefault(key, []).append(text)
+
+        # 2. LLM 批量翻译
+        if todo and self.llm.enabled:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in todo}
+            self._pending.update(futures)
+            translated: Dict[str, str] = {}
             try:
-                prompt = f"Please translate the following Amazon product keyword into a concise Chinese search term for 1688 sourcing. Only return the Chinese term, no explanation.\n\nKeyword: {text}"
-                result = self.llm.get_completion(prompt, system_prompt="You are a professional e-commerce sourcing assistant.")
-                if result and "Error" not in result:
-                    logger.info(f"LLM 翻译结果: {text} -> {result}")
-                    return result
-            except Exception as e:
-                logger.warning(f"LLM 翻译失败，回退到字典模式: {e}")
-
-        # 2. 回退到字典模式
-        text_lower = text.lower()
-        for k, v in self.mock_dict.items():
-            if k in text_lower:
-                return v
-        
-        return text
+                keys = list(todo)
+                size = max(1, batch_size or Config.TRANSLATION_BATCH_SIZE)
+                batches = [keys[:head]] if head else []
+                batches += [keys[i:i + size] for i in range(head, len(keys), size)]
+                batches = [batch for batch in batches if batch]
+                parts = await asyncio.gather(*(self._translate_batch([todo[k][0] for k in batch]) for batch in batches))
+                for part in parts:
+                    translated.update(part)
+                learned = {text: translated[key] for key, group in todo.items() if key in translated for text in group}
+                if learned:
+                    self.dictionary.add(learned)
+                    logger.info(f"LLM 翻译 {len(learned)} 个关键词 ({len(batches)} 次请求)")
+            finally:
+                for key, future in futures.items():
+                    self._pending.pop(key, None)
+                    if not future.done():
+                        future.set_result(translated.get(key))
+            for key, group in todo.items():
+                if key in translated:
+                    for text in group:
+                        results[text] = translated[key]
+
+        for text, future in waiting.items():
+            target = await future
+            if target is not None:
+                results[text] = target
+
+        # 3. 回退：词典子短语 -> 原词
+        for group in todo.values():
+            for text in group:
+                if text not in results:
+                    results[text] = self.dictionary.lookup(text, partial=True) or text
+        for text in waiting:
+            if text not in results:
+                results[text] = self.dictionary.lookup(text, partial=True) or text
+        return results
+
+    async def _translate_batch(self, texts: List[str]) -> Dict[str, str]:
+        """一次 LLM 请求翻译一批关键词，返回 归一化键 -> 中文"""
+        prompt = BATCH_PROMPT.format(keywords=json.dumps(texts, ensure_ascii=False))
+        try:
+            result = await self.llm.get_completion(prompt, system_prompt="You are a professional e-commerce sourcing assistant.",
+                                                   temperature=0.2, cache_ttl=Config.LLM_CACHE_TRANSLATION_TTL, json_mode=True)
+            mapping = _parse_mapping(result)
+        except Exception as e:
+            logger.warning(f"LLM 批量翻译失败，回退到词典模式: {e}")
+            return {}
+        translated = {}
+        for source, target in mapping.items():
+            if isinstance(target, str) and target.strip() and "Error" not in target:
+                translated[normalize_keyword(source) or exact_key(source)] = target.strip()
+        missing = len(texts) - len(translated)
+        if missing > 0:
+            logger.warning(f"LLM 批量翻译缺少 {missing}/{len(texts)} 个关键词")
+        return translated
+
+
+def _parse_mapping(result: str) -> Dict[str, str]:
+    """解析模型返回的 JSON 对象，兼容 ```json 代码块与 {"translations": {...}} 包一层的情况"""
+    data = json.loads(_FENCE_RE.sub("", result.strip()))
+    if not isinstance(data, dict):
+        raise ValueError(f"期望 JSON 对象，实际为 {type(data).__name__}")
+    if len(data) == 1:
+        inner = next(iter(data.values()))
+        if isinstance(inner, dict):
+            data = inner
+    return data
@@ -1,56 +1,96 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
 import os
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import matplotlib
+# 只输出图片文件，不需要 GUI 后端；Agg 在线程与子进程中都可以安全使用
+matplotlib.use("Agg")
 import matplotlib.font_manager as fm
+import multiprocessing
+import pandas as pd
+import seaborn as sns
+from matplotlib.figure import Figure
+
+from src.config import Config
+from src.utils.normalize import record_price_cny
+from src.utils.telemetry import traced
+
+# 常见中文字体，按优先级排列
+FONT_CANDIDATES = [
+    'Microsoft YaHei',  # Windows 微软雅黑
+    'SimHei',           # Windows 黑体
+    'SimSun',           # Windows 宋体
+    'PingFang SC',      # macOS 萍方
+    'Arial Unicode MS', # 通用
+    'STHeiti',          # 华文黑体
+    'WenQuanYi Micro Hei' # Linux 文泉驿
+]
+
+# 渲染预设：仪表盘画布固定 16x10 英寸，只有输出分辨率不同
+RENDER_PRESETS: Dict[str, Dict[str, Any]] = {
+    "draft": {"dpi": 72},    # 1152x720，快速预览
+    "report": {"dpi": 120},  # 1920x1200，Word 中按 6 英寸宽嵌入约 320 ppi，足够清晰
+    "print": {"dpi": 300},   # 4800x3000，打印 / 大屏展示
+}
+FIGSIZE = (16, 10)
+
+_theme_applied = False
+
+
+@lru_cache(maxsize=None)
+def resolve_chinese_font() -> Optional[str]:
+    """系统中第一个可用的中文字体；每个进程只扫描一次 fontManager.ttflist"""
+    available = {f.name for f in fm.fontManager.ttflist}
+    return next((font for font in FONT_CANDIDATES if font in available), None)
+
+
+def apply_theme():
+    """设置中文字体与 seaborn 主题（rcParams 为进程级全局设置，每个进程只做一次）"""
+    global _theme_applied
+    if _theme_applied:
+        return
+    chosen_font = resolve_chinese_font()
+    if chosen_font:
+        matplotlib.rcParams['font.sans-serif'] = [chosen_font] + matplotlib.rcParams['font.sans-serif']
+        print(f"✅ 已成功加载中文字体: {chosen_font}")
+    else:
+        print("⚠️ 未能在系统中找到预设的中文字体，图表中的中文可能显示为方块。")
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    sns.set_theme(style="whitegrid", font=matplotlib.rcParams['font.sans-serif'][0])
+    _theme_applied = True
+
 
 class DataVisualizer:
-    def __init__(self, output_dir: str = "data/reports"):
+    def __init__(self, output_dir: str = "data/reports", preset: Optional[str] = None):
+        """
+        :param preset: 渲染预设 draft / report / print，默认 Config.DASHBOARD_PRESET
+        """
         self.output_dir = output_dir
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
-        
-        # 优化中文中文字体加载逻辑
-        self._setup_chinese_font()
-        plt.rcParams['axes.unicode_minus'] = False
-        sns.set_theme(style="whitegrid", font=plt.rcParams['font.sans-serif'][0])
+        self.preset = preset or Config.DASHBOARD_PRESET
+        if self.preset not in RENDER_PRESETS:
+            raise ValueError(f"未知渲染预设: {self.preset}（可选: {', '.join(RENDER_PRESETS)}）")
+        self.dpi = RENDER_PRESETS[self.preset]["dpi"]
+        apply_theme()
+        # 复用同一个 Figure（不经过 pyplot 的全局图形管理），同一实例不能被多个线程同时使用
+        self._figure: Optional[Figure] = None
 
-    def _setup_chinese_font(self):
-        """
-        根据操作系统自动选择并设置可用的中文中文字体
-        """
-        # 常见中文中文字体列表
-        font_names = [
-            'Microsoft YaHei',  # Windows 微软雅黑
-            'SimHei',           # Windows 黑体
-            'SimSun',           # Windows 宋体
-            'PingFang SC',      # macOS 萍方
-            'Arial Unicode MS', # 通用
-            'STHeiti',          # 华文黑体
-            'WenQuanYi Micro Hei' # Linux 文泉驿
-        ]
-        
-        available_fonts = [f.name for f in fm.fontManager.ttflist]
-        chosen_font = None
-        
-        for font in font_names:
-            if font in available_fonts:
-                chosen_font = font
-                break
-        
-        if chosen_font:
-            plt.rcParams['font.sans-serif'] = [chosen_font] + plt.rcParams['font.sans-serif']
-            print(f"✅ 已成功加载中文字体: {chosen_font}")
+    def _new_figure(self) -> Figure:
+        if self._figure is None:
+            self._figure = Figure(figsize=FIGSIZE)
         else:
-            print("⚠️ 未能在系统中找到预设的中文字体，图表中的中文可能显示为方块。")
+            self._figure.clear()
+        return self._figure
 
+    @traced("dashboard_render")
     def generate_dashboard(self, keyword: str, analysis: Dict, sales_data: List[Dict], sourcing_data: List[Dict], trend_data: List[Dict] = []):
         """
         生成综合数据仪表盘图片
         """
         # 创建一个包含多个子图的大图
-        fig = plt.figure(figsize=(16, 10))
+        fig = self._new_figure()
         fig.suptitle(f"选品趋势深度分析仪表盘 - 关键词: {keyword}", fontsize=20, fontweight='bold')
 
         # 1. 价格对比图 (左上)
@@ -69,29 +109,21 @@ class DataVisualizer:
         ax4 = fig.add_subplot(2, 2, 4)
         self._plot_summary_text(ax4, analysis)
 
-        plt.tight_layout(rect=[0, 0.03, 1, 0.95])
+        fig.tight_layout(rect=[0, 0.03, 1, 0.95])
         
         # 保存图片
         output_path = os.path.join(self.output_dir, f"Dashboard_{keyword}.png")
-        plt.savefig(output_path, dpi=300)
-        plt.close()
+        fig.savefig(output_path, dpi=self.dpi)
         return output_path
 
     def _plot_price_comparison(self, ax, sales_data, sourcing_data):
         # 准备数据
+        # 价格已在入库时按汇率表折算为人民币 (price_cny)，所有平台统一换算
         plot_data = []
-        for d in sales_data:
-            try:
-                price = float(str(d.get('price', '0')).replace('$', '').replace('¥', '').replace(',', ''))
-                if d['platform'] == 'Amazon': price *= 7.2 # 粗略换算为人民币
-                plot_data.append({"平台": d['platform'], "价格(RMB)": price})
-            except: continue
-        
-        for d in sourcing_data:
-            try:
-                price = float(str(d.get('price', '0')).replace('¥', '').replace(',', ''))
-                plot_data.append({"平台": d['platform'], "价格(RMB)": price})
-            except: continue
+        for d in list(sales_data) + list(sourcing_data):
+            price = record_price_cny(d)
+            if price is not None:
+                plot_data.append({"平台": d.get('platform', 'unknown'), "价格(RMB)": price})
 
         if plot_data:
             df = pd.DataFrame(plot_data)
@@ -149,3 +181,33 @@ class DataVisualizer:
                 verticalalignment='top', wrap=True, bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
         ax.set_title("核心结论摘要", fontsize=14)
 
+
+# 批量渲染：每个工作进程一个 DataVisualizer（字体、主题、Figure 只初始化一次）
+_worker: Optional[DataVisualizer] = None
+
+DashboardJob = Tuple[str, Dict, List[Dict], List[Dict], List[Dict]]
+
+
+def _init_worker(output_dir: str, preset: Optional[str]):
+    global _worker
+    _worker = DataVisualizer(output_dir, preset)
+
+
+def _render_job(job: DashboardJob) -> str:
+    return _worker.generate_dashboard(*job)
+
+
+def render_dashboards(jobs: List[DashboardJob], output_dir: str = "data/reports", preset: Optional[str] = None,
+                      processes: Optional[int] = None) -> List[str]:
+    """
+    批量渲染多个关键词的仪表盘（例如从商品库重新出图），按 jobs 顺序返回图片路径
+    :param jobs: [(keyword, analysis, sales_data, sourcing_data, trend_data), ...]
+    :param processes: 渲染进程数，默认 CPU 核数；1 表示在当前进程内顺序渲染
+    """
+    processes = min(processes or os.cpu_count() or 1, len(jobs))
+    if processes <= 1:
+        visualizer = DataVisualizer(output_dir, preset)
+        return [visualizer.generate_dashboard(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(output_dir, preset)) as pool:
+        return list(pool.map(_render_job, jobs))